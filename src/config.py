@@ -13,4 +13,43 @@ class Config:
     REMEMBER_COOKIE_SECURE = os.environ.get('ENVIRONMENT') == 'production'
     
     # Password hashing settings
-    BCRYPT_LOG_ROUNDS = 12
\ No newline at end of file
+    BCRYPT_LOG_ROUNDS = 12
+    
+    # SQLite performance profile, applied to every new database connection
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL'
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL'
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB') or 65536)
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE') or 268435456)
+    SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE') or 'MEMORY'
+    
+    # Rows copied per transaction when a migration rebuilds a large table
+    MIGRATION_BATCH_SIZE = int(os.environ.get('MIGRATION_BATCH_SIZE') or 5000)
+    
+    # Rows per executemany call when importing transactions in bulk
+    BULK_INSERT_CHUNK_SIZE = int(os.environ.get('BULK_INSERT_CHUNK_SIZE') or 1000)
+    
+    # Rows per fetchmany call when streaming transactions
+    FETCH_BATCH_SIZE = int(os.environ.get('FETCH_BATCH_SIZE') or 500)
+    
+    # Query results kept per TransactionController before the least recently used is evicted
+    SUMMARY_CACHE_SIZE = int(os.environ.get('SUMMARY_CACHE_SIZE') or 64)
+    
+    # Savings goal forecasting: weeks of history sampled, simulated paths per
+    # goal and how many weeks ahead a path may run before it counts as missed
+    FORECAST_WINDOW_WEEKS = int(os.environ.get('FORECAST_WINDOW_WEEKS') or 12)
+    FORECAST_SIMULATIONS = int(os.environ.get('FORECAST_SIMULATIONS') or 1000)
+    FORECAST_HORIZON_WEEKS = int(os.environ.get('FORECAST_HORIZON_WEEKS') or 260)
+    
+    # Expenses this many standard deviations above their category's mean are
+    # flagged, once the category has at least ANOMALY_MIN_HISTORY expenses
+    ANOMALY_Z_THRESHOLD = float(os.environ.get('ANOMALY_Z_THRESHOLD') or 3.0)
+    ANOMALY_MIN_HISTORY = int(os.environ.get('ANOMALY_MIN_HISTORY') or 5)
+    
+    # Rows fetched per page by the virtualized transaction table; it keeps
+    # the visible rows plus one page on each side as Treeview items
+    TABLE_PAGE_SIZE = int(os.environ.get('TABLE_PAGE_SIZE') or 100)
+    
+    # Worker threads running queries off the Tk main thread, and how often
+    # (milliseconds) the Tk thread polls them for finished results
+    BACKGROUND_WORKERS = int(os.environ.get('BACKGROUND_WORKERS') or 4)
+    DISPATCH_INTERVAL_MS = int(os.environ.get('DISPATCH_INTERVAL_MS') or 30)
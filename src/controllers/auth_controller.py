@@ -1,4 +1,5 @@
 from src.core.auth import AuthManager
+from src.core import background
 from tkinter import messagebox
 
 class AuthController:
@@ -44,8 +45,20 @@ class AuthController:
     
     def handle_login(self, username, password):
         """Handle user login."""
-        success, message = self.auth_manager.login(username, password)
+        return self.finish_login(*self.auth_manager.login(username, password))
+    
+    def login_async(self, username, password):
+        """
+        Check the credentials on the background executor.
         
+        Password hashing takes a noticeable moment, so the frame waits for the
+        returned Future, then passes its (success, message) to finish_login
+        on the Tk thread.
+        """
+        return background.submit(self.auth_manager.login, username, password)
+    
+    def finish_login(self, success, message):
+        """Tell the user the outcome of a login attempt and navigate on success."""
         if success:
             # Notify that auth state changed
             if hasattr(self, 'on_auth_changed') and self.on_auth_changed:
@@ -1,16 +1,41 @@
-from src.models import transaction
+import csv
+import threading
+from collections import OrderedDict
+from datetime import date
+from src.models import transaction, rolling_stats, anomalies, savings
+from src.core import background
+from src.core.anomalies import AnomalyDetector
+from src.config import Config
+from src.utils.formatters import to_cents
 from tkinter import messagebox
 
 class TransactionController:
-    def __init__(self, auth_manager=None):
+    def __init__(self, auth_manager=None, cache_size=None):
         """
         Initialize the transaction controller.
         
+        Read results are cached per user until a write made through this
+        controller invalidates them. Cached lists and dicts are shared
+        between callers and must be treated as read-only. The *_async
+        variants run on the shared background executor and return futures,
+        for frames that must not block the Tk main thread.
+        
         Args:
             auth_manager: The authentication manager to get current user info
+            cache_size (int, optional): Most results kept before the least
+                recently used is evicted, defaults to Config.SUMMARY_CACHE_SIZE
         """
         self.auth_manager = auth_manager
         self.user_id = None
+        self.cache_size = cache_size or Config.SUMMARY_CACHE_SIZE
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Bumped on every invalidation so a load that raced a write is not stored
+        self._cache_generation = 0
+        # Scores every expense written through this controller
+        self.anomaly_detector = AnomalyDetector()
         self.update_user_id()
     
     def update_user_id(self):
@@ -20,11 +45,58 @@ class TransactionController:
         else:
             self.user_id = None
     
+    def _cached(self, name, loader, *args, **kwargs):
+        """
+        Return the cached result of loader for the current user, loading it on a miss.
+        
+        Args:
+            name (str): Name of the query, part of the cache key
+            loader (callable): Model function called with (*args, user_id) on a miss
+        """
+        key = (self.user_id, name, args, tuple(sorted(kwargs.items())))
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return self._cache[key]
+            self.cache_misses += 1
+            generation = self._cache_generation
+
+        result = loader(*args, self.user_id, **kwargs)
+
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return result
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def invalidate_cache(self, user_id=None):
+        """
+        Drop cached results after the data changed.
+        
+        Args:
+            user_id (int, optional): Only drop this user's results, defaults to all users
+        """
+        with self._cache_lock:
+            self._cache_generation += 1
+            if user_id is None:
+                self._cache.clear()
+            else:
+                for key in [key for key in self._cache if key[0] == user_id]:
+                    del self._cache[key]
+
+    def get_cache_stats(self):
+        """Return the cache's hit and miss counters and current size."""
+        with self._cache_lock:
+            return {"hits": self.cache_hits, "misses": self.cache_misses, "size": len(self._cache)}
+
     def add_transaction(self, category, amount, trans_type, description=None):
         """Add a transaction for the current user"""
-        # Make sure we have a user ID
-        if self.user_id is None:
-            self.update_user_id()
+        # Make sure we have the current user's ID
+        self.update_user_id()
             
         if self.user_id is None:
             return False, "No user is logged in. Please log in first."
@@ -36,52 +108,298 @@ class TransactionController:
             
         # Pass the current user's ID to the transaction model
         result = transaction.save_transaction(category, amount, trans_type, description, self.user_id)
+        self.invalidate_cache(self.user_id)
         if result:
-            return True, f"{trans_type} transaction saved."
+            message = f"{trans_type} transaction saved."
+            if _is_expense(trans_type) and self.anomaly_detector.process(
+                    self.user_id, [result], [category], [to_cents(amount)]):
+                message += f" This is unusually large for {category}."
+            return True, message
         else:
             return False, "Failed to save transaction."
 
+    def add_transactions_bulk(self, rows):
+        """
+        Add many transactions for the current user in a single commit.
+
+        Returns:
+            tuple: (True, list of new transaction IDs) or (False, error message)
+        """
+        if self.user_id is None:
+            self.update_user_id()
+
+        if self.user_id is None:
+            return False, "No user is logged in. Please log in first."
+
+        rows = list(rows)
+        tx_ids = transaction.save_transactions_bulk(rows, self.user_id)
+        self.invalidate_cache(self.user_id)
+        if tx_ids is None:
+            return False, "Failed to save transactions."
+
+        expenses = [(tx_id, row) for tx_id, row in zip(tx_ids, rows) if _is_expense(str(row["type"]))]
+        if expenses:
+            self.anomaly_detector.process(
+                self.user_id,
+                [tx_id for tx_id, _ in expenses],
+                [row["category"] for _, row in expenses],
+                [to_cents(row["amount"]) for _, row in expenses],
+            )
+        return True, tx_ids
+
     def delete_transaction(self, transaction_id):
         """Delete a transaction by ID."""
+        # Triggers take it out of the expense statistics and drop its flag
         success = transaction.delete_transaction(transaction_id)
+        # The row may belong to any user, so drop everything
+        self.invalidate_cache()
         return success
 
     def update_transaction(self, transaction_id, **kwargs):
         """Update an existing transaction."""
-        return transaction.update_transaction(transaction_id, **kwargs)
+        success = transaction.update_transaction(transaction_id, **kwargs)
+        if success:
+            # Triggers already moved the statistics; rescore the edited row
+            anomalies.clear_anomaly(transaction_id)
+            new = transaction.get_transaction(transaction_id)
+            if new and new["type"] == "Expense":
+                self.anomaly_detector.process(new["user_id"], [transaction_id], [new["category"]], [new["amount_cents"]])
+        # The row may belong to any user, so drop everything
+        self.invalidate_cache()
+        return success
 
     def get_all_transactions(self):
         """Fetch all transactions for the user."""
+        self.update_user_id()
         if not self.user_id:
             return []
-        return transaction.load_all_transactions(self.user_id)
+        return self._cached("all", transaction.load_all_transactions)
+
+    def iter_transactions(self, category=None, trans_type=None):
+        """Stream the user's transactions in batches instead of loading a list."""
+        self.update_user_id()
+        if not self.user_id:
+            return iter(())
+        return transaction.iter_transactions(self.user_id, category=category, trans_type=trans_type)
+
+    def export_csv(self, path, category=None, trans_type=None):
+        """
+        Write the user's transactions to a CSV file, newest first.
+
+        Rows are written as iter_transactions streams them, so exporting a
+        large ledger never holds it in memory.
+
+        Args:
+            path (str): File to write
+            category (str, optional): Only export this category
+            trans_type (str, optional): Only export this type
+
+        Returns:
+            int: Number of transactions written
+        """
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["id", "created_at", "category", "type", "amount", "description"])
+            for row in self.iter_transactions(category=category, trans_type=trans_type):
+                writer.writerow([row["id"], row["created_at"], row["category"], row["type"],
+                                 f"{row['amount_cents'] / 100:.2f}", row["description"] or ""])
+                count += 1
+        return count
+
+    def get_transaction_page(self, after=None, limit=50, offset=0, oldest_first=False):
+        """
+        Get one page of transactions, newest first.
+
+        Not cached: scrolling reads a stream of distinct pages that would
+        only push the summaries out of the cache. Each page is a keyset
+        seek, cheap enough to read every time.
+
+        Args:
+            after (tuple, optional): (created_at, id) of the last row of the previous page
+            limit (int): Page size
+            offset (int): Rows to skip after `after`
+            oldest_first (bool): Read the same order backwards, see page_transactions
+        """
+        self.update_user_id()
+        if not self.user_id:
+            return []
+        return transaction.page_transactions(self.user_id, after=after, limit=limit, offset=offset,
+                                             oldest_first=oldest_first)
+
+    def count_transactions(self):
+        """Count the user's transactions."""
+        self.update_user_id()
+        if not self.user_id:
+            return 0
+        return self._cached("count", transaction.count_transactions)
 
     def get_by_category(self, category):
         """Get transactions by category."""
+        self.update_user_id()
         if not self.user_id:
             return []
-        return transaction.load_transactions_by_category(category, self.user_id)
+        return self._cached("category", transaction.load_transactions_by_category, category)
 
     def get_by_type(self, trans_type):
         """Get transactions by type."""
+        self.update_user_id()
         if not self.user_id:
             return []
-        return transaction.load_transactions_by_type(trans_type, self.user_id)
+        return self._cached("type", transaction.load_transactions_by_type, trans_type)
 
     def get_spending_summary(self):
         """Get summary of spending by category."""
+        self.update_user_id()
         if not self.user_id:
             return {}
-        return transaction.get_spending_summary(self.user_id)
+        return self._cached("spending", transaction.get_spending_summary)
 
     def get_savings_summary(self):
         """Get summary of savings by category."""
+        self.update_user_id()
+        if not self.user_id:
+            return {}
+        return self._cached("savings", transaction.get_savings_summary)
+
+    def get_dashboard_snapshot(self):
+        """Get per-category and overall totals and counts in one query."""
+        self.update_user_id()
+        if not self.user_id:
+            return transaction.get_dashboard_snapshot(None)
+        return self._cached("snapshot", transaction.get_dashboard_snapshot)
+
+    def get_running_balance(self, period="day", start_date=None, end_date=None):
+        """Get the balance over time, one point per day/week/month/year."""
+        self.update_user_id()
+        if not self.user_id:
+            return transaction.load_running_balance(None)
+        # Pin the end date so an open-ended balance rolls over with the calendar
+        return self._cached("balance", transaction.load_running_balance, period=period, start_date=start_date,
+                            end_date=end_date or date.today().isoformat())
+
+    def get_time_buckets(self, period="week", trans_type="Expense", num_buckets=None):
+        """Get per-category totals for the last num_buckets days/weeks/months/years."""
+        self.update_user_id()
+        if not self.user_id:
+            return transaction.load_time_buckets(None, period=period, trans_type=trans_type, num_buckets=num_buckets)
+        # Pin the end date so cached buckets roll over with the calendar
+        return self._cached("buckets", transaction.load_time_buckets, period=period, trans_type=trans_type,
+                            end_date=date.today().isoformat(), num_buckets=num_buckets)
+
+    def get_report_data(self):
+        """
+        Get everything the report tabs show.
+
+        Returns:
+            dict: {"snapshot": dashboard snapshot, "weekly": expenses of the
+                last 8 weeks and "monthly": of the last 6 months as time
+                buckets, "balance": daily running balance}
+        """
+        return {
+            "snapshot": self.get_dashboard_snapshot(),
+            "weekly": self.get_time_buckets("week", num_buckets=8),
+            "monthly": self.get_time_buckets("month", num_buckets=6),
+            "balance": self.get_running_balance("day"),
+        }
+
+    def get_dashboard_snapshot_async(self):
+        """get_dashboard_snapshot on the background executor; returns a Future."""
+        return background.submit(self.get_dashboard_snapshot)
+
+    def get_report_data_async(self):
+        """get_report_data on the background executor; returns a Future."""
+        return background.submit(self.get_report_data)
+
+    def get_savings_summary_async(self):
+        """get_savings_summary on the background executor; returns a Future."""
+        return background.submit(self.get_savings_summary)
+
+    def get_goals_with_progress(self):
+        """Get the user's savings goals with how much of each is saved, see savings.get_goals_with_progress."""
+        self.update_user_id()
+        if not self.user_id:
+            return []
+        return self._cached("goals", savings.get_goals_with_progress)
+
+    def get_goals_with_progress_async(self):
+        """get_goals_with_progress on the background executor; returns a Future."""
+        return background.submit(self.get_goals_with_progress)
+
+    def set_savings_goal(self, category, target_amount, deadline=None):
+        """
+        Create or update the user's savings goal for a category.
+
+        A user has one goal per category, matched case-insensitively; an
+        existing goal keeps its deadline unless a new one is given.
+
+        Args:
+            category (str): Category the goal tracks
+            target_amount (float): Amount to save
+            deadline (str, optional): Deadline in YYYY-MM-DD format
+
+        Returns:
+            dict: The goal with its progress, as in get_goals_with_progress,
+                or None if it could not be saved
+        """
+        self.update_user_id()
+        if not self.user_id:
+            return None
+        current = next((goal for goal in self.get_goals_with_progress()
+                        if goal["category"].lower() == category.lower()), None)
+        if current is None:
+            goal_id = savings.create_savings_goal(self.user_id, category, category, target_amount, deadline)
+        elif savings.update_savings_goal(current["id"], target_amount=target_amount, deadline=deadline):
+            goal_id = current["id"]
+        else:
+            goal_id = None
+        self.invalidate_cache(self.user_id)
+        return next((goal for goal in self.get_goals_with_progress() if goal["id"] == goal_id), None)
+
+    def export_csv_async(self, path, category=None, trans_type=None):
+        """export_csv on the background executor; returns a Future."""
+        return background.submit(self.export_csv, path, category=category, trans_type=trans_type)
+
+    def get_rolling_stats(self, trans_type="Expense", as_of=None):
+        """
+        Get rolling 7/30/90-day statistics per category.
+
+        Not cached: the windows move with the calendar as well as with writes,
+        and the stored running sums already make this a per-category lookup.
+        """
+        self.update_user_id()
         if not self.user_id:
             return {}
-        return transaction.get_savings_summary(self.user_id)
+        return rolling_stats.get_rolling_stats(self.user_id, trans_type, as_of)
+
+    def get_anomalies(self, limit=50):
+        """Get the user's expenses flagged as unusually large, newest first."""
+        self.update_user_id()
+        if not self.user_id:
+            return []
+        return self._cached("anomalies", anomalies.get_anomalies, limit=limit)
+
+    def scan_anomalies(self):
+        """
+        Rescore the user's whole expense history from scratch.
+
+        Returns:
+            tuple: (True, number of flagged expenses) or (False, error message)
+        """
+        self.update_user_id()
+        if not self.user_id:
+            return False, "No user is logged in. Please log in first."
+        flags = self.anomaly_detector.backfill(self.user_id)
+        self.invalidate_cache(self.user_id)
+        return True, len(flags)
 
     def get_by_date_range(self, start_date, end_date):
         """Get transactions within a date range."""
+        self.update_user_id()
         if not self.user_id:
             return []
-        return transaction.load_transactions_by_date_range(start_date, end_date, self.user_id)
\ No newline at end of file
+        return self._cached("date_range", transaction.load_transactions_by_date_range, start_date, end_date)
+
+def _is_expense(trans_type):
+    """True for the Expense type in any letter case"""
+    return transaction.TRANSACTION_TYPES.get(str(trans_type).lower()) == "Expense"
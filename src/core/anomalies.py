@@ -0,0 +1,170 @@
+import numpy as np
+from src.config import Config
+from src.models import anomalies, transaction
+
+
+class AnomalyDetector:
+    """
+    Flag expenses that are unusually large for their category.
+
+    Every user and category keeps Welford running statistics of its expense
+    amounts: count, mean and M2, the sum of squared deviations from the mean.
+    Triggers fold each stored expense into them, whichever path wrote it.
+    Each new expense is scored against the statistics of the expenses
+    before it. An expense is flagged when it lies at least `threshold`
+    sample standard deviations above the mean and the category already
+    has `min_history` expenses.
+
+    Batches are scored with NumPy. Within each category, prefix sums give
+    every row the statistics of the rows before it, and Chan's parallel
+    formula merges those with the stored state. This matches applying
+    Welford's update one row at a time, in input order.
+    """
+    def __init__(self, threshold=None, min_history=None):
+        self.threshold = threshold or Config.ANOMALY_Z_THRESHOLD
+        self.min_history = min_history or Config.ANOMALY_MIN_HISTORY
+
+    def score(self, categories, amount_cents, moments):
+        """
+        Score a batch of expenses against, and then fold them into, running statistics.
+
+        Args:
+            categories (list): Category of each expense
+            amount_cents (array-like): Amount of each expense in cents
+            moments (dict): {category: (count, mean_cents, m2)} before the batch
+
+        Returns:
+            tuple: (z_scores, means, stds, updated) where the first three are
+                float arrays aligned with the input (z is nan while a category
+                has too little history or no spread) and updated holds the
+                new (count, mean_cents, m2) of every category in the batch
+        """
+        x = np.asarray(amount_cents, dtype=np.float64)
+        size = len(x)
+        z_scores, means, stds = np.full(size, np.nan), np.full(size, np.nan), np.full(size, np.nan)
+        if not size:
+            return z_scores, means, stds, {}
+
+        lookup = {}
+        codes = np.array([lookup.setdefault(category, len(lookup)) for category in categories], dtype=np.int64)
+        names = list(lookup)
+        prior = [moments.get(name, (0, 0.0, 0.0)) for name in names]
+        n0 = np.array([count for count, _, _ in prior], dtype=np.float64)
+        mean0 = np.array([mean for _, mean, _ in prior], dtype=np.float64)
+        m20 = np.array([m2 for _, _, m2 in prior], dtype=np.float64)
+
+        # Group rows by category, keeping input order inside each group
+        order = np.argsort(codes, kind='stable')
+        group = codes[order]
+        values = x[order]
+        sizes = np.bincount(group, minlength=len(names))
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        k = np.arange(size) - starts[group]
+
+        # Shift by the batch mean of the category before squaring, so prefix
+        # sums of squares stay small relative to the variance
+        shift = np.bincount(group, weights=values, minlength=len(names)) / sizes
+        centered = values - shift[group]
+        sums = np.cumsum(centered)
+        squares = np.cumsum(centered * centered)
+        sums_before = sums - centered - (sums[starts] - centered[starts])[group]
+        squares_before = squares - centered * centered - (squares[starts] - centered[starts] ** 2)[group]
+
+        mean, m2 = self._merge(n0[group], mean0[group], m20[group], k, shift[group], sums_before, squares_before)
+        count = n0[group] + k
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(m2 / (count - 1))
+            z = (values - mean) / std
+        z[(count < max(self.min_history, 2)) | ~(std > 0)] = np.nan
+
+        z_scores[order], means[order], stds[order] = z, mean, np.where(count >= 2, std, np.nan)
+
+        # Statistics after the whole batch: the same merge with every row included
+        final_mean, final_m2 = self._merge(n0, mean0, m20, sizes, shift,
+                                           np.bincount(group, weights=centered, minlength=len(names)),
+                                           np.bincount(group, weights=centered * centered, minlength=len(names)))
+        updated = {
+            name: (int(n0[i] + sizes[i]), float(final_mean[i]), float(max(final_m2[i], 0.0)))
+            for i, name in enumerate(names)
+        }
+        return z_scores, means, stds, updated
+
+    @staticmethod
+    def _merge(n0, mean0, m20, k, shift, centered_sum, centered_squares):
+        """Chan's formula: merge stored (n0, mean0, m20) with k new values given their shifted sums."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            batch_mean = np.where(k > 0, shift + centered_sum / k, 0.0)
+            batch_m2 = np.where(k > 0, centered_squares - centered_sum * centered_sum / k, 0.0)
+            count = n0 + k
+            delta = batch_mean - mean0
+            mean = np.where(count > 0, mean0 + delta * k / count, 0.0)
+            m2 = m20 + batch_m2 + np.where(count > 0, delta * delta * n0 * k / count, 0.0)
+        return mean, m2
+
+    @staticmethod
+    def _without(moments, categories, amount_cents):
+        """Statistics before a batch that moments already include (Chan's formula in reverse)."""
+        x = np.asarray(amount_cents, dtype=np.float64)
+        lookup = {}
+        codes = np.array([lookup.setdefault(category, len(lookup)) for category in categories], dtype=np.int64)
+        sizes = np.bincount(codes, minlength=len(lookup)).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            batch_mean = np.bincount(codes, weights=x, minlength=len(lookup)) / sizes
+        deviations = x - batch_mean[codes]
+        batch_m2 = np.bincount(codes, weights=deviations * deviations, minlength=len(lookup))
+
+        prior = dict(moments)
+        for i, name in enumerate(lookup):
+            count, mean, m2 = moments.get(name, (0, 0.0, 0.0))
+            count0 = count - sizes[i]
+            if count0 <= 0:
+                prior.pop(name, None)
+                continue
+            mean0 = (count * mean - sizes[i] * batch_mean[i]) / count0
+            delta = batch_mean[i] - mean0
+            prior[name] = (int(count0), float(mean0),
+                           float(max(m2 - batch_m2[i] - delta * delta * count0 * sizes[i] / count, 0.0)))
+        return prior
+
+    def process(self, user_id, transaction_ids, categories, amount_cents, reset=False):
+        """
+        Score newly stored expenses in order and store their flags.
+
+        The expenses must already be saved: the triggers have folded them
+        into the statistics, so the statistics before them are found by
+        taking the batch back out.
+
+        Args:
+            user_id (int): Owner of the expenses
+            transaction_ids (list): IDs of the expenses
+            categories (list): Category of each expense
+            amount_cents (array-like): Amount of each expense in cents
+            reset (bool): Score the batch from empty statistics, drop existing
+                flags and store the statistics the batch adds up to. Used to
+                rescore a user's whole history.
+
+        Returns:
+            list: (transaction_id, category, amount_cents, z_score, mean_cents,
+                std_cents) of every flagged expense
+        """
+        moments = {} if reset else self._without(anomalies.load_category_moments(user_id), categories, amount_cents)
+        z, means, stds, updated = self.score(categories, amount_cents, moments)
+        flagged = np.flatnonzero(z >= self.threshold)
+        flags = [
+            (int(transaction_ids[i]), str(categories[i]), int(amount_cents[i]),
+             float(z[i]), float(means[i]), float(stds[i]))
+            for i in flagged
+        ]
+        anomalies.save_anomaly_scan(user_id, updated if reset else {}, flags, reset=reset)
+        return flags
+
+    def backfill(self, user_id):
+        """
+        Rebuild a user's statistics and flags from their whole expense history.
+
+        Returns:
+            list: Flags as returned by process
+        """
+        history = transaction.load_transaction_columns(user_id, trans_type="Expense")
+        categories = [history.categories[code] for code in history.category_codes.tolist()]
+        return self.process(user_id, history.ids, categories, history.amount_cents, reset=True)
@@ -0,0 +1,140 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.config import Config
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """
+    Get the thread pool shared by the whole application, creating it on first use.
+
+    Database queries, password hashing and chart data preparation run here
+    so the Tk main thread stays responsive. Pooled database connections
+    are per thread, so workers never share one.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=Config.BACKGROUND_WORKERS,
+                thread_name_prefix="budgetflow-worker"
+            )
+        return _executor
+
+def submit(fn, *args, **kwargs):
+    """
+    Run fn(*args, **kwargs) on the shared thread pool.
+
+    Returns:
+        concurrent.futures.Future: Resolves to fn's return value
+    """
+    return get_executor().submit(fn, *args, **kwargs)
+
+def shutdown_executor(wait=False):
+    """Stop the shared thread pool, dropping work that has not started yet."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=True)
+            _executor = None
+
+
+class TkDispatcher:
+    """
+    Hand the results of background futures back to the Tk main thread.
+
+    Tk widgets must only be touched from the thread running mainloop.
+    Worker threads therefore only put finished futures on a queue, and
+    the dispatcher drains that queue with after() polling. Callbacks run
+    on the Tk thread, where they can update widgets. Polling stops while
+    nothing is pending.
+
+    Requests may carry a key, such as "snapshot" or "login". Starting a
+    request with a key that is still pending makes the older one stale.
+    A stale request is cancelled if it has not started, and its result is
+    dropped otherwise. A frame that is refreshed twice therefore only ever
+    draws the newest data.
+    """
+    def __init__(self, widget, interval_ms=None):
+        """
+        Args:
+            widget: Any Tk widget, used for after() scheduling
+            interval_ms (int, optional): Polling interval while requests are
+                pending, defaults to Config.DISPATCH_INTERVAL_MS
+        """
+        self.widget = widget
+        self.interval_ms = interval_ms or Config.DISPATCH_INTERVAL_MS
+        self._done = queue.Queue()
+        self._pending = 0
+        self._latest = {}
+        self._polling = False
+
+    def watch(self, future, on_success, on_error=None, key=None):
+        """
+        Call on_success(result) on the Tk thread once future completes.
+
+        Args:
+            future: A concurrent.futures.Future, e.g. from submit
+            on_success: Called with the result
+            on_error (optional): Called with the exception instead, if the
+                work raised; without it the error is printed
+            key (optional): Makes any pending request with the same key stale
+
+        Returns:
+            The future, for chaining
+        """
+        if key is not None:
+            self.cancel(key)
+            self._latest[key] = future
+        self._pending += 1
+        future.add_done_callback(lambda done: self._done.put((done, on_success, on_error, key)))
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.interval_ms, self._poll)
+        return future
+
+    def run(self, fn, *args, on_success, on_error=None, key=None, **kwargs):
+        """Submit fn to the shared thread pool and watch it; returns the future."""
+        return self.watch(submit(fn, *args, **kwargs), on_success, on_error, key)
+
+    def cancel(self, key):
+        """Make the pending request with this key stale, if there is one."""
+        future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def is_pending(self, key):
+        """True while a request with this key has not been delivered."""
+        return key in self._latest
+
+    def _poll(self):
+        while True:
+            try:
+                future, on_success, on_error, key = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            self._deliver(future, on_success, on_error, key)
+
+        if self._pending:
+            self.widget.after(self.interval_ms, self._poll)
+        else:
+            self._polling = False
+
+    def _deliver(self, future, on_success, on_error, key):
+        if key is not None:
+            if self._latest.get(key) is not future:
+                return  # Superseded by a newer request
+            del self._latest[key]
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is None:
+            on_success(future.result())
+        elif on_error is not None:
+            on_error(error)
+        else:
+            print(f"Background task failed: {error}")
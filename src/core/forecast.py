@@ -0,0 +1,172 @@
+from datetime import date, datetime, timedelta
+import numpy as np
+from src.config import Config
+from src.models.transaction import to_epoch
+
+SECONDS_PER_WEEK = 7 * 24 * 60 * 60
+
+
+class SavingsForecaster:
+    """
+    Estimate when savings goals will be reached from past saving transactions.
+
+    All goals are forecast together. Each goal's recent history is reduced to
+    a row of weekly deposits, which gives two estimates:
+
+    - rolling: remaining amount divided by the mean weekly deposit
+    - Monte Carlo: many paths built by resampling past weeks with
+      replacement, summarized as percentiles of the completion week
+
+    Goals are matched to transactions by category, case-insensitively.
+    """
+    def __init__(self, window_weeks=None, simulations=None, horizon_weeks=None, seed=None):
+        self.window_weeks = window_weeks or Config.FORECAST_WINDOW_WEEKS
+        self.simulations = simulations or Config.FORECAST_SIMULATIONS
+        self.horizon_weeks = horizon_weeks or Config.FORECAST_HORIZON_WEEKS
+        self.rng = np.random.default_rng(seed)
+
+    def weekly_deposits(self, history, categories, now=None):
+        """
+        Sum saving transactions into weekly buckets per category.
+
+        Args:
+            history (TransactionColumns): Saving transactions
+            categories (list): Category of each row of the result
+            now (datetime, optional): End of the last week, defaults to now
+
+        Returns:
+            ndarray: int64 cents, shape (len(categories), window_weeks), oldest week first
+        """
+        now_ts = to_epoch(now or datetime.now())
+        keys = {}
+        key_rows = np.array([keys.setdefault(category.lower(), len(keys)) for category in categories], dtype=np.int64)
+        deposits = np.zeros((len(keys), self.window_weeks), dtype=np.int64)
+        if len(history) and keys:
+            # Map every category code of the history to a key, -1 if no goal uses it
+            code_keys = np.array([keys.get(name.lower(), -1) for name in history.categories], dtype=np.int64)
+            row_keys = code_keys[history.category_codes]
+            weeks_ago = (now_ts - history.created_ts) // SECONDS_PER_WEEK
+            selected = (row_keys >= 0) & (weeks_ago >= 0) & (weeks_ago < self.window_weeks)
+            np.add.at(deposits,
+                      (row_keys[selected], self.window_weeks - 1 - weeks_ago[selected]),
+                      history.amount_cents[selected])
+        # Goals sharing a category share its history
+        return deposits[key_rows] if len(key_rows) else np.zeros((0, self.window_weeks), dtype=np.int64)
+
+    def simulate(self, deposits, remaining, chunk_weeks=13):
+        """
+        Simulate completion weeks by resampling past weekly deposits.
+
+        Weeks are simulated a chunk at a time for all paths at once. A goal
+        drops out as soon as each of its paths has either completed or can no
+        longer complete within the horizon even at its best past week, so
+        most goals cost a few chunks rather than the whole horizon.
+
+        Args:
+            deposits (ndarray): Weekly deposits per goal, from weekly_deposits
+            remaining (ndarray): Cents left to save per goal
+            chunk_weeks (int): Weeks simulated per step
+
+        Returns:
+            ndarray: Completion week of every path, shape (goals, simulations),
+                0 if already complete and inf if not reached within the horizon
+        """
+        weeks = np.full((len(remaining), self.simulations), np.inf)
+        weeks[remaining <= 0] = 0
+        peak = deposits.max(axis=1) if deposits.size else np.zeros(len(remaining), dtype=np.int64)
+        active = np.flatnonzero((remaining > 0) & (peak * self.horizon_weeks >= remaining))
+        saved = np.zeros((len(active), self.simulations), dtype=np.int64)
+        flat = deposits.ravel()
+
+        for start in range(0, self.horizon_weeks, chunk_weeks):
+            if not len(active):
+                break
+            size = min(chunk_weeks, self.horizon_weeks - start)
+            # Weeks lead so the running sum walks whole contiguous rows, and
+            # indexing into the flattened matrix lets one take() gather every
+            # goal's samples
+            picks = self.rng.integers(0, self.window_weeks, size=(size, len(active), self.simulations),
+                                      dtype=np.int32)
+            picks += (active * self.window_weeks).astype(np.int32)[:, None]
+            paths = flat.take(picks)
+            paths[0] += saved
+            np.cumsum(paths, axis=0, out=paths)
+            reached = paths >= remaining[active][:, None]
+
+            pending = np.isinf(weeks[active])
+            newly = pending & reached[-1]
+            goal_rows, path_cols = np.nonzero(newly)
+            weeks[active[goal_rows], path_cols] = start + reached[:, goal_rows, path_cols].argmax(axis=0) + 1
+            saved = paths[-1]
+
+            weeks_left = self.horizon_weeks - start - size
+            reachable = remaining[active][:, None] - saved <= (peak[active] * weeks_left)[:, None]
+            keep = (np.isinf(weeks[active]) & reachable).any(axis=1)
+            active, saved = active[keep], saved[keep]
+        return weeks
+
+    def forecast(self, history, goals, now=None, percentiles=(10, 50, 90)):
+        """
+        Forecast completion of every goal.
+
+        Args:
+            history (TransactionColumns): The user's saving transactions
+            goals (list): Goal dicts with 'category' and 'remaining_cents',
+                and optionally 'deadline' (YYYY-MM-DD), e.g. from
+                savings.get_goals_with_progress
+            now (datetime, optional): Forecast start, defaults to now
+            percentiles (tuple): Completion percentiles to report
+
+        Returns:
+            list: One dict per goal, in order, with
+                weekly_rate: Mean weekly deposit over the window, in dollars
+                rolling_eta: Completion date at that rate, or None if it is 0
+                eta_p<N>: Date by which N% of simulated paths completed, or
+                    None if fewer did so within the horizon
+                deadline_probability: Share of paths completing by the
+                    deadline, or None without a deadline
+        """
+        now = now or datetime.now()
+        today = now.date()
+        if not goals:
+            return []
+
+        categories = [goal['category'] for goal in goals]
+        deposits = self.weekly_deposits(history, categories, now)
+        remaining = np.array([max(goal['remaining_cents'], 0) for goal in goals], dtype=np.int64)
+        rates = deposits.mean(axis=1)
+
+        weeks = self.simulate(deposits, remaining)
+
+        # 'higher' never interpolates between a finite week and inf
+        eta_weeks = np.percentile(weeks, percentiles, axis=1, method='higher')
+
+        results = []
+        for index, goal in enumerate(goals):
+            if remaining[index] == 0:
+                rolling_eta = today
+            else:
+                rolling_eta = None
+                if rates[index] > 0:
+                    try:
+                        rolling_eta = today + timedelta(weeks=float(np.ceil(remaining[index] / rates[index])))
+                    except OverflowError:
+                        pass
+
+            result = {
+                'weekly_rate': float(rates[index]) / 100,
+                'rolling_eta': rolling_eta,
+                'deadline_probability': None,
+            }
+            for percentile, week in zip(percentiles, eta_weeks[:, index]):
+                result[f'eta_p{percentile}'] = today + timedelta(weeks=float(week)) if np.isfinite(week) else None
+
+            deadline = goal.get('deadline')
+            if deadline:
+                try:
+                    days_left = (date.fromisoformat(str(deadline)[:10]) - today).days
+                    result['deadline_probability'] = float(np.mean(weeks[index] * 7 <= days_left))
+                except ValueError:
+                    pass
+            results.append(result)
+        return results
@@ -0,0 +1,65 @@
+from src.utils.formatters import to_cents, from_cents
+
+# Transaction type -> key of its per-category totals in a dashboard snapshot
+SNAPSHOT_KEYS = {"Expense": "expenses", "Saving": "savings", "Income": "income"}
+
+
+class BudgetSummary:
+    """
+    In-memory running totals of a user's transactions, by type and category.
+
+    Loaded once from a dashboard snapshot, then kept current by applying
+    each add, edit and delete, so the UI never reads totals back out of
+    its labels. Amounts are integer cents, so adding and taking out
+    transactions does not drift.
+
+    Attributes:
+        categories: {type: {category: cents}}
+        totals: {type: cents}
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Reset every total to zero."""
+        self.categories = {trans_type: {} for trans_type in SNAPSHOT_KEYS}
+        self.totals = {trans_type: 0 for trans_type in SNAPSHOT_KEYS}
+
+    def load(self, snapshot):
+        """
+        Replace the totals with those of a dashboard snapshot.
+
+        Args:
+            snapshot (dict): As returned by get_dashboard_snapshot
+        """
+        self.clear()
+        for trans_type, key in SNAPSHOT_KEYS.items():
+            by_category = {category: to_cents(amount) for category, amount in snapshot[key].items()}
+            self.categories[trans_type] = by_category
+            self.totals[trans_type] = sum(by_category.values())
+
+    def add(self, category, amount, trans_type):
+        """
+        Add a transaction to the totals; a negative amount takes one out.
+
+        Args:
+            category (str): Transaction category
+            amount (float): Amount in dollars
+            trans_type (str): Expense, Saving or Income
+        """
+        cents = to_cents(amount)
+        by_category = self.categories[trans_type]
+        by_category[category] = by_category.get(category, 0) + cents
+        self.totals[trans_type] += cents
+
+    def set_total(self, trans_type, amount):
+        """Override the overall total of a type, leaving its categories as they are."""
+        self.totals[trans_type] = to_cents(amount)
+
+    def category_total(self, trans_type, category):
+        """Total of one category in dollars"""
+        return from_cents(self.categories[trans_type].get(category, 0))
+
+    def total(self, trans_type):
+        """Overall total of a type in dollars"""
+        return from_cents(self.totals[trans_type])
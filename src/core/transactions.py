@@ -1,22 +1,43 @@
 from src.models import transaction
+from src.core.anomalies import AnomalyDetector
+from src.utils.formatters import to_cents
 
 
 class TransactionManager:
     def __init__(self, user_id=None):
         self.user_id = user_id
+        self.anomaly_detector = AnomalyDetector()
 
     def add(self, category, amount, trans_type, description=None):
         if amount <= 0:
             return False, "Amount must be greater than 0"
-        if trans_type not in ["Saving", "Expense", "Income"]:
+        trans_type = transaction.TRANSACTION_TYPES.get(str(trans_type).lower())
+        if trans_type is None:
             return False, "Invalid transaction type"
 
         tx_id = transaction.save_transaction(category, amount, trans_type, description, self.user_id)
         if tx_id:
+            if trans_type == "Expense":
+                self.anomaly_detector.process(self.user_id, [tx_id], [category], [to_cents(amount)])
             return True, f"Transaction saved with ID {tx_id}"
         else:
             return False, "Failed to save transaction"
 
+    def add_bulk(self, rows):
+        rows = list(rows)
+        tx_ids = transaction.save_transactions_bulk(rows, self.user_id)
+        if tx_ids is None:
+            return False, "Failed to save transactions"
+        expenses = [(tx_id, row) for tx_id, row in zip(tx_ids, rows) if str(row["type"]).lower() == "expense"]
+        if expenses:
+            self.anomaly_detector.process(
+                self.user_id,
+                [tx_id for tx_id, _ in expenses],
+                [row["category"] for _, row in expenses],
+                [to_cents(row["amount"]) for _, row in expenses],
+            )
+        return True, tx_ids
+
     def get_all(self):
         return transaction.load_all_transactions(user_id=self.user_id)
 
@@ -19,6 +19,8 @@ from src.ui.transaction_frame import TransactionFrame
 from src.ui.savings_frame import SavingsFrame
 from src.controllers.auth_controller import AuthController
 from src.controllers.transaction_controller import TransactionController
+from src.models.database import optimize_databases
+from src.core.background import TkDispatcher, shutdown_executor
 
 
 class BudgetFlowApp(tk.Tk):
@@ -31,6 +33,8 @@ class BudgetFlowApp(tk.Tk):
     
     Attributes:
         auth_controller (AuthController): Controller handling user authentication
+        transaction_controller (TransactionController): Controller for transaction reads and writes
+        dispatcher (TkDispatcher): Delivers background query results to the frames on the Tk thread
         container (tk.Frame): Main container for all frames
         frames (dict): Dictionary storing all UI frames
     """
@@ -44,6 +48,7 @@ class BudgetFlowApp(tk.Tk):
         super().__init__()
         self.auth_controller = AuthController(self)
         self.transaction_controller = TransactionController(self.auth_controller.auth_manager)
+        self.dispatcher = TkDispatcher(self)
         
         # Configure the window
         self.title("BudgetFlow")
@@ -141,6 +146,12 @@ class BudgetFlowApp(tk.Tk):
         # Perform any cleanup needed before shutdown
         print("Application closing...")
         
+        # Let running background work finish, drop the rest
+        shutdown_executor(wait=True)
+        
+        # Refresh query planner statistics and close pooled connections
+        optimize_databases()
+        
         # Destroy the window and exit
         self.destroy()
         import sys
@@ -0,0 +1,136 @@
+from .database import get_transactions_db_connection as get_db_connection
+from src.models.transaction import dict_factory
+
+
+def load_category_moments(user_id):
+    """
+    Load the running expense statistics of every category of a user
+    
+    Args:
+        user_id (int): User ID
+    
+    Returns:
+        dict: {category: (count, mean_cents, m2)}
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        rows = cursor.execute(
+            "SELECT category, count, mean_cents, m2 FROM category_moments WHERE user_id = ?",
+            (user_id,)
+        ).fetchall()
+        return {row['category']: (row['count'], row['mean_cents'], row['m2']) for row in rows}
+    
+    except Exception as e:
+        print(f"Error loading category moments: {e}")
+        return {}
+    
+    finally:
+        conn.close()
+
+def save_anomaly_scan(user_id, moments, anomalies, reset=False):
+    """
+    Store updated category statistics and newly flagged expenses together
+    
+    Args:
+        user_id (int): User ID
+        moments (dict): {category: (count, mean_cents, m2)} to write
+        anomalies (list): (transaction_id, category, amount_cents, z_score,
+            mean_cents, std_cents) tuples to flag
+        reset (bool): Drop the user's existing statistics and flags first
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        if reset:
+            cursor.execute("DELETE FROM category_moments WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM transaction_anomalies WHERE user_id = ?", (user_id,))
+        cursor.executemany(
+            "INSERT OR REPLACE INTO category_moments (user_id, category, count, mean_cents, m2) VALUES (?, ?, ?, ?, ?)",
+            [(user_id, category, count, mean, m2) for category, (count, mean, m2) in moments.items()]
+        )
+        cursor.executemany(
+            "INSERT OR REPLACE INTO transaction_anomalies (transaction_id, user_id, category, amount_cents, z_score, mean_cents, std_cents) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(tx_id, user_id, category, amount_cents, z, mean, std)
+             for tx_id, category, amount_cents, z, mean, std in anomalies]
+        )
+        conn.commit()
+        return True
+    
+    except Exception as e:
+        print(f"Error saving anomaly scan: {e}")
+        conn.rollback()
+        return False
+    
+    finally:
+        conn.close()
+
+def clear_anomaly(transaction_id):
+    """
+    Remove the flag of a transaction, e.g. after it was edited
+    
+    Args:
+        transaction_id (int): ID of the transaction
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("DELETE FROM transaction_anomalies WHERE transaction_id = ?", (transaction_id,))
+        conn.commit()
+        return True
+    
+    except Exception as e:
+        print(f"Error clearing anomaly: {e}")
+        conn.rollback()
+        return False
+    
+    finally:
+        conn.close()
+
+def get_anomalies(user_id, limit=50):
+    """
+    Get a user's flagged expenses, newest first
+    
+    Args:
+        user_id (int): User ID
+        limit (int): Maximum number of flags to return
+    
+    Returns:
+        list: Dictionaries with the transaction's id, category, amount,
+            description and created_at, plus z_score and the category's
+            mean and std in dollars at the time it was flagged
+    """
+    conn = get_db_connection()
+    conn.row_factory = dict_factory
+    cursor = conn.cursor()
+    
+    try:
+        return cursor.execute(
+            """
+            SELECT a.transaction_id AS id, a.category, a.amount_cents / 100.0 AS amount, a.amount_cents,
+                a.z_score, a.mean_cents / 100.0 AS mean, a.std_cents / 100.0 AS std,
+                t.description, t.created_at
+            FROM transaction_anomalies a JOIN transactions t ON t.id = a.transaction_id
+            WHERE a.user_id = ?
+            ORDER BY a.transaction_id DESC
+            LIMIT ?
+            """,
+            (user_id, limit)
+        ).fetchall()
+    
+    except Exception as e:
+        print(f"Error getting anomalies: {e}")
+        return []
+    
+    finally:
+        conn.close()
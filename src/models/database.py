@@ -1,7 +1,10 @@
 
 import sqlite3
+import threading
+import time
 from pathlib import Path
-import os
+from src.config import Config
+from src.models.migrations import migrate, USERS_MIGRATIONS, TRANSACTIONS_MIGRATIONS
 
 # Get the project root directory
 current_file = Path(__file__)
@@ -13,106 +16,358 @@ data_dir.mkdir(exist_ok=True)
 USERS_DB_PATH = data_dir / "users.db"
 TRANSACTIONS_DB_PATH = data_dir / "transactions.db"
 
-### ---------- Connection Functions ----------
+# Number of idle connections kept open per database for reuse
+POOL_SIZE = 4
 
-def get_users_db_connection():
-    conn = sqlite3.connect(USERS_DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+### ---------- Connection Management ----------
 
-def get_transactions_db_connection():
-    conn = sqlite3.connect(TRANSACTIONS_DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+_JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+_TEMP_STORES = ("DEFAULT", "FILE", "MEMORY")
+
+def _choice(value, allowed, setting):
+    value = str(value).upper()
+    if value not in allowed:
+        raise ValueError(f"{setting} must be one of {', '.join(allowed)}, got '{value}'")
+    return value
+
+def apply_performance_profile(conn):
+    """
+    Apply the SQLite performance settings from Config to a connection.
+
+    WAL journaling lets readers run alongside a writer and, together with
+    synchronous=NORMAL, avoids a full fsync on every commit. The page cache,
+    memory-mapped I/O size and in-memory temp storage speed up reads and
+    sorts on large ledgers.
+
+    Args:
+        conn (sqlite3.Connection): Newly opened connection
+    """
+    journal_mode = _choice(Config.SQLITE_JOURNAL_MODE, _JOURNAL_MODES, "SQLITE_JOURNAL_MODE")
+    synchronous = _choice(Config.SQLITE_SYNCHRONOUS, _SYNCHRONOUS_MODES, "SQLITE_SYNCHRONOUS")
+    temp_store = _choice(Config.SQLITE_TEMP_STORE, _TEMP_STORES, "SQLITE_TEMP_STORE")
+
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    conn.execute(f"PRAGMA synchronous = {synchronous}")
+    # A negative cache_size is a size in KiB rather than a page count
+    conn.execute(f"PRAGMA cache_size = -{int(Config.SQLITE_CACHE_SIZE_KB)}")
+    conn.execute(f"PRAGMA mmap_size = {int(Config.SQLITE_MMAP_SIZE)}")
+    conn.execute(f"PRAGMA temp_store = {temp_store}")
+
+class ConnectionHandle:
+    """
+    A connection borrowed from a ConnectionPool.
+
+    Behaves like a sqlite3.Connection, but close() (or leaving a ``with``
+    block) hands the connection back to its pool instead of closing it.
+    Any row_factory set through the handle is undone on release.
+
+    A nested handle borrowed while an outer one has a transaction open
+    works inside a SAVEPOINT, so its commit() and rollback() only release
+    or undo its own writes. The outer caller's pending writes are committed
+    or discarded by the outer handle alone. A BEGIN issued through a nested
+    handle is skipped, as the savepoint already plays its part.
+
+    A handle dropped without being closed is given back when it is garbage
+    collected, so one leaked handle does not leave its thread nested for good.
+    """
+    def __init__(self, pool, slot, conn, savepoint=None):
+        self._pool = pool
+        self._slot = slot
+        self._conn = conn
+        self._row_factory = conn.row_factory
+        self._released = False
+        self._savepoint = savepoint
+        if savepoint is not None:
+            conn.execute(f"SAVEPOINT {savepoint}")
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def execute(self, sql, *args):
+        if self._savepoint is not None and sql.lstrip().upper().startswith("BEGIN"):
+            return self._conn.cursor()
+        return self._conn.execute(sql, *args)
+
+    def commit(self):
+        """Commit, or for a nested handle keep its writes in the outer transaction."""
+        if self._savepoint is None:
+            self._conn.commit()
+            return
+        if not self._conn.in_transaction:
+            return
+        # Releasing ends the savepoint; open a fresh one for any later writes
+        self._conn.execute(f"RELEASE SAVEPOINT {self._savepoint}")
+        self._conn.execute(f"SAVEPOINT {self._savepoint}")
+
+    def rollback(self):
+        """Roll back, or for a nested handle undo only the writes made since its savepoint."""
+        if self._savepoint is None:
+            self._conn.rollback()
+            return
+        if self._conn.in_transaction:
+            self._conn.execute(f"ROLLBACK TO SAVEPOINT {self._savepoint}")
+
+    @property
+    def row_factory(self):
+        return self._conn.row_factory
+
+    @row_factory.setter
+    def row_factory(self, factory):
+        self._conn.row_factory = factory
+
+    def close(self):
+        """Return the connection to the pool. Safe to call more than once."""
+        if self._released:
+            return
+        self._released = True
+        if self._savepoint is not None and self._conn.in_transaction:
+            # Writes a nested handle never committed are discarded, as on release
+            self._conn.execute(f"ROLLBACK TO SAVEPOINT {self._savepoint}")
+            self._conn.execute(f"RELEASE SAVEPOINT {self._savepoint}")
+        self._conn.row_factory = self._row_factory
+        self._pool.release(self._slot, self._conn)
+
+    def __del__(self):
+        if self.__dict__.get("_released", True):
+            return
+        # Leaked handle: only give back its share of the connection. Its
+        # savepoint, if any, is left to the outer handle to commit or discard.
+        self._released = True
+        try:
+            self._conn.row_factory = self._row_factory
+            self._pool.release(self._slot, self._conn)
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None and self._conn.in_transaction:
+            self.rollback()
+        self.close()
+        return False
+
+
+class _ThreadSlot:
+    """Connection a thread currently holds and how many handles share it."""
+    __slots__ = ("conn", "depth")
+
+    def __init__(self):
+        self.conn = None
+        self.depth = 0
+
+
+class ConnectionPool:
+    """
+    Reusable SQLite connections for a single database file.
+
+    Each thread holds at most one connection at a time: nested acquire()
+    calls on the same thread (e.g. a model function called while another
+    handle is open) share it, inside a savepoint if the outer handle has a
+    transaction open. When a thread releases its last handle the
+    connection goes back to a small idle list, so Tk callbacks and worker
+    threads never use the same connection concurrently.
+    """
+    def __init__(self, path, max_idle=POOL_SIZE):
+        self.path = path
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self):
+        # Connections move between threads through the idle list, but are
+        # only ever used by the thread that currently holds them.
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        try:
+            apply_performance_profile(conn)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _thread_slot(self):
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            slot = self._local.slot = _ThreadSlot()
+        return slot
+
+    def acquire(self):
+        """
+        Borrow a connection for the calling thread.
+
+        Returns:
+            ConnectionHandle: Handle to close (or use as a context manager)
+        """
+        slot = self._thread_slot()
+        with self._lock:
+            if slot.depth:
+                slot.depth += 1
+                conn = slot.conn
+                nested = True
+            else:
+                conn = self._idle.pop() if self._idle else None
+                nested = False
+        if nested:
+            savepoint = f"pool_nested_{slot.depth}" if conn.in_transaction else None
+            return ConnectionHandle(self, slot, conn, savepoint)
+
+        if conn is None:
+            conn = self._connect()
+        with self._lock:
+            slot.conn = conn
+            slot.depth = 1
+        return ConnectionHandle(self, slot, conn)
+
+    def release(self, slot, conn):
+        """
+        Give back a connection obtained from acquire().
+
+        Args:
+            slot (_ThreadSlot): Slot of the thread that acquired the handle,
+                which need not be the thread releasing it
+            conn (sqlite3.Connection): The borrowed connection
+        """
+        with self._lock:
+            slot.depth -= 1
+            if slot.depth:
+                return
+            slot.conn = None
+
+        # Never hand out a connection with someone else's pending writes
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self):
+        """Close every idle connection in the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_connection_pool(db_path):
+    """
+    Get the shared connection pool for a database file, creating it on first use.
+
+    Args:
+        db_path (Path): Path to the SQLite database file
+
+    Returns:
+        ConnectionPool: Pool serving connections to that file
+    """
+    key = str(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(db_path)
+        return pool
+
+def close_all_connections():
+    """
+    Close all idle pooled connections, e.g. on shutdown or between tests.
+
+    Also forgets which databases were initialized, since the files may be
+    replaced once nothing holds them open.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+    with _init_lock:
+        _init_times.clear()
+
+def optimize_databases():
+    """
+    Run PRAGMA optimize on every database used this session, then close the pools.
+
+    Meant to be called once on shutdown so SQLite can refresh the query
+    planner statistics for tables whose usage changed.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        try:
+            with pool.acquire() as conn:
+                conn.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            print(f"Error optimizing database {pool.path}: {e}")
+    close_all_connections()
 
 ### ---------- Initialization Functions ----------
 
+# Database path -> seconds spent bringing its schema up to date
+_init_times = {}
+_init_lock = threading.RLock()
+
+def _initialize(db_path, migrations):
+    start = time.perf_counter()
+    with get_connection_pool(db_path).acquire() as conn:
+        migrate(conn, migrations)
+    _init_times[str(db_path)] = time.perf_counter() - start
+
+def _ensure_schema(db_path, migrations):
+    if str(db_path) in _init_times:
+        return
+    with _init_lock:
+        if str(db_path) not in _init_times:
+            _initialize(db_path, migrations)
+
 def init_users_db():
-    conn = get_users_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users(
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        email TEXT UNIQUE NOT NULL,
-        full_name TEXT NOT NULL,
-        password_hash TEXT NOT NULL,
-        phone_number TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    conn.commit()
-    conn.close()
+    with _init_lock:
+        _initialize(USERS_DB_PATH, USERS_MIGRATIONS)
 
 def init_transactions_db():
-    conn = get_transactions_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS transactions(
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        category TEXT NOT NULL,
-        amount REAL NOT NULL,
-        type TEXT NOT NULL,
-        description TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS savings_goals(
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        category TEXT NOT NULL,
-        target_amount REAL NOT NULL,
-        deadline TEXT,
-        description TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS budget_categories(
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT UNIQUE NOT NULL,
-        type TEXT NOT NULL,
-        description TEXT,
-        color TEXT,
-        icon TEXT
-    )
-    ''')
-
-    # Insert default categories
-    if cursor.execute("SELECT COUNT(*) FROM budget_categories").fetchone()[0] == 0:
-        default_categories = [
-            ("Savings", "saving", "General savings", "#76c7c0", "💰"),
-            ("Vacation", "saving", "Vacation fund", "#fdd365", "🏖️"),
-            ("Emergency", "saving", "Emergency fund", "#f7b7a3", "🚨"),
-            ("Education", "saving", "Education fund", "#cfe2ff", "🎓"),
-            ("Food", "expense", "Groceries and dining", "#ffcea9", "🍔"),
-            ("Rent", "expense", "Housing costs", "#ffb1b1", "🏠"),
-            ("Shopping", "expense", "Retail shopping", "#dcadff", "🛍️"),
-            ("Transportation", "expense", "Public transit and gas", "#a9def9", "🚗"),
-            ("Healthcare", "expense", "Medical expenses", "#d4f8d4", "🏥"),
-            ("Personal", "expense", "Personal care", "#e7ceff", "💇"),
-            ("Recreation", "expense", "Entertainment and hobbies", "#fcf7bb", "🎮")
-        ]
-        cursor.executemany(
-            "INSERT INTO budget_categories (name, type, description, color, icon) VALUES (?, ?, ?, ?, ?)",
-            default_categories
-        )
-
-    conn.commit()
-    conn.close()
+    with _init_lock:
+        _initialize(TRANSACTIONS_DB_PATH, TRANSACTIONS_MIGRATIONS)
+
+def ensure_initialized():
+    """
+    Make sure both databases exist and their schemas are up to date.
+
+    Idempotent and memoized: only the first call per database file does
+    any work. Connection functions call it for their own database, so
+    nothing is set up until the first query needs it.
+    """
+    _ensure_schema(USERS_DB_PATH, USERS_MIGRATIONS)
+    _ensure_schema(TRANSACTIONS_DB_PATH, TRANSACTIONS_MIGRATIONS)
+
+def get_initialization_times():
+    """
+    Get how long database initialization took.
+
+    Returns:
+        dict: Database path -> seconds spent on schema setup, for each
+              database initialized since the last close_all_connections()
+    """
+    with _init_lock:
+        return dict(_init_times)
+
+### ---------- Connection Functions ----------
+
+def get_users_db_connection():
+    _ensure_schema(USERS_DB_PATH, USERS_MIGRATIONS)
+    return get_connection_pool(USERS_DB_PATH).acquire()
+
+def get_transactions_db_connection():
+    _ensure_schema(TRANSACTIONS_DB_PATH, TRANSACTIONS_MIGRATIONS)
+    return get_connection_pool(TRANSACTIONS_DB_PATH).acquire()
 
 ### ---------- Init All ----------
 
 def initialize_all_databases():
-    init_users_db()
-    init_transactions_db()
-    print("✅ All databases initialized.")
-
-# Run when file is loaded
-initialize_all_databases()
\ No newline at end of file
+    ensure_initialized()
+    total = sum(get_initialization_times().values())
+    print(f"✅ All databases initialized in {total:.3f}s.")
@@ -0,0 +1,758 @@
+"""
+Versioned schema migrations for users.db and transactions.db.
+
+Each database records the version of its schema in PRAGMA user_version.
+A migration is a numbered step; migrate() applies every step newer than the
+stored version, in order, and bumps user_version after each one. Steps must
+never be edited or renumbered once released - add a new step instead.
+"""
+
+import sqlite3
+from src.config import Config
+
+
+class Migration:
+    """
+    A single schema change.
+
+    Attributes:
+        version (int): Schema version the database is at after this step
+        description (str): Short human-readable summary
+        apply (callable): Function taking (conn, batch_size) that makes the change
+        online (bool): False if the step runs inside one transaction together with
+            the version bump. True if it manages its own commits, e.g. a batched
+            table rebuild that must not hold the write lock for its whole duration.
+    """
+    def __init__(self, version, description, apply, online=False):
+        self.version = version
+        self.description = description
+        self.apply = apply
+        self.online = online
+
+
+def get_schema_version(conn):
+    """Return the schema version stored in PRAGMA user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn, migrations, batch_size=None):
+    """
+    Bring a database up to the newest schema version.
+
+    Args:
+        conn: Open connection to the database
+        migrations (list): Migration steps, ordered by version
+        batch_size (int, optional): Rows per transaction for online steps,
+            defaults to Config.MIGRATION_BATCH_SIZE
+
+    Returns:
+        list: Versions that were applied, empty if already up to date
+    """
+    batch_size = batch_size or Config.MIGRATION_BATCH_SIZE
+    current = get_schema_version(conn)
+    applied = []
+
+    for migration in migrations:
+        if migration.version <= current:
+            continue
+
+        if migration.online:
+            migration.apply(conn, batch_size)
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            conn.commit()
+        else:
+            # PRAGMA user_version is transactional, so a failed step leaves
+            # both the schema and the version untouched
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                migration.apply(conn, batch_size)
+                conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        print(f"Migrated database to v{migration.version}: {migration.description}")
+        current = migration.version
+        applied.append(migration.version)
+
+    return applied
+
+### ---------- Online Table Rebuild ----------
+
+def rebuild_table(conn, table, create_sql, columns, batch_size, finalize_sql=(), progress=None):
+    """
+    Copy a table into a new schema in small batches, then swap it in.
+
+    Storage-format changes SQLite cannot do with ALTER TABLE need a full
+    rebuild. Instead of one long transaction, rows are copied by rowid range
+    with a commit after every batch so other connections can keep reading
+    and writing. Triggers on the old table mirror inserts, updates and
+    deletes into the new table while the copy runs. The final swap is a
+    single short transaction, so the table is always in either its old or
+    its new layout. A table that already has every column of the new layout
+    was swapped by an earlier, interrupted run and is left alone; otherwise
+    an interrupted copy is simply restarted. A step that rebuilds several
+    tables can therefore be rerun after a crash between two of them.
+
+    The table must have an ``id INTEGER PRIMARY KEY`` column.
+
+    Args:
+        conn: Open connection to the database
+        table (str): Table to rebuild
+        create_sql (str): CREATE TABLE statement for the new layout, with
+            ``{table}`` in place of the table name
+        columns (dict): New column name -> SQL expression computing it from the
+            old row, with ``{row}`` in place of the row alias,
+            e.g. ``{"amount_cents": "CAST(ROUND({row}.amount * 100) AS INTEGER)"}``
+        batch_size (int): Rows copied per transaction
+        finalize_sql (iterable, optional): Statements (indexes, triggers) run in
+            the swap transaction after the new table takes the old name
+        progress (callable, optional): Called with the number of rows copied
+            so far after every batch
+
+    Returns:
+        int: Number of rows copied by the batch phase, 0 if already rebuilt
+    """
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if set(columns) <= existing:
+        return 0
+
+    new_table = f"{table}__rebuild"
+    triggers = [f"{table}__rebuild_insert", f"{table}__rebuild_update", f"{table}__rebuild_delete"]
+    column_list = ", ".join(columns)
+
+    def values(row):
+        return ", ".join(expr.format(row=row) for expr in columns.values())
+
+    # Start from a clean slate in case an earlier attempt was interrupted
+    conn.execute("BEGIN IMMEDIATE")
+    for trigger in triggers:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute(f"DROP TABLE IF EXISTS {new_table}")
+    conn.execute(create_sql.format(table=new_table))
+    conn.execute(f"""
+        CREATE TRIGGER {triggers[0]} AFTER INSERT ON {table} BEGIN
+            INSERT OR REPLACE INTO {new_table} ({column_list}) VALUES ({values('NEW')});
+        END""")
+    conn.execute(f"""
+        CREATE TRIGGER {triggers[1]} AFTER UPDATE ON {table} BEGIN
+            DELETE FROM {new_table} WHERE id = OLD.id;
+            INSERT OR REPLACE INTO {new_table} ({column_list}) VALUES ({values('NEW')});
+        END""")
+    conn.execute(f"""
+        CREATE TRIGGER {triggers[2]} AFTER DELETE ON {table} BEGIN
+            DELETE FROM {new_table} WHERE id = OLD.id;
+        END""")
+    conn.commit()
+
+    # Copy existing rows. INSERT OR IGNORE keeps any newer version a
+    # trigger has already written.
+    copied = 0
+    last_id = 0
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        upper = conn.execute(
+            f"SELECT MAX(id) FROM (SELECT id FROM {table} WHERE id > ? ORDER BY id LIMIT ?)",
+            (last_id, batch_size)
+        ).fetchone()[0]
+        if upper is None:
+            break
+        cursor = conn.execute(
+            f"INSERT OR IGNORE INTO {new_table} ({column_list}) "
+            f"SELECT {values(table)} FROM {table} WHERE id > ? AND id <= ?",
+            (last_id, upper)
+        )
+        conn.commit()
+        copied += cursor.rowcount
+        last_id = upper
+        if progress:
+            progress(copied)
+
+    # Swap, still holding the write lock taken by the last BEGIN above
+    try:
+        has_sequence = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'"
+        ).fetchone()
+        old_seq = None
+        if has_sequence:
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+            old_seq = row[0] if row else None
+
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+
+        # Keep AUTOINCREMENT from reusing ids of rows deleted before the rebuild
+        if old_seq is not None:
+            updated = conn.execute(
+                "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?",
+                (old_seq, table)
+            ).rowcount
+            if not updated:
+                conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, old_seq))
+
+        for sql in finalize_sql:
+            conn.execute(sql)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+    return copied
+
+def backfill_column(conn, table, assignment, batch_size, where=None, progress=None):
+    """
+    Run an UPDATE over a whole table in id-range batches, one commit per batch.
+
+    Used to populate a newly added column on a large table without holding
+    the write lock for the entire backfill.
+
+    Args:
+        conn: Open connection to the database
+        table (str): Table to update; must have an ``id INTEGER PRIMARY KEY`` column
+        assignment (str): SET clause, e.g. ``"created_ts = ..."``
+        batch_size (int): Rows visited per transaction
+        where (str, optional): Extra condition limiting which rows are updated
+        progress (callable, optional): Called with the number of rows updated
+            so far after every batch
+
+    Returns:
+        int: Number of rows updated
+    """
+    condition = f" AND ({where})" if where else ""
+    updated = 0
+    last_id = 0
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        upper = conn.execute(
+            f"SELECT MAX(id) FROM (SELECT id FROM {table} WHERE id > ? ORDER BY id LIMIT ?)",
+            (last_id, batch_size)
+        ).fetchone()[0]
+        if upper is None:
+            conn.commit()
+            return updated
+        cursor = conn.execute(
+            f"UPDATE {table} SET {assignment} WHERE id > ? AND id <= ?{condition}",
+            (last_id, upper)
+        )
+        conn.commit()
+        updated += cursor.rowcount
+        last_id = upper
+        if progress:
+            progress(updated)
+
+### ---------- users.db ----------
+
+def _users_baseline(conn, batch_size):
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS users(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        full_name TEXT NOT NULL,
+        password_hash TEXT NOT NULL,
+        phone_number TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+USERS_MIGRATIONS = [
+    Migration(1, "create users table", _users_baseline),
+]
+
+### ---------- transactions.db ----------
+
+def _transactions_baseline(conn, batch_size):
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS transactions(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        amount REAL NOT NULL,
+        type TEXT NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS savings_goals(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        target_amount REAL NOT NULL,
+        deadline TEXT,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS budget_categories(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        type TEXT NOT NULL,
+        description TEXT,
+        color TEXT,
+        icon TEXT
+    )
+    ''')
+
+    # Insert default categories
+    if conn.execute("SELECT COUNT(*) FROM budget_categories").fetchone()[0] == 0:
+        default_categories = [
+            ("Savings", "saving", "General savings", "#76c7c0", "💰"),
+            ("Vacation", "saving", "Vacation fund", "#fdd365", "🏖️"),
+            ("Emergency", "saving", "Emergency fund", "#f7b7a3", "🚨"),
+            ("Education", "saving", "Education fund", "#cfe2ff", "🎓"),
+            ("Food", "expense", "Groceries and dining", "#ffcea9", "🍔"),
+            ("Rent", "expense", "Housing costs", "#ffb1b1", "🏠"),
+            ("Shopping", "expense", "Retail shopping", "#dcadff", "🛍️"),
+            ("Transportation", "expense", "Public transit and gas", "#a9def9", "🚗"),
+            ("Healthcare", "expense", "Medical expenses", "#d4f8d4", "🏥"),
+            ("Personal", "expense", "Personal care", "#e7ceff", "💇"),
+            ("Recreation", "expense", "Entertainment and hobbies", "#fcf7bb", "🎮")
+        ]
+        conn.executemany(
+            "INSERT INTO budget_categories (name, type, description, color, icon) VALUES (?, ?, ?, ?, ?)",
+            default_categories
+        )
+
+def _transactions_query_indexes(conn, batch_size):
+    # Indexes matched to the per-user query shapes in transaction.py, so
+    # loaders and summaries search by user instead of scanning the table.
+    # The rowid is implicitly the last column of every index.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_user_created "
+        "ON transactions(user_id, created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_user_category_created "
+        "ON transactions(user_id, category, created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_user_type_created "
+        "ON transactions(user_id, type, created_at)"
+    )
+    # Covering index for the SUM(amount) ... GROUP BY category summaries
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_user_type_category_amount "
+        "ON transactions(user_id, type, category, amount)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_savings_goals_user_created "
+        "ON savings_goals(user_id, created_at)"
+    )
+
+def _transactions_integer_cents(conn, batch_size):
+    # Money is stored as integer cents so sums are exact integer arithmetic
+    rebuild_table(
+        conn,
+        "transactions",
+        '''
+        CREATE TABLE {table}(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        {
+            "id": "{row}.id",
+            "user_id": "{row}.user_id",
+            "category": "{row}.category",
+            # The inner ROUND absorbs binary float error (0.285 * 100 = 28.4999...)
+            # so values round half-up the same way as formatters.to_cents
+            "amount_cents": "CAST(ROUND(ROUND({row}.amount * 100, 6)) AS INTEGER)",
+            "type": "{row}.type",
+            "description": "{row}.description",
+            "created_at": "{row}.created_at",
+        },
+        batch_size,
+        finalize_sql=[
+            "CREATE INDEX idx_transactions_user_created ON transactions(user_id, created_at)",
+            "CREATE INDEX idx_transactions_user_category_created ON transactions(user_id, category, created_at)",
+            "CREATE INDEX idx_transactions_user_type_created ON transactions(user_id, type, created_at)",
+            "CREATE INDEX idx_transactions_user_type_category_amount ON transactions(user_id, type, category, amount_cents)",
+        ],
+    )
+    rebuild_table(
+        conn,
+        "savings_goals",
+        '''
+        CREATE TABLE {table}(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            target_amount_cents INTEGER NOT NULL,
+            deadline TEXT,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        {
+            "id": "{row}.id",
+            "user_id": "{row}.user_id",
+            "category": "{row}.category",
+            "target_amount_cents": "CAST(ROUND(ROUND({row}.target_amount * 100, 6)) AS INTEGER)",
+            "deadline": "{row}.deadline",
+            "description": "{row}.description",
+            "created_at": "{row}.created_at",
+        },
+        batch_size,
+        finalize_sql=[
+            "CREATE INDEX idx_savings_goals_user_created ON savings_goals(user_id, created_at)",
+        ],
+    )
+
+def _transactions_epoch_timestamps(conn, batch_size):
+    # created_ts is created_at as seconds since the epoch (read as UTC, i.e.
+    # the wall-clock time stored in created_at), so date ranges can be
+    # filtered with a plain index range instead of date(created_at)
+    conn.execute("BEGIN IMMEDIATE")
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(transactions)")]
+    if "created_ts" not in columns:
+        conn.execute("ALTER TABLE transactions ADD COLUMN created_ts INTEGER")
+    # Fills the column for rows inserted without it, e.g. while the backfill runs
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS transactions_fill_created_ts
+        AFTER INSERT ON transactions WHEN NEW.created_ts IS NULL BEGIN
+            UPDATE transactions SET created_ts = CAST(strftime('%s', NEW.created_at) AS INTEGER)
+            WHERE id = NEW.id;
+        END""")
+    conn.commit()
+
+    backfill_column(
+        conn,
+        "transactions",
+        "created_ts = CAST(strftime('%s', created_at) AS INTEGER)",
+        batch_size,
+        where="created_ts IS NULL",
+    )
+
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_user_ts ON transactions(user_id, created_ts)"
+    )
+    conn.commit()
+
+def _transactions_category_totals(conn, batch_size):
+    # Per-user, per-type, per-category rollup kept current by triggers, so
+    # summaries read one row per category instead of summing the history.
+    # Runs in one transaction with the initial fill, so no write can slip in
+    # between the GROUP BY and the triggers taking over.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS category_totals(
+        user_id INTEGER NOT NULL,
+        type TEXT NOT NULL,
+        category TEXT NOT NULL,
+        total_cents INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (user_id, type, category)
+    ) WITHOUT ROWID
+    """)
+
+    conn.execute("DELETE FROM category_totals")
+    conn.execute("""
+        INSERT INTO category_totals (user_id, type, category, total_cents, count)
+        SELECT user_id, type, category, SUM(amount_cents), COUNT(*)
+        FROM transactions GROUP BY user_id, type, category
+    """)
+
+    add = """
+        INSERT INTO category_totals (user_id, type, category, total_cents, count)
+        VALUES (NEW.user_id, NEW.type, NEW.category, NEW.amount_cents, 1)
+        ON CONFLICT (user_id, type, category) DO UPDATE SET
+            total_cents = total_cents + excluded.total_cents,
+            count = count + 1;
+    """
+    remove = """
+        UPDATE category_totals SET
+            total_cents = total_cents - OLD.amount_cents,
+            count = count - 1
+        WHERE user_id = OLD.user_id AND type = OLD.type AND category = OLD.category;
+        DELETE FROM category_totals
+        WHERE user_id = OLD.user_id AND type = OLD.type AND category = OLD.category AND count <= 0;
+    """
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS category_totals_insert
+        AFTER INSERT ON transactions BEGIN {add} END""")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS category_totals_delete
+        AFTER DELETE ON transactions BEGIN {remove} END""")
+    # Only the rolled-up columns; created_ts backfills must not touch totals
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS category_totals_update
+        AFTER UPDATE OF user_id, type, category, amount_cents ON transactions
+        BEGIN {remove} {add} END""")
+
+def _transactions_bucket_index(conn, batch_size):
+    # Covering index for time-bucketed reports: a (user, type) created_ts
+    # range is read straight from the index, category and amount included
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_user_type_ts "
+        "ON transactions(user_id, type, created_ts, category, amount_cents)"
+    )
+
+def _transactions_cover_balance_index(conn, batch_size):
+    # Running balances net type and amount_cents over a created_ts range;
+    # widening the epoch index lets that read skip the table entirely.
+    # id stays right after created_ts so (created_ts, id) orderings and
+    # date-range seeks are still served in index order.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_user_ts_type_amount "
+        "ON transactions(user_id, created_ts, id, type, amount_cents)"
+    )
+    conn.execute("DROP INDEX IF EXISTS idx_transactions_user_ts")
+
+def _savings_goal_names(conn, batch_size):
+    # savings.py has always written a goal name, but the column was never created
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(savings_goals)")]
+    if "name" not in columns:
+        conn.execute("ALTER TABLE savings_goals ADD COLUMN name TEXT")
+
+def _transactions_rolling_stats(conn, batch_size):
+    # Daily totals per user, type and category, and on top of them rolling
+    # sums of daily totals and of their squares for each window length, so
+    # windowed means and variances cost O(1) per write instead of a rescan.
+    # Both levels are kept current by triggers; rolling_stats.py slides the
+    # windows forward as days pass.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS daily_category_totals(
+        user_id INTEGER NOT NULL,
+        type TEXT NOT NULL,
+        category TEXT NOT NULL,
+        day INTEGER NOT NULL,
+        total_cents INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (user_id, type, category, day)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE TABLE IF NOT EXISTS rolling_windows(days INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT OR IGNORE INTO rolling_windows (days) VALUES (?)", [(7,), (30,), (90,)])
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS rolling_stats(
+        user_id INTEGER NOT NULL,
+        type TEXT NOT NULL,
+        category TEXT NOT NULL,
+        window_days INTEGER NOT NULL,
+        as_of_day INTEGER NOT NULL,
+        sum_cents INTEGER NOT NULL,
+        sum_sq_cents INTEGER NOT NULL,
+        PRIMARY KEY (user_id, type, category, window_days)
+    ) WITHOUT ROWID
+    """)
+
+    # transactions -> daily_category_totals
+    add = """
+        INSERT INTO daily_category_totals (user_id, type, category, day, total_cents, count)
+        SELECT NEW.user_id, NEW.type, NEW.category, NEW.created_ts / 86400, NEW.amount_cents, 1
+        WHERE NEW.created_ts IS NOT NULL
+        ON CONFLICT (user_id, type, category, day) DO UPDATE SET
+            total_cents = total_cents + excluded.total_cents,
+            count = count + 1;
+    """
+    remove = """
+        UPDATE daily_category_totals SET
+            total_cents = total_cents - OLD.amount_cents,
+            count = count - 1
+        WHERE user_id = OLD.user_id AND type = OLD.type AND category = OLD.category
+            AND day = OLD.created_ts / 86400;
+        DELETE FROM daily_category_totals
+        WHERE user_id = OLD.user_id AND type = OLD.type AND category = OLD.category
+            AND day = OLD.created_ts / 86400 AND count <= 0;
+    """
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS daily_totals_insert
+        AFTER INSERT ON transactions BEGIN {add} END""")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS daily_totals_delete
+        AFTER DELETE ON transactions BEGIN {remove} END""")
+    # Also fires when transactions_fill_created_ts sets a missing created_ts
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS daily_totals_update
+        AFTER UPDATE OF user_id, type, category, amount_cents, created_ts ON transactions
+        BEGIN {remove} {add} END""")
+
+    # daily_category_totals -> rolling_stats, for days inside each window
+    in_window = "{row}.day > as_of_day - window_days AND {row}.day <= as_of_day"
+    key = "user_id = {row}.user_id AND type = {row}.type AND category = {row}.category"
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS rolling_stats_insert
+        AFTER INSERT ON daily_category_totals BEGIN
+            INSERT INTO rolling_stats (user_id, type, category, window_days, as_of_day, sum_cents, sum_sq_cents)
+            SELECT NEW.user_id, NEW.type, NEW.category, days, NEW.day, 0, 0 FROM rolling_windows WHERE 1
+            ON CONFLICT DO NOTHING;
+            UPDATE rolling_stats SET
+                sum_cents = sum_cents + NEW.total_cents,
+                sum_sq_cents = sum_sq_cents + NEW.total_cents * NEW.total_cents
+            WHERE {key.format(row="NEW")} AND {in_window.format(row="NEW")};
+        END""")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS rolling_stats_update
+        AFTER UPDATE ON daily_category_totals BEGIN
+            UPDATE rolling_stats SET
+                sum_cents = sum_cents + NEW.total_cents - OLD.total_cents,
+                sum_sq_cents = sum_sq_cents + NEW.total_cents * NEW.total_cents - OLD.total_cents * OLD.total_cents
+            WHERE {key.format(row="NEW")} AND {in_window.format(row="NEW")};
+        END""")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS rolling_stats_delete
+        AFTER DELETE ON daily_category_totals BEGIN
+            UPDATE rolling_stats SET
+                sum_cents = sum_cents - OLD.total_cents,
+                sum_sq_cents = sum_sq_cents - OLD.total_cents * OLD.total_cents
+            WHERE {key.format(row="OLD")} AND {in_window.format(row="OLD")};
+            DELETE FROM rolling_stats
+            WHERE {key.format(row="OLD")} AND NOT EXISTS (
+                SELECT 1 FROM daily_category_totals d
+                WHERE d.user_id = OLD.user_id AND d.type = OLD.type AND d.category = OLD.category
+            );
+        END""")
+
+    # Initial fill. Each window stays anchored at the day that created it
+    # until a newer day slides it forward (see _transactions_slide_rolling_windows)
+    conn.execute("""
+        INSERT INTO daily_category_totals (user_id, type, category, day, total_cents, count)
+        SELECT user_id, type, category, created_ts / 86400, SUM(amount_cents), COUNT(*)
+        FROM transactions WHERE created_ts IS NOT NULL
+        GROUP BY user_id, type, category, created_ts / 86400
+        ON CONFLICT DO NOTHING
+    """)
+
+def _transactions_slide_rolling_windows(conn, batch_size):
+    # A new daily row later than a category's windows first slides them to
+    # end on its day, so the windows follow the newest transaction and
+    # reading them never has to write. Replaces the v9 insert trigger.
+    key = "user_id = NEW.user_id AND type = NEW.type AND category = NEW.category"
+    in_window = "NEW.day > as_of_day - window_days AND NEW.day <= as_of_day"
+    # Days that left the old window, and days before NEW.day that entered the new one
+    moved_out = "d.day > rolling_stats.as_of_day - rolling_stats.window_days AND d.day <= rolling_stats.as_of_day"
+    moved_in = "d.day > NEW.day - rolling_stats.window_days AND d.day < NEW.day"
+    changed = """
+        COALESCE((SELECT SUM({value}) FROM daily_category_totals d
+            WHERE d.user_id = NEW.user_id AND d.type = NEW.type AND d.category = NEW.category
+                AND {inside} AND NOT ({outside})), 0)
+    """
+
+    def slid(column, value):
+        return (f"{column} - {changed.format(value=value, inside=moved_out, outside=moved_in)}"
+                f" + {changed.format(value=value, inside=moved_in, outside=moved_out)}")
+
+    conn.execute("DROP TRIGGER IF EXISTS rolling_stats_insert")
+    conn.execute(f"""
+        CREATE TRIGGER rolling_stats_insert
+        AFTER INSERT ON daily_category_totals BEGIN
+            INSERT INTO rolling_stats (user_id, type, category, window_days, as_of_day, sum_cents, sum_sq_cents)
+            SELECT NEW.user_id, NEW.type, NEW.category, days, NEW.day, 0, 0 FROM rolling_windows WHERE 1
+            ON CONFLICT DO NOTHING;
+            UPDATE rolling_stats SET
+                sum_cents = {slid("sum_cents", "d.total_cents")},
+                sum_sq_cents = {slid("sum_sq_cents", "d.total_cents * d.total_cents")},
+                as_of_day = NEW.day
+            WHERE {key} AND as_of_day < NEW.day;
+            UPDATE rolling_stats SET
+                sum_cents = sum_cents + NEW.total_cents,
+                sum_sq_cents = sum_sq_cents + NEW.total_cents * NEW.total_cents
+            WHERE {key} AND {in_window};
+        END""")
+
+def _transactions_anomalies(conn, batch_size):
+    # Welford state (count, mean, sum of squared deviations) of expense
+    # amounts per user and category, and the expenses flagged against it.
+    # The state is kept by triggers from v12 on.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS category_moments(
+        user_id INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        mean_cents REAL NOT NULL,
+        m2 REAL NOT NULL,
+        PRIMARY KEY (user_id, category)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS transaction_anomalies(
+        transaction_id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        amount_cents INTEGER NOT NULL,
+        z_score REAL NOT NULL,
+        mean_cents REAL NOT NULL,
+        std_cents REAL NOT NULL
+    )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transaction_anomalies_user "
+        "ON transaction_anomalies(user_id, transaction_id)"
+    )
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS transaction_anomalies_delete
+        AFTER DELETE ON transactions BEGIN
+            DELETE FROM transaction_anomalies WHERE transaction_id = OLD.id;
+        END""")
+
+def _transactions_anomaly_triggers(conn, batch_size):
+    # Keep the Welford state of expense amounts with triggers, like the
+    # rollups, so every write path counts each expense exactly once. The
+    # state written by core/anomalies.py since v10 only covered writes made
+    # through the controller, so it is recomputed from the history first.
+    conn.execute("DELETE FROM category_moments")
+    conn.execute("""
+        INSERT INTO category_moments (user_id, category, count, mean_cents, m2)
+        SELECT t.user_id, t.category, s.count, s.mean_cents,
+            SUM((t.amount_cents - s.mean_cents) * (t.amount_cents - s.mean_cents))
+        FROM transactions t JOIN (
+            SELECT user_id, category, COUNT(*) AS count, AVG(amount_cents) AS mean_cents
+            FROM transactions WHERE type = 'Expense' GROUP BY user_id, category
+        ) s ON s.user_id = t.user_id AND s.category = t.category
+        WHERE t.type = 'Expense'
+        GROUP BY t.user_id, t.category
+    """)
+
+    # Welford's update, and its reverse, with the old values on the right
+    add = """
+        INSERT INTO category_moments (user_id, category, count, mean_cents, m2)
+        SELECT NEW.user_id, NEW.category, 1, CAST(NEW.amount_cents AS REAL), 0.0
+        WHERE NEW.type = 'Expense'
+        ON CONFLICT (user_id, category) DO UPDATE SET
+            count = count + 1,
+            mean_cents = mean_cents + (excluded.mean_cents - mean_cents) / (count + 1),
+            m2 = m2 + (excluded.mean_cents - mean_cents) * (excluded.mean_cents - mean_cents) * count / (count + 1.0);
+    """
+    remove = """
+        DELETE FROM category_moments
+        WHERE OLD.type = 'Expense' AND user_id = OLD.user_id AND category = OLD.category AND count <= 1;
+        UPDATE category_moments SET
+            count = count - 1,
+            mean_cents = (count * mean_cents - OLD.amount_cents) / (count - 1.0),
+            m2 = MAX(m2 - (OLD.amount_cents - mean_cents) * (OLD.amount_cents - mean_cents) * count / (count - 1.0), 0.0)
+        WHERE OLD.type = 'Expense' AND user_id = OLD.user_id AND category = OLD.category;
+    """
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS category_moments_insert
+        AFTER INSERT ON transactions BEGIN {add} END""")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS category_moments_delete
+        AFTER DELETE ON transactions BEGIN {remove} END""")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS category_moments_update
+        AFTER UPDATE OF user_id, type, category, amount_cents ON transactions
+        BEGIN {remove} {add} END""")
+
+TRANSACTIONS_MIGRATIONS = [
+    Migration(1, "create transactions, savings_goals and budget_categories", _transactions_baseline),
+    Migration(2, "add per-user query indexes", _transactions_query_indexes),
+    Migration(3, "store money as integer cents", _transactions_integer_cents, online=True),
+    Migration(4, "add indexed epoch timestamp column", _transactions_epoch_timestamps, online=True),
+    Migration(5, "add trigger-maintained category_totals rollup", _transactions_category_totals),
+    Migration(6, "add covering index for time-bucketed reports", _transactions_bucket_index),
+    Migration(7, "cover running balances with the epoch timestamp index", _transactions_cover_balance_index),
+    Migration(8, "add savings goal names", _savings_goal_names),
+    Migration(9, "add trigger-maintained daily totals and rolling window stats", _transactions_rolling_stats),
+    Migration(10, "add expense anomaly tables", _transactions_anomalies),
+    Migration(11, "slide rolling windows forward on write", _transactions_slide_rolling_windows),
+    Migration(12, "keep expense statistics with triggers", _transactions_anomaly_triggers),
+]
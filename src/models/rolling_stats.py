@@ -0,0 +1,154 @@
+from .database import get_transactions_db_connection as get_db_connection
+from datetime import datetime
+from src.models.transaction import TRANSACTION_TYPES, to_epoch, _parse_date
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Sum of daily totals over the days of a window ending on as_of_day
+_WINDOW_SUM = """
+    SELECT COALESCE(SUM({value}), 0) FROM daily_category_totals d
+    WHERE d.user_id = rolling_stats.user_id AND d.type = rolling_stats.type
+        AND d.category = rolling_stats.category
+        AND d.day > {end} - rolling_stats.window_days AND d.day <= {end}
+"""
+
+def _day_number(as_of):
+    """Return the created_ts day number of a date, datetime or ISO string (None is today)"""
+    day = _parse_date(as_of) if as_of is not None else datetime.now().date()
+    return to_epoch(day) // SECONDS_PER_DAY
+
+def _slid_sum(column, value, day):
+    """
+    SQL for a window's running sum column (of value) moved to end on day
+    
+    Only the days that left or entered the window since its as_of_day are
+    read, so this costs at most the daily rows of the old and the new
+    window per category, however long the history.
+    """
+    moved_out = "d.day > rolling_stats.as_of_day - rolling_stats.window_days AND d.day <= rolling_stats.as_of_day"
+    moved_in = f"d.day > {day} - rolling_stats.window_days AND d.day <= {day}"
+    changed = """
+        COALESCE((SELECT SUM({value}) FROM daily_category_totals d
+            WHERE d.user_id = rolling_stats.user_id AND d.type = rolling_stats.type
+                AND d.category = rolling_stats.category AND {inside} AND NOT ({outside})), 0)
+    """
+    return (f"{column} - {changed.format(value=value, inside=moved_out, outside=moved_in)}"
+            f" + {changed.format(value=value, inside=moved_in, outside=moved_out)}")
+
+def _describe(sum_cents, sum_sq_cents, window_days):
+    """Turn the running sums of a window into dollar statistics of its daily totals"""
+    # Population variance from integer sums, exact until the final division
+    variance_cents = (window_days * sum_sq_cents - sum_cents * sum_cents) / (window_days * window_days)
+    return {
+        "sum": sum_cents / 100,
+        "mean": sum_cents / window_days / 100,
+        "variance": max(variance_cents, 0) / 10000,
+        "std": max(variance_cents, 0) ** 0.5 / 100,
+    }
+
+def get_rolling_stats(user_id=None, trans_type="Expense", as_of=None):
+    """
+    Get rolling 7/30/90-day statistics per category
+    
+    Statistics describe the daily totals of the days in each window, days
+    without transactions counting as zero. The stored running sums are kept
+    current by triggers on every write, which also move a category's
+    windows forward to the day of its newest transaction. Reading moves
+    them the rest of the way to the requested day in the query itself,
+    touching only the days that changed, and never writes.
+    
+    Args:
+        user_id (int, optional): ID of the user whose statistics to get
+        trans_type (str): Transaction type (e.g., 'Expense', 'Saving')
+        as_of (str, optional): Last day of the windows, defaults to today
+    
+    Returns:
+        dict: {category: {window_days: {"sum", "mean", "variance", "std"}}},
+            amounts in dollars, the mean and spread per day
+    """
+    if user_id is None:
+        return {}
+    
+    trans_type = TRANSACTION_TYPES.get(trans_type.lower(), trans_type)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        rows = cursor.execute(
+            f"""
+            SELECT category, window_days,
+                {_slid_sum("sum_cents", "d.total_cents", ":day")} AS sum_cents,
+                {_slid_sum("sum_sq_cents", "d.total_cents * d.total_cents", ":day")} AS sum_sq_cents
+            FROM rolling_stats
+            WHERE user_id = :user_id AND type = :type
+            ORDER BY category, window_days
+            """,
+            {"user_id": user_id, "type": trans_type, "day": _day_number(as_of)}
+        ).fetchall()
+        
+        stats = {}
+        for row in rows:
+            stats.setdefault(row['category'], {})[row['window_days']] = _describe(
+                row['sum_cents'], row['sum_sq_cents'], row['window_days'])
+        return stats
+    
+    except Exception as e:
+        print(f"Error getting rolling stats: {e}")
+        return {}
+    
+    finally:
+        conn.close()
+
+def rebuild_rolling_stats(user_id=None, as_of=None):
+    """
+    Recompute daily totals and rolling statistics from the transactions table
+    
+    The triggers keep both up to date on their own; this is for verifying
+    them or repairing the tables after writes made with triggers disabled.
+    
+    Args:
+        user_id (int, optional): Only rebuild this user, defaults to all users
+        as_of (str, optional): Day the rebuilt windows end on, defaults to today
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    where, params = ("WHERE user_id = ?", (user_id,)) if user_id is not None else ("", ())
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        day = _day_number(as_of)
+        conn.execute("BEGIN IMMEDIATE")
+        cursor.execute(f"DELETE FROM daily_category_totals {where}", params)
+        cursor.execute(f"DELETE FROM rolling_stats {where}", params)
+        cursor.execute(
+            f"""
+            INSERT INTO daily_category_totals (user_id, type, category, day, total_cents, count)
+            SELECT user_id, type, category, created_ts / 86400, SUM(amount_cents), COUNT(*)
+            FROM transactions {where} {"AND" if where else "WHERE"} created_ts IS NOT NULL
+            GROUP BY user_id, type, category, created_ts / 86400
+            """,
+            params
+        )
+        # The insert triggers created the window rows; recompute their sums outright
+        cursor.execute(
+            f"""
+            UPDATE rolling_stats SET
+                as_of_day = :day,
+                sum_cents = ({_WINDOW_SUM.format(value="d.total_cents", end=":day")}),
+                sum_sq_cents = ({_WINDOW_SUM.format(value="d.total_cents * d.total_cents", end=":day")})
+            {where.replace("?", ":user_id")}
+            """,
+            {"day": day, "user_id": user_id}
+        )
+        conn.commit()
+        return True
+    
+    except Exception as e:
+        print(f"Error rebuilding rolling stats: {e}")
+        conn.rollback()
+        return False
+    
+    finally:
+        conn.close()
@@ -1,6 +1,9 @@
-from .database import get_transactions_db_connection as get_db_connection, dict_factory
+from .database import get_transactions_db_connection as get_db_connection
 from datetime import datetime
-from src.models.transaction import *
+from src.models.transaction import dict_factory
+from src.utils.formatters import to_cents
+
+GOAL_COLUMNS = "id, user_id, name, category, target_amount_cents / 100.0 AS target_amount, target_amount_cents, deadline, description, created_at"
 
 
 def create_savings_goal(user_id, name, category, target_amount, deadline=None):
@@ -22,8 +25,8 @@ def create_savings_goal(user_id, name, category, target_amount, deadline=None):
     
     try:
         cursor.execute(
-            "INSERT INTO savings_goals (user_id, name, category, target_amount, deadline) VALUES (?, ?, ?, ?, ?)",
-            (user_id, name, category, target_amount, deadline)
+            "INSERT INTO savings_goals (user_id, name, category, target_amount_cents, deadline) VALUES (?, ?, ?, ?, ?)",
+            (user_id, name, category, to_cents(target_amount), deadline)
         )
         
         goal_id = cursor.lastrowid
@@ -54,7 +57,7 @@ def get_all_savings_goals(user_id):
     
     try:
         goals = cursor.execute(
-            "SELECT * FROM savings_goals WHERE user_id = ? ORDER BY created_at DESC",
+            f"SELECT {GOAL_COLUMNS} FROM savings_goals WHERE user_id = ? ORDER BY created_at DESC",
             (user_id,)
         ).fetchall()
         
@@ -83,7 +86,7 @@ def get_savings_goal(goal_id):
     
     try:
         goal = cursor.execute(
-            "SELECT * FROM savings_goals WHERE id = ?",
+            f"SELECT {GOAL_COLUMNS} FROM savings_goals WHERE id = ?",
             (goal_id,)
         ).fetchone()
         
@@ -123,11 +126,11 @@ def update_savings_goal(goal_id, name=None, category=None, target_amount=None, d
         # Update only the fields that were provided
         new_name = name if name is not None else current['name']
         new_category = category if category is not None else current['category']
-        new_target = target_amount if target_amount is not None else current['target_amount']
+        new_target = to_cents(target_amount) if target_amount is not None else current['target_amount_cents']
         new_deadline = deadline if deadline is not None else current['deadline']
         
         cursor.execute(
-            "UPDATE savings_goals SET name = ?, category = ?, target_amount = ?, deadline = ? WHERE id = ?",
+            "UPDATE savings_goals SET name = ?, category = ?, target_amount_cents = ?, deadline = ? WHERE id = ?",
             (new_name, new_category, new_target, new_deadline, goal_id)
         )
         
@@ -140,4 +143,63 @@ def update_savings_goal(goal_id, name=None, category=None, target_amount=None, d
         return False
     
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+def get_goals_with_progress(user_id):
+    """
+    Get all savings goals for a user together with how far along each one is
+    
+    Saved amounts come from the category_totals rollup of Saving
+    transactions, matched to each goal's category case-insensitively, and
+    are joined to every goal in a single query.
+    
+    Args:
+        user_id (int): User ID
+        
+    Returns:
+        list: Savings goal dictionaries with these keys added:
+            saved_amount / saved_cents: Total saved in the goal's category
+            remaining_amount / remaining_cents: Left to save, never negative
+            progress: Fraction of the target saved, from 0.0 to 1.0
+            is_complete: True once the target is reached
+    """
+    conn = get_db_connection()
+    conn.row_factory = dict_factory
+    cursor = conn.cursor()
+    
+    try:
+        goals = cursor.execute(
+            """
+            SELECT g.id, g.user_id, g.name, g.category,
+                g.target_amount_cents / 100.0 AS target_amount, g.target_amount_cents,
+                g.deadline, g.description, g.created_at,
+                COALESCE(s.saved_cents, 0) AS saved_cents,
+                COALESCE(s.saved_cents, 0) / 100.0 AS saved_amount,
+                MAX(g.target_amount_cents - COALESCE(s.saved_cents, 0), 0) AS remaining_cents,
+                MAX(g.target_amount_cents - COALESCE(s.saved_cents, 0), 0) / 100.0 AS remaining_amount,
+                CASE WHEN g.target_amount_cents > 0
+                    THEN MIN(MAX(COALESCE(s.saved_cents, 0), 0) * 1.0 / g.target_amount_cents, 1.0)
+                    ELSE 1.0 END AS progress,
+                COALESCE(s.saved_cents, 0) >= g.target_amount_cents AS is_complete
+            FROM savings_goals g
+            LEFT JOIN (
+                SELECT lower(category) AS category_key, SUM(total_cents) AS saved_cents
+                FROM category_totals WHERE user_id = ? AND type = 'Saving'
+                GROUP BY category_key
+            ) s ON s.category_key = lower(g.category)
+            WHERE g.user_id = ?
+            ORDER BY g.created_at DESC, g.id DESC
+            """,
+            (user_id, user_id)
+        ).fetchall()
+        
+        for goal in goals:
+            goal['is_complete'] = bool(goal['is_complete'])
+        return goals
+    
+    except Exception as e:
+        print(f"Error getting savings goal progress: {e}")
+        return []
+    
+    finally:
+        conn.close()
@@ -1,5 +1,14 @@
 from .database import get_transactions_db_connection as get_db_connection
-from datetime import datetime
+from datetime import datetime, date, timedelta
+import calendar
+from src.config import Config
+from src.utils.formatters import to_cents
+
+# numpy is imported inside the columnar and bulk functions that use it, so
+# the plain row loaders and writers do not pay for it on import
+
+# Canonical spelling of each transaction type, keyed by lower case
+TRANSACTION_TYPES = {"saving": "Saving", "expense": "Expense", "income": "Income"}
 
 def save_transaction(category, amount, trans_type, description=None, user_id=None):
     """
@@ -24,20 +33,25 @@ def save_transaction(category, amount, trans_type, description=None, user_id=Non
             print("[ERROR] user_id is required to save a transaction")
             return None
             
-        # Validate amount is positive
-        if amount <= 0:
+        # Validate amount is positive (and at least one cent)
+        amount_cents = to_cents(amount)
+        if amount_cents <= 0:
             print("[ERROR] Amount must be greater than zero")
             return None
         
-        # Validate transaction type
-        if trans_type.lower() not in ("saving", "expense", "income"):
+        # Validate transaction type and store its canonical spelling, as the
+        # bulk path does, so rollups never split a type by letter case
+        if trans_type.lower() not in TRANSACTION_TYPES:
             print("[ERROR] Invalid transaction type")
             return None
+        trans_type = TRANSACTION_TYPES[trans_type.lower()]
 
             
+        created_at = datetime.now()
         cursor.execute(
-            "INSERT INTO transactions (user_id, category, amount, type, description, created_at) VALUES (?, ?, ?, ?, ?, ?)",
-            (user_id, category, amount, trans_type, description, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            "INSERT INTO transactions (user_id, category, amount_cents, type, description, created_at, created_ts) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (user_id, category, amount_cents, trans_type, description,
+             created_at.strftime("%Y-%m-%d %H:%M:%S"), to_epoch(created_at))
         )
         
         transaction_id = cursor.lastrowid
@@ -52,6 +66,112 @@ def save_transaction(category, amount, trans_type, description=None, user_id=Non
     finally:
         conn.close()
 
+def to_epoch(value):
+    """
+    Convert a created_at datetime (or date) to the created_ts column value
+    
+    created_ts is the wall-clock time stored in created_at expressed as
+    seconds since the epoch, the same number SQLite's strftime('%s', created_at)
+    gives. Comparing it with other to_epoch() values is always consistent.
+    """
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return calendar.timegm(value.timetuple())
+
+def _parse_timestamp(value):
+    """Return a datetime for a datetime, ISO string or None (now)"""
+    if value is None:
+        return datetime.now()
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+def _parse_date(value):
+    """Return a date for a date, datetime or ISO date/time string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)).date()
+
+def save_transactions_bulk(rows, user_id=None, chunk_size=None):
+    """
+    Save many transactions at once, e.g. when importing bank history
+    
+    All rows are validated up front and then inserted with executemany in a
+    single database transaction, so the import costs one commit instead of
+    one per row. If any row is invalid nothing is saved.
+    
+    Args:
+        rows (iterable): Dictionaries with 'category', 'amount' and 'type' keys,
+            plus optional 'description' and 'created_at' (datetime or ISO string)
+        user_id (int): ID of the user the transactions belong to - REQUIRED
+        chunk_size (int, optional): Rows passed to each executemany call,
+            defaults to Config.BULK_INSERT_CHUNK_SIZE
+    
+    Returns:
+        list: IDs of the inserted transactions in input order, or None if failed
+    """
+    import numpy as np
+    
+    if user_id is None:
+        print("[ERROR] user_id is required to save transactions")
+        return None
+
+    rows = list(rows)
+    if not rows:
+        return []
+    chunk_size = chunk_size or Config.BULK_INSERT_CHUNK_SIZE
+
+    # Validate every row in one vectorized pass
+    try:
+        cents = np.array([to_cents(row["amount"]) for row in rows], dtype=np.int64)
+        types = np.array([str(row["type"]).lower() for row in rows])
+        categories = [row["category"] for row in rows]
+    except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+        print(f"[ERROR] Malformed transaction row: {e}")
+        return None
+
+    invalid = ~(cents > 0) | ~np.isin(types, list(TRANSACTION_TYPES))
+    invalid |= np.array([not category for category in categories])
+    if invalid.any():
+        bad_rows = np.flatnonzero(invalid)[:10].tolist()
+        print(f"[ERROR] {int(invalid.sum())} invalid transaction rows, e.g. rows {bad_rows}")
+        return None
+
+    try:
+        timestamps = [_parse_timestamp(row.get("created_at")) for row in rows]
+        params = [
+            (user_id, category, int(amount_cents), TRANSACTION_TYPES[trans_type],
+             row.get("description"), created_at.strftime("%Y-%m-%d %H:%M:%S"), to_epoch(created_at))
+            for row, category, amount_cents, trans_type, created_at in zip(rows, categories, cents, types, timestamps)
+        ]
+    except ValueError as e:
+        print(f"[ERROR] Invalid transaction date: {e}")
+        return None
+
+    conn = get_db_connection()
+    
+    try:
+        # Take the write lock up front so the ids assigned below are consecutive
+        conn.execute("BEGIN IMMEDIATE")
+        for start in range(0, len(params), chunk_size):
+            conn.executemany(
+                "INSERT INTO transactions (user_id, category, amount_cents, type, description, created_at, created_ts) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                params[start:start + chunk_size]
+            )
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        conn.commit()
+        return list(range(last_id - len(params) + 1, last_id + 1))
+    
+    except Exception as e:
+        print(f"Error saving transactions: {e}")
+        conn.rollback()
+        return None
+    
+    finally:
+        conn.close()
+
 def load_all_transactions(user_id=None):
     """
     Load all transactions from the database, optionally filtered by user_id
@@ -69,7 +189,7 @@ def load_all_transactions(user_id=None):
     try:
         if user_id is not None:
             rows = cursor.execute(
-                "SELECT id, category, amount, type, description, created_at FROM transactions WHERE user_id = ? ORDER BY created_at DESC",
+                "SELECT id, category, amount_cents / 100.0 AS amount, amount_cents, type, description, created_at FROM transactions WHERE user_id = ? ORDER BY created_at DESC",
                 (user_id,)
             ).fetchall()
             return rows
@@ -84,6 +204,252 @@ def load_all_transactions(user_id=None):
     finally:
         conn.close()
 
+def iter_transactions(user_id=None, category=None, trans_type=None, batch_size=None):
+    """
+    Stream a user's transactions, newest first, without loading them all
+    
+    Rows are fetched from the database in batches with fetchmany, so memory
+    stays flat and the first row is available right away no matter how
+    large the ledger is. The connection is held until the generator is
+    exhausted or closed.
+    
+    Args:
+        user_id (int, optional): ID of the user whose transactions to stream
+        category (str, optional): Only stream this category
+        trans_type (str, optional): Only stream this type (e.g., 'Saving', 'Expense')
+        batch_size (int, optional): Rows per fetchmany call, defaults to
+            Config.FETCH_BATCH_SIZE
+    
+    Yields:
+        dict: One transaction dictionary at a time
+    """
+    if user_id is None:
+        return
+
+    query = "SELECT id, category, amount_cents / 100.0 AS amount, amount_cents, type, description, created_at FROM transactions WHERE user_id = ?"
+    params = [user_id]
+    if category is not None:
+        query += " AND category = ?"
+        params.append(category)
+    if trans_type is not None:
+        query += " AND type = ?"
+        params.append(TRANSACTION_TYPES.get(trans_type.lower(), trans_type))
+    query += " ORDER BY created_at DESC"
+
+    batch_size = batch_size or Config.FETCH_BATCH_SIZE
+    conn = get_db_connection()
+    
+    try:
+        cursor = conn.cursor()
+        cursor.row_factory = dict_factory
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    
+    except Exception as e:
+        print(f"Error streaming transactions: {e}")
+    
+    finally:
+        conn.close()
+
+class TransactionColumns:
+    """
+    Column-oriented copy of a user's transactions for vectorized analytics
+    
+    Every attribute below is aligned by position, oldest transaction first.
+    Category and type are stored as integer codes into the categories and
+    types lists. Totals per category come from the rollup tables (see
+    get_spending_summary); these columns feed the forecaster and the
+    anomaly backfill, which need every row.
+    
+    Attributes:
+        ids (ndarray): Transaction IDs, int64
+        amount_cents (ndarray): Amounts in cents, int64
+        created_ts (ndarray): created_ts epoch seconds, int64
+        category_codes (ndarray): Index into categories for each row, int32
+        categories (list): Category names, in first-seen order
+        type_codes (ndarray): Index into types for each row, int32
+        types (list): Transaction type names, in first-seen order
+    """
+    def __init__(self, ids, amount_cents, created_ts, category_codes, categories, type_codes, types):
+        self.ids = ids
+        self.amount_cents = amount_cents
+        self.created_ts = created_ts
+        self.category_codes = category_codes
+        self.categories = categories
+        self.type_codes = type_codes
+        self.types = types
+
+    def __len__(self):
+        return len(self.ids)
+
+def load_transaction_columns(user_id=None, trans_type=None, batch_size=None, start_date=None):
+    """
+    Load a user's transactions as NumPy columns
+    
+    Rows come off the cursor as plain tuples in fetchmany batches and are
+    converted to arrays one batch at a time, so no per-row dictionaries are
+    built. With trans_type the rows are read from the covering
+    (user_id, type, created_ts, category, amount_cents) index.
+    
+    Args:
+        user_id (int, optional): ID of the user whose transactions to load
+        trans_type (str, optional): Only load this type (e.g., 'Saving', 'Expense')
+        batch_size (int, optional): Rows per fetchmany call, defaults to
+            Config.FETCH_BATCH_SIZE
+        start_date (str|date, optional): Only load transactions created on
+            or after this day
+    
+    Returns:
+        TransactionColumns: The loaded columns, empty if there is no user
+            or the query fails
+    """
+    import numpy as np
+    
+    batch_size = batch_size or Config.FETCH_BATCH_SIZE
+    ids, cents, stamps, category_codes, type_codes = [], [], [], [], []
+    category_lookup, type_lookup = {}, {}
+    
+    if user_id is not None:
+        query = "SELECT id, amount_cents, created_ts, category, type FROM transactions WHERE user_id = ?"
+        params = [user_id]
+        if trans_type is not None:
+            query += " AND type = ?"
+            params.append(TRANSACTION_TYPES.get(trans_type.lower(), trans_type))
+        if start_date is not None:
+            query += " AND created_ts >= ?"
+            params.append(to_epoch(_parse_date(start_date)))
+        query += " ORDER BY created_ts, id"
+        
+        conn = get_db_connection()
+        
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                batch_ids, batch_cents, batch_stamps, batch_categories, batch_types = zip(*rows)
+                ids.append(np.array(batch_ids, dtype=np.int64))
+                cents.append(np.array(batch_cents, dtype=np.int64))
+                stamps.append(np.array(batch_stamps, dtype=np.int64))
+                category_codes.append(np.array(
+                    [category_lookup.setdefault(name, len(category_lookup)) for name in batch_categories],
+                    dtype=np.int32))
+                type_codes.append(np.array(
+                    [type_lookup.setdefault(name, len(type_lookup)) for name in batch_types],
+                    dtype=np.int32))
+        
+        except Exception as e:
+            print(f"Error loading transaction columns: {e}")
+            ids, cents, stamps, category_codes, type_codes = [], [], [], [], []
+            category_lookup, type_lookup = {}, {}
+        
+        finally:
+            conn.close()
+    
+    return TransactionColumns(
+        _concat(ids, np.int64), _concat(cents, np.int64), _concat(stamps, np.int64),
+        _concat(category_codes, np.int32), list(category_lookup),
+        _concat(type_codes, np.int32), list(type_lookup),
+    )
+
+def _concat(chunks, dtype):
+    """Join per-batch arrays, or return an empty array if there were none"""
+    import numpy as np
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)
+
+def page_transactions(user_id=None, after=None, limit=50, offset=0, oldest_first=False):
+    """
+    Load one page of a user's transactions, newest first
+    
+    Uses keyset pagination: each page starts right after the (created_at, id)
+    key of the last row of the previous page, so it is an index range search
+    that costs the same however deep into the ledger it is. oldest_first
+    walks the same order backwards, so pages near the end are as cheap as
+    pages near the start.
+    
+    Args:
+        user_id (int, optional): ID of the user whose transactions to load
+        after (tuple, optional): (created_at, id) of the last row already shown;
+            None for the first page
+        limit (int): Maximum number of rows to return
+        offset (int): Rows to skip after `after`. Unlike the key seek this
+            walks the index row by row, so callers keep it small by seeking
+            from the nearest known key, from either end.
+        oldest_first (bool): Read from the oldest row towards the newest;
+            `after` is then the key of the row just newer than the page
+    
+    Returns:
+        list: Up to `limit` transaction dictionaries. Pass
+              (rows[-1]['created_at'], rows[-1]['id']) as `after` for the next page.
+    """
+    if user_id is None:
+        return []
+
+    order, seek = ("ASC", ">") if oldest_first else ("DESC", "<")
+    conn = get_db_connection()
+    conn.row_factory = dict_factory
+    cursor = conn.cursor()
+    
+    try:
+        if after is None:
+            rows = cursor.execute(
+                f"SELECT id, category, amount_cents / 100.0 AS amount, amount_cents, type, description, created_at FROM transactions WHERE user_id = ? ORDER BY created_at {order}, id {order} LIMIT ? OFFSET ?",
+                (user_id, limit, offset)
+            ).fetchall()
+        else:
+            created_at, transaction_id = after
+            rows = cursor.execute(
+                f"SELECT id, category, amount_cents / 100.0 AS amount, amount_cents, type, description, created_at FROM transactions WHERE user_id = ? AND (created_at, id) {seek} (?, ?) ORDER BY created_at {order}, id {order} LIMIT ? OFFSET ?",
+                (user_id, created_at, transaction_id, limit, offset)
+            ).fetchall()
+        return rows
+    
+    except Exception as e:
+        print(f"Error loading transaction page: {e}")
+        return []
+    
+    finally:
+        conn.close()
+
+def count_transactions(user_id=None):
+    """
+    Count a user's transactions
+    
+    Adds up the per-category counts of the category_totals rollup, so the
+    cost depends on the number of categories rather than transactions.
+    
+    Args:
+        user_id (int, optional): ID of the user whose transactions to count
+    
+    Returns:
+        int: Number of transactions
+    """
+    if user_id is None:
+        return 0
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        return cursor.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM category_totals WHERE user_id = ?",
+            (user_id,)
+        ).fetchone()[0]
+    
+    except Exception as e:
+        print(f"Error counting transactions: {e}")
+        return 0
+    
+    finally:
+        conn.close()
+
 def load_transactions_by_category(category, user_id=None):
     """
     Load transactions filtered by category
@@ -102,7 +468,7 @@ def load_transactions_by_category(category, user_id=None):
     try:
         if user_id is not None:
             rows = cursor.execute(
-                "SELECT id, category, amount, type, description, created_at FROM transactions WHERE category = ? AND user_id = ? ORDER BY created_at DESC",
+                "SELECT id, category, amount_cents / 100.0 AS amount, amount_cents, type, description, created_at FROM transactions WHERE category = ? AND user_id = ? ORDER BY created_at DESC",
                 (category, user_id)
             ).fetchall()
             return rows
@@ -135,7 +501,7 @@ def load_transactions_by_type(trans_type, user_id=None):
     try:
         if user_id is not None:
             rows = cursor.execute(
-                "SELECT id, category, amount, type, description, created_at FROM transactions WHERE type = ? AND user_id = ? ORDER BY created_at DESC",
+                "SELECT id, category, amount_cents / 100.0 AS amount, amount_cents, type, description, created_at FROM transactions WHERE type = ? AND user_id = ? ORDER BY created_at DESC",
                 (trans_type, user_id)
             ).fetchall()
             return rows
@@ -154,6 +520,9 @@ def load_transactions_by_date_range(start_date, end_date, user_id=None):
     """
     Load transactions within a date range
     
+    Both dates are inclusive. The filter is a range on the indexed created_ts
+    column, so only the rows inside the range are read.
+    
     Args:
         start_date (str): Start date in YYYY-MM-DD format
         end_date (str): End date in YYYY-MM-DD format
@@ -168,9 +537,11 @@ def load_transactions_by_date_range(start_date, end_date, user_id=None):
     
     try:
         if user_id is not None:
+            start_ts = to_epoch(_parse_date(start_date))
+            end_ts = to_epoch(_parse_date(end_date) + timedelta(days=1))
             rows = cursor.execute(
-                "SELECT id, category, amount, type, description, created_at FROM transactions WHERE date(created_at) BETWEEN date(?) AND date(?) AND user_id = ? ORDER BY created_at DESC",
-                (start_date, end_date, user_id)
+                "SELECT id, category, amount_cents / 100.0 AS amount, amount_cents, type, description, created_at FROM transactions WHERE user_id = ? AND created_ts >= ? AND created_ts < ? ORDER BY created_ts DESC, id DESC",
+                (user_id, start_ts, end_ts)
             ).fetchall()
             return rows
         else:
@@ -184,6 +555,33 @@ def load_transactions_by_date_range(start_date, end_date, user_id=None):
     finally:
         conn.close()
 
+def get_transaction(transaction_id):
+    """
+    Get a single transaction by ID
+    
+    Args:
+        transaction_id (int): ID of the transaction
+    
+    Returns:
+        dict: Transaction dictionary including user_id, or None if not found
+    """
+    conn = get_db_connection()
+    conn.row_factory = dict_factory
+    cursor = conn.cursor()
+    
+    try:
+        return cursor.execute(
+            "SELECT id, user_id, category, amount_cents / 100.0 AS amount, amount_cents, type, description, created_at FROM transactions WHERE id = ?",
+            (transaction_id,)
+        ).fetchone()
+    
+    except Exception as e:
+        print(f"Error getting transaction: {e}")
+        return None
+    
+    finally:
+        conn.close()
+
 def delete_transaction(transaction_id):
     """
     Delete a transaction from the database
@@ -236,13 +634,22 @@ def update_transaction(transaction_id, category=None, amount=None, trans_type=No
         
         # Update only the fields that were provided
         new_category = category if category is not None else current['category']
-        new_amount = amount if amount is not None else current['amount']
+        new_amount_cents = to_cents(amount) if amount is not None else current['amount_cents']
         new_type = trans_type if trans_type is not None else current['type']
+        
+        # Same checks as save_transaction: the rollup triggers fold whatever is stored
+        if new_amount_cents <= 0:
+            print("[ERROR] Amount must be greater than zero")
+            return False
+        if new_type.lower() not in TRANSACTION_TYPES:
+            print("[ERROR] Invalid transaction type")
+            return False
+        new_type = TRANSACTION_TYPES[new_type.lower()]
         new_description = description if description is not None else current['description']
         
         cursor.execute(
-            "UPDATE transactions SET category = ?, amount = ?, type = ?, description = ? WHERE id = ?",
-            (new_category, new_amount, new_type, new_description, transaction_id)
+            "UPDATE transactions SET category = ?, amount_cents = ?, type = ?, description = ? WHERE id = ?",
+            (new_category, new_amount_cents, new_type, new_description, transaction_id)
         )
         
         conn.commit()
@@ -260,6 +667,9 @@ def get_spending_summary(user_id=None):
     """
     Get a summary of spending by category
     
+    Reads the trigger-maintained category_totals rollup, so the cost grows
+    with the number of categories rather than the number of transactions.
+    
     Args:
         user_id (int, optional): ID of the user whose transactions to summarize
     
@@ -272,10 +682,11 @@ def get_spending_summary(user_id=None):
     try:
         if user_id is not None:
             rows = cursor.execute(
-                "SELECT category, SUM(amount) as total FROM transactions WHERE type = 'Expense' AND user_id = ? GROUP BY category",
+                "SELECT category, total_cents FROM category_totals WHERE user_id = ? AND type = 'Expense' ORDER BY category",
                 (user_id,)
             ).fetchall()
-            return {row['category']: row['total'] for row in rows}
+            # Integer totals are exact; convert to dollars only at the end
+            return {row['category']: row['total_cents'] / 100 for row in rows}
         else:
             # Return empty dict when no user_id is provided
             return {}
@@ -291,6 +702,9 @@ def get_savings_summary(user_id=None):
     """
     Get a summary of savings by category
     
+    Reads the trigger-maintained category_totals rollup, so the cost grows
+    with the number of categories rather than the number of transactions.
+    
     Args:
         user_id (int, optional): ID of the user whose transactions to summarize
     
@@ -303,10 +717,11 @@ def get_savings_summary(user_id=None):
     try:
         if user_id is not None:
             rows = cursor.execute(
-                "SELECT category, SUM(amount) as total FROM transactions WHERE type = 'Saving' AND user_id = ? GROUP BY category",
+                "SELECT category, total_cents FROM category_totals WHERE user_id = ? AND type = 'Saving' ORDER BY category",
                 (user_id,)
             ).fetchall()
-            return {row['category']: row['total'] for row in rows}
+            # Integer totals are exact; convert to dollars only at the end
+            return {row['category']: row['total_cents'] / 100 for row in rows}
         else:
             # Return empty dict when no user_id is provided
             return {}
@@ -318,6 +733,310 @@ def get_savings_summary(user_id=None):
     finally:
         conn.close()
 
+def get_dashboard_snapshot(user_id=None):
+    """
+    Get everything the transaction and report screens summarize, in one query
+    
+    Conditional aggregation over the category_totals rollup returns expense,
+    saving and income totals and counts per category in a single round-trip.
+    
+    Args:
+        user_id (int, optional): ID of the user whose transactions to summarize
+    
+    Returns:
+        dict: {
+            "expenses": {category: amount}, "savings": {category: amount},
+            "income": {category: amount},
+            "total_expenses", "total_savings", "total_income": float amounts,
+            "expense_count", "saving_count", "income_count": transaction counts
+        }
+    """
+    snapshot = {
+        "expenses": {}, "savings": {}, "income": {},
+        "total_expenses": 0.0, "total_savings": 0.0, "total_income": 0.0,
+        "expense_count": 0, "saving_count": 0, "income_count": 0,
+    }
+    if user_id is None:
+        return snapshot
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        rows = cursor.execute(
+            """
+            SELECT category,
+                SUM(CASE WHEN type = 'Expense' THEN total_cents ELSE 0 END) AS expense_cents,
+                SUM(CASE WHEN type = 'Expense' THEN count ELSE 0 END) AS expense_count,
+                SUM(CASE WHEN type = 'Saving' THEN total_cents ELSE 0 END) AS saving_cents,
+                SUM(CASE WHEN type = 'Saving' THEN count ELSE 0 END) AS saving_count,
+                SUM(CASE WHEN type = 'Income' THEN total_cents ELSE 0 END) AS income_cents,
+                SUM(CASE WHEN type = 'Income' THEN count ELSE 0 END) AS income_count
+            FROM category_totals WHERE user_id = ?
+            GROUP BY category ORDER BY category
+            """,
+            (user_id,)
+        ).fetchall()
+        
+        totals = {"expense": 0, "saving": 0, "income": 0}
+        for row in rows:
+            for kind, key in (("expense", "expenses"), ("saving", "savings"), ("income", "income")):
+                if row[f"{kind}_count"]:
+                    snapshot[key][row["category"]] = row[f"{kind}_cents"] / 100
+                    totals[kind] += row[f"{kind}_cents"]
+                    snapshot[f"{kind}_count"] += row[f"{kind}_count"]
+        
+        # Integer totals are exact; convert to dollars only at the end
+        snapshot["total_expenses"] = totals["expense"] / 100
+        snapshot["total_savings"] = totals["saving"] / 100
+        snapshot["total_income"] = totals["income"] / 100
+        return snapshot
+    
+    except Exception as e:
+        print(f"Error getting dashboard snapshot: {e}")
+        return snapshot
+    
+    finally:
+        conn.close()
+
+# SQL expression for the first day of each bucket, the NumPy unit its dense
+# axis is built in, and how many buckets a report covers by default
+BUCKET_PERIODS = {
+    "day": ("date(created_ts, 'unixepoch')", "D", 30),
+    # ISO weeks start on Monday
+    "week": ("date(created_ts, 'unixepoch', '-6 days', 'weekday 1')", "W", 12),
+    "month": ("strftime('%Y-%m-01', created_ts, 'unixepoch')", "M", 12),
+    "year": ("strftime('%Y-01-01', created_ts, 'unixepoch')", "Y", 5),
+}
+
+def _bucket_starts(start, end, period):
+    """Return the first day of every bucket from start to end, inclusive."""
+    import numpy as np
+    unit = BUCKET_PERIODS[period][1]
+    start = np.datetime64(start, "D")
+    end = np.datetime64(end, "D")
+    if unit == "W":
+        # Align to Monday; 1970-01-01 was a Thursday
+        weekday = (start.astype(np.int64) + 3) % 7
+        return np.arange(start - weekday, end + 1, 7, dtype="datetime64[D]")
+    return np.arange(start.astype(f"datetime64[{unit}]"),
+                     end.astype(f"datetime64[{unit}]") + 1).astype("datetime64[D]")
+
+def load_time_buckets(user_id=None, period="month", trans_type="Expense", start_date=None, end_date=None,
+                      num_buckets=None):
+    """
+    Aggregate transaction amounts per time bucket and category
+    
+    The GROUP BY runs in SQL over a created_ts range of a covering index, so
+    the cost depends on the range asked for, not on the size of the history.
+    Buckets without transactions are filled with zeros.
+    
+    Args:
+        user_id (int, optional): ID of the user whose transactions to aggregate
+        period (str): 'day', 'week' (ISO, starting Monday), 'month' or 'year'
+        trans_type (str): Transaction type to aggregate
+        start_date (str, optional): First day to include, defaults to the
+            start of the bucket num_buckets - 1 periods before end_date
+        end_date (str, optional): Last day to include, defaults to today
+        num_buckets (int, optional): Buckets to cover when start_date is not
+            given, defaults to 30 days, 12 weeks, 12 months or 5 years
+    
+    Returns:
+        dict: {
+            "buckets": datetime64[D] array with the first day of each bucket,
+            "categories": list of category names, sorted,
+            "totals": float array of amounts, shape (len(categories), len(buckets)),
+            "counts": int array of transaction counts, same shape
+        }
+        or None if the period or dates are invalid
+    """
+    import numpy as np
+    
+    if period not in BUCKET_PERIODS:
+        print(f"Error loading time buckets: unknown period {period!r}")
+        return None
+    
+    bucket_sql, unit, default_count = BUCKET_PERIODS[period]
+    num_buckets = num_buckets or default_count
+    try:
+        end = _parse_date(end_date) if end_date is not None else date.today()
+        if start_date is not None:
+            start = _parse_date(start_date)
+        else:
+            # Back up num_buckets - 1 whole buckets from the one holding end
+            last = _bucket_starts(end, end, period)[0]
+            if unit == "W":
+                first = last - np.timedelta64(7 * (num_buckets - 1), "D")
+            else:
+                first = (last.astype(f"datetime64[{unit}]") - (num_buckets - 1)).astype("datetime64[D]")
+            start = first.astype(date)
+    except ValueError as e:
+        print(f"Error loading time buckets: {e}")
+        return None
+    
+    buckets = _bucket_starts(start, end, period)
+    result = {
+        "buckets": buckets,
+        "categories": [],
+        "totals": np.zeros((0, len(buckets))),
+        "counts": np.zeros((0, len(buckets)), dtype=np.int64),
+    }
+    if user_id is None or len(buckets) == 0:
+        return result
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        rows = cursor.execute(
+            f"SELECT {bucket_sql} AS bucket, category, SUM(amount_cents) AS total_cents, COUNT(*) AS count "
+            "FROM transactions WHERE user_id = ? AND type = ? AND created_ts >= ? AND created_ts < ? "
+            "GROUP BY bucket, category",
+            (user_id, TRANSACTION_TYPES.get(trans_type.lower(), trans_type),
+             to_epoch(start), to_epoch(end + timedelta(days=1)))
+        ).fetchall()
+        if not rows:
+            return result
+        
+        bucket_days = np.array([row["bucket"] for row in rows], dtype="datetime64[D]")
+        categories, category_idx = np.unique([row["category"] for row in rows], return_inverse=True)
+        bucket_idx = np.searchsorted(buckets, bucket_days)
+        
+        cents = np.zeros((len(categories), len(buckets)), dtype=np.int64)
+        counts = np.zeros((len(categories), len(buckets)), dtype=np.int64)
+        np.add.at(cents, (category_idx, bucket_idx), [row["total_cents"] for row in rows])
+        np.add.at(counts, (category_idx, bucket_idx), [row["count"] for row in rows])
+        
+        result["categories"] = categories.tolist()
+        # Integer totals are exact; convert to dollars only at the end
+        result["totals"] = cents / 100
+        result["counts"] = counts
+        return result
+    
+    except Exception as e:
+        print(f"Error loading time buckets: {e}")
+        return result
+    
+    finally:
+        conn.close()
+
+# How each transaction type moves the running balance
+BALANCE_SIGNS = {"Income": 1, "Expense": -1, "Saving": -1}
+
+def load_running_balance(user_id=None, period="day", start_date=None, end_date=None):
+    """
+    Get the user's running balance, one point per time bucket
+    
+    Amounts are netted per bucket in SQL (income minus expenses and savings)
+    and accumulated with a SUM() OVER window in the same query, so only one
+    row per bucket ever leaves SQLite. Buckets without transactions carry
+    the previous balance forward.
+    
+    Args:
+        user_id (int, optional): ID of the user whose balance to compute
+        period (str): 'day', 'week', 'month' or 'year'
+        start_date (str, optional): First day to include, defaults to the
+            user's first transaction
+        end_date (str, optional): Last day to include, defaults to today
+    
+    Returns:
+        dict: {
+            "buckets": datetime64[D] array with the first day of each bucket,
+            "net": float array of the net change within each bucket,
+            "balance": float array of the balance at the end of each bucket
+        }
+        or None if the period or dates are invalid
+    """
+    import numpy as np
+    
+    if period not in BUCKET_PERIODS:
+        print(f"Error loading running balance: unknown period {period!r}")
+        return None
+    
+    try:
+        end = _parse_date(end_date) if end_date is not None else date.today()
+        start = _parse_date(start_date) if start_date is not None else None
+    except ValueError as e:
+        print(f"Error loading running balance: {e}")
+        return None
+    
+    result = {
+        "buckets": np.zeros(0, dtype="datetime64[D]"),
+        "net": np.zeros(0),
+        "balance": np.zeros(0),
+    }
+    if user_id is None:
+        return result
+    
+    bucket_sql = BUCKET_PERIODS[period][0]
+    net_sql = " ".join(f"WHEN '{trans_type}' THEN {sign} * amount_cents" for trans_type, sign in BALANCE_SIGNS.items())
+    end_ts = to_epoch(end + timedelta(days=1))
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        if start is None:
+            first_day = cursor.execute(
+                "SELECT date(MIN(created_ts), 'unixepoch') AS first_day FROM transactions WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()["first_day"]
+            if first_day is None:
+                return result
+            start = _parse_date(first_day)
+        
+        buckets = _bucket_starts(start, end, period)
+        if len(buckets) == 0:
+            return result
+        
+        rows = cursor.execute(
+            f"""
+            SELECT bucket, net_cents, balance_cents FROM (
+                SELECT bucket, net_cents, SUM(net_cents) OVER (ORDER BY bucket) AS balance_cents
+                FROM (
+                    SELECT {bucket_sql} AS bucket, SUM(CASE type {net_sql} ELSE 0 END) AS net_cents
+                    FROM transactions WHERE user_id = ? AND created_ts < ?
+                    GROUP BY bucket
+                )
+            )
+            WHERE bucket >= ?
+            ORDER BY bucket
+            """,
+            (user_id, end_ts, str(buckets[0]))
+        ).fetchall()
+        
+        net = np.zeros(len(buckets), dtype=np.int64)
+        if rows:
+            positions = np.searchsorted(buckets, np.array([row["bucket"] for row in rows], dtype="datetime64[D]"))
+            net[positions] = [row["net_cents"] for row in rows]
+            # Each bucket takes the balance of the latest row at or before it;
+            # buckets before the first row start from the balance prior to it
+            balances = np.array([row["balance_cents"] for row in rows], dtype=np.int64)
+            latest = np.full(len(buckets), -1)
+            latest[positions] = np.arange(len(rows))
+            latest = np.maximum.accumulate(latest)
+            opening = balances[0] - rows[0]["net_cents"]
+            balance = np.where(latest >= 0, balances[latest], opening)
+        else:
+            opening = cursor.execute(
+                f"SELECT COALESCE(SUM(CASE type {net_sql} ELSE 0 END), 0) AS opening_cents "
+                "FROM transactions WHERE user_id = ? AND created_ts < ?",
+                (user_id, to_epoch(buckets[0].astype(date)))
+            ).fetchone()["opening_cents"]
+            balance = np.full(len(buckets), opening, dtype=np.int64)
+        
+        result["buckets"] = buckets
+        # Integer totals are exact; convert to dollars only at the end
+        result["net"] = net / 100
+        result["balance"] = balance / 100
+        return result
+    
+    except Exception as e:
+        print(f"Error loading running balance: {e}")
+        return result
+    
+    finally:
+        conn.close()
+
 def dict_factory(cursor, row):
     """
     Convert a row to a dictionary
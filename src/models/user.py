@@ -79,17 +79,15 @@ class User:
     @classmethod
     def find_by_username(cls, username):
         """Find a user by username"""
-        conn = get_db_connection()
-        user = conn.execute('SELECT * FROM users WHERE username = ?', (username,)).fetchone()
-        conn.close()
+        with get_db_connection() as conn:
+            user = conn.execute('SELECT * FROM users WHERE username = ?', (username,)).fetchone()
         return cls._row_to_user(user) if user else None
     
     @classmethod
     def find_by_email(cls, email):
         """Find a user by email."""
-        conn = get_db_connection()
-        user = conn.execute('SELECT * FROM users WHERE email = ?', (email,)).fetchone()
-        conn.close()
+        with get_db_connection() as conn:
+            user = conn.execute('SELECT * FROM users WHERE email = ?', (email,)).fetchone()
         return cls._row_to_user(user) if user else None
     
     @classmethod
@@ -7,9 +7,13 @@ for database operations.
 """
 
 import os
+import sys
 import tkinter as tk
 from tkinter import ttk
-from models.database import init_db
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.models.database import initialize_all_databases
 
 def setup_application():
     """
@@ -33,7 +37,7 @@ def setup_application():
     root.geometry("800x600")
     
     # Initialize the database
-    init_db()  # Removed app parameter as Tkinter doesn't need it
+    initialize_all_databases()
     print("Database setup complete.")
     
     return root
@@ -0,0 +1,223 @@
+import tkinter as tk
+from datetime import datetime
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+class PieChart:
+    """
+    Pie chart of amounts per category, updated in place.
+
+    The wedges, labels and percentages are reused while the categories stay
+    the same; only their angles and texts change. New categories rebuild
+    the pie on the same axes.
+    """
+    START_ANGLE = 90
+    LABEL_DISTANCE = 1.1
+    PCT_DISTANCE = 0.6
+
+    def __init__(self, title, figsize=(6, 4)):
+        self.title = title
+        # A plain Figure, not pyplot: nothing global keeps a reference to it
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        self.labels = None
+        self.wedges = self.texts = self.autotexts = ()
+
+    def update(self, amounts):
+        """
+        Show {category: amount}.
+
+        Returns:
+            bool: False if there is nothing to draw
+        """
+        labels = list(amounts)
+        sizes = np.array(list(amounts.values()), dtype=float)
+        if not labels or sizes.sum() <= 0:
+            return False
+
+        if labels != self.labels:
+            self.ax.clear()
+            colors = colormaps["Pastel1"](np.linspace(0, 1, len(labels)))
+            self.wedges, self.texts, self.autotexts = self.ax.pie(
+                sizes, labels=labels, autopct='%1.1f%%', startangle=self.START_ANGLE, colors=colors,
+                labeldistance=self.LABEL_DISTANCE, pctdistance=self.PCT_DISTANCE
+            )
+            self.ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+            self.ax.set_title(self.title)
+            self.labels = labels
+            return True
+
+        # Same categories: move the existing wedges and their texts
+        fractions = sizes / sizes.sum()
+        theta1 = self.START_ANGLE
+        for wedge, text, autotext, fraction in zip(self.wedges, self.texts, self.autotexts, fractions):
+            theta2 = theta1 + 360 * fraction
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+            middle = np.deg2rad((theta1 + theta2) / 2)
+            x, y = np.cos(middle), np.sin(middle)
+            text.set_position((self.LABEL_DISTANCE * x, self.LABEL_DISTANCE * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_position((self.PCT_DISTANCE * x, self.PCT_DISTANCE * y))
+            autotext.set_text(f"{100 * fraction:.1f}%")
+            theta1 = theta2
+        return True
+
+class StackedBarChart:
+    """
+    Stacked bars of per-category totals per time bucket, updated in place.
+
+    While the categories and number of buckets stay the same, the existing
+    bars only get new heights and bottoms and the ticks new labels.
+    """
+    def __init__(self, title, xlabel, figsize=(6, 4)):
+        self.title = title
+        self.xlabel = xlabel
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        self.categories = None
+        self.shape = None
+        self.containers = []
+
+    def update(self, data, labels):
+        """
+        Show time buckets as returned by load_time_buckets.
+
+        Args:
+            data (dict): Buckets, categories and totals, or None
+            labels (list): X axis label for each bucket
+
+        Returns:
+            bool: False if there is nothing to draw
+        """
+        if data is None or not data["categories"]:
+            return False
+
+        positions = np.arange(len(labels))
+        if data["categories"] != self.categories or np.shape(data["totals"]) != self.shape:
+            self._rebuild(data, positions)
+        else:
+            bottom = np.zeros(len(labels))
+            for container, values in zip(self.containers, data["totals"]):
+                for rect, value, base in zip(container, values, bottom):
+                    rect.set_y(base)
+                    rect.set_height(value)
+                bottom += values
+            self.ax.relim()
+            self.ax.autoscale_view()
+
+        self.ax.set_xticks(positions, labels, rotation=45, ha='right')
+        return True
+
+    def _rebuild(self, data, positions):
+        self.ax.clear()
+        # Each row of totals is one category across all buckets
+        bottom = np.zeros(len(positions))
+        colors = colormaps["Pastel2"](np.linspace(0, 1, len(data["categories"])))
+        self.containers = []
+        for category, values, color in zip(data["categories"], data["totals"], colors):
+            self.containers.append(self.ax.bar(positions, values, bottom=bottom, label=category, color=color))
+            bottom += values
+
+        self.ax.set_title(self.title)
+        self.ax.set_ylabel('Amount ($)')
+        self.ax.set_xlabel(self.xlabel)
+        self.ax.legend(title='Categories')
+        self.figure.tight_layout()
+        self.categories = list(data["categories"])
+        self.shape = np.shape(data["totals"])
+
+class BalanceChart:
+    """Running balance line with a shaded area, updated in place."""
+    COLOR = "#76c7c0"
+
+    def __init__(self, figsize=(6, 4)):
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        self.line = None
+        self.fill = None
+
+    def update(self, series):
+        """
+        Show a series as returned by load_running_balance.
+
+        Returns:
+            bool: False if there is nothing to draw
+        """
+        if series is None or len(series["buckets"]) == 0:
+            return False
+
+        days = series["buckets"].astype("datetime64[D]").astype(datetime)
+        if self.line is None:
+            self.line, = self.ax.plot(days, series["balance"], color=self.COLOR)
+            self.ax.axhline(0, color="#999999", linewidth=0.8)
+            self.ax.set_title('Running Balance')
+            self.ax.set_ylabel('Balance ($)')
+            self.ax.set_xlabel('Date')
+            self.figure.autofmt_xdate()
+            self.figure.tight_layout()
+        else:
+            self.line.set_data(days, series["balance"])
+            self.ax.relim()
+            self.ax.autoscale_view()
+
+        # The shaded area is one artist; replace it rather than reshape it
+        if self.fill is not None:
+            self.fill.remove()
+        self.fill = self.ax.fill_between(days, series["balance"], alpha=0.3, color=self.COLOR)
+        return True
+
+class ChartManager:
+    """
+    Embeds each chart in Tk once and redraws it in place on every refresh.
+
+    Every chart gets one FigureCanvasTkAgg and one placeholder label, created
+    when it is added. update() hands the new data to the chart, which
+    changes its existing artists, then shows either the chart (with a
+    draw_idle) or the placeholder when there is no data. Refreshing
+    creates no figures or widgets, so memory stays flat however often
+    the reports are refreshed.
+    """
+    def __init__(self, bg="#f1e7e7"):
+        self.bg = bg
+        self.charts = {}
+        self.canvases = {}
+        self.frames = {}
+        self.messages = {}
+
+    def add(self, name, chart, parent, empty_text):
+        """
+        Embed a chart in parent, initially showing its placeholder.
+
+        Args:
+            name (str): Key used with update
+            chart: PieChart, StackedBarChart or BalanceChart
+            parent: Tk widget to embed into
+            empty_text (str): Shown instead of the chart when there is no data
+        """
+        frame = tk.Frame(parent, bg=self.bg)
+        canvas = FigureCanvasTkAgg(chart.figure, master=frame)
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        message = tk.Label(parent, text=empty_text, font=("Comic Sans MS", 12), bg=self.bg)
+        message.pack(pady=100)
+
+        self.charts[name] = chart
+        self.canvases[name] = canvas
+        self.frames[name] = frame
+        self.messages[name] = message
+        return chart
+
+    def update(self, name, *args):
+        """Pass new data to a chart's update() and redraw it, or show its placeholder."""
+        frame, message = self.frames[name], self.messages[name]
+        if self.charts[name].update(*args):
+            # winfo_manager, not winfo_ismapped: tabs not on screen are unmapped
+            if not frame.winfo_manager():
+                message.pack_forget()
+                frame.pack(padx=20, pady=10, fill="both", expand=True)
+            self.canvases[name].draw_idle()
+        elif not message.winfo_manager():
+            frame.pack_forget()
+            message.pack(pady=100)
@@ -87,7 +87,7 @@ class LoginFrame(tk.Frame):
         button_frame.grid(row=2, column=0, columnspan=2, pady=10)
         
         # Login button
-        login_button = tk.Button(
+        self.login_button = tk.Button(
             button_frame,
             text="Login",
             font=("Comic Sans MS", 12),
@@ -95,7 +95,7 @@ class LoginFrame(tk.Frame):
             command=self.login,
             width=10
         )
-        login_button.pack(pady=5)
+        self.login_button.pack(pady=5)
         
         # Back button
         back_button = tk.Button(
@@ -151,9 +151,10 @@ class LoginFrame(tk.Frame):
         """
         Handle the login authentication process.
         
-        Validates input fields, authenticates credentials through the auth controller,
-        and navigates to the profile page on successful login. Shows an error message
-        when validation fails.
+        Validates input fields, then checks the credentials on a background
+        thread so password hashing does not freeze the window. The login
+        button shows a loading state until the result arrives, see finish_login.
+        Shows an error message when validation fails.
         
         Returns:
             None: Early returns if validation fails
@@ -166,7 +167,23 @@ class LoginFrame(tk.Frame):
             return
 
         # Pass credentials to the auth controller
-        success = self.controller.auth_controller.handle_login(username, password)
+        self.login_button.config(state="disabled", text="Logging in...")
+        self.controller.dispatcher.watch(
+            self.controller.auth_controller.login_async(username, password),
+            on_success=self.finish_login,
+            on_error=self.login_failed,
+            key="login"
+        )
+
+    def finish_login(self, result):
+        """
+        Complete a login attempt once the credentials have been checked.
+        
+        Args:
+            result (tuple): (success, message) from the auth manager
+        """
+        self.login_button.config(state="normal", text="Login")
+        success = self.controller.auth_controller.finish_login(*result)
 
         if success:
             # Update profile information
@@ -180,4 +197,9 @@ class LoginFrame(tk.Frame):
             
             # Clear entries for security
             self.username_entry.delete(0, tk.END)
-            self.password_entry.delete(0, tk.END)
\ No newline at end of file
+            self.password_entry.delete(0, tk.END)
+
+    def login_failed(self, error):
+        """Restore the login button and report an unexpected error during login."""
+        self.login_button.config(state="normal", text="Login")
+        messagebox.showerror("Login Error", f"Login failed: {error}")
@@ -1,10 +1,7 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
-import numpy as np
-from datetime import datetime, timedelta
-from src.models.transaction import load_all_transactions
+from tkinter import ttk, messagebox, filedialog
+from datetime import datetime
+from src.ui.charts import ChartManager, PieChart, StackedBarChart, BalanceChart
 
 class ReportFrame(tk.Frame):
     """
@@ -21,6 +18,9 @@ class ReportFrame(tk.Frame):
         savings_tab: Tab for displaying savings goals progress
         weekly_tab: Tab for displaying weekly spending
         monthly_tab: Tab for displaying monthly spending comparisons
+        balance_tab: Tab for displaying the running balance over time
+        report: Data shown by all tabs, from TransactionController.get_report_data
+        charts: ChartManager holding the chart of every tab, created once and redrawn in place
     """
     def __init__(self, parent, controller):
         """
@@ -61,16 +61,21 @@ class ReportFrame(tk.Frame):
         self.savings_tab = tk.Frame(self.notebook, bg="#f1e7e7")
         self.weekly_tab = tk.Frame(self.notebook, bg="#f1e7e7")
         self.monthly_tab = tk.Frame(self.notebook, bg="#f1e7e7")
+        self.balance_tab = tk.Frame(self.notebook, bg="#f1e7e7")
         
         # Add tabs to notebook
         self.notebook.add(self.savings_tab, text="Savings Goals")
         self.notebook.add(self.weekly_tab, text="Weekly Spending")
         self.notebook.add(self.monthly_tab, text="Monthly Comparison")
+        self.notebook.add(self.balance_tab, text="Cash Flow")
         
-        # Set up the content for each tab
+        # Charts are created once here and filled in once the report data has loaded
+        self.report = None
+        self.charts = ChartManager(bg="#f1e7e7")
         self.setup_savings_tab()
         self.setup_weekly_tab()
         self.setup_monthly_tab()
+        self.setup_balance_tab()
         
         # Back button to return to profile
         self.back_button = tk.Button(
@@ -92,11 +97,24 @@ class ReportFrame(tk.Frame):
         )
         self.refresh_button.place(x=550, y=550)
         
+        # Export every transaction to a CSV file
+        self.export_button = tk.Button(
+            self,
+            text="Export CSV",
+            font=("Comic Sans MS", 12),
+            bg="#d4e4fc",
+            command=self.export_csv
+        )
+        self.export_button.place(x=700, y=550)
+        
         # Handle resize events
         self.bind("<Configure>", self.on_resize)
         
         # Bind custom event for refreshing data when frame is shown
         self.bind("<<FrameShown>>", lambda e: self.refresh_data())
+        
+        # Fill in the content for each tab
+        self.refresh_data()
     
     def on_resize(self, event):
         """
@@ -130,6 +148,18 @@ class ReportFrame(tk.Frame):
             
             # Update refresh button position
             self.refresh_button.place(x=(width//2) + 50, y=height - 70)
+            
+            # Update export button position
+            self.export_button.place(x=(width//2) + 200, y=height - 70)
+    
+    def add_tab_title(self, tab, text):
+        """Add the heading shown at the top of a tab."""
+        tk.Label(
+            tab,
+            text=text,
+            font=("Comic Sans MS", 16, "bold"),
+            bg="#f1e7e7"
+        ).pack(pady=10)
     
     def setup_savings_tab(self):
         """
@@ -138,228 +168,125 @@ class ReportFrame(tk.Frame):
         Creates a pie chart showing the distribution of savings across different categories.
         Displays a message if no savings data is available.
         """
-        # Title for the tab
-        tk.Label(
-            self.savings_tab,
-            text="Your Savings Goals Progress",
-            font=("Comic Sans MS", 16, "bold"),
-            bg="#f1e7e7"
-        ).pack(pady=10)
-        
-        # Get user_id from controller
-        user_id = None
-        if hasattr(self.controller, 'auth_controller') and self.controller.auth_controller.is_authenticated():
-            user_id = self.controller.auth_controller.get_current_user().id
-        
-        # Get savings goals data
-        transactions = load_all_transactions(user_id)
-        saving_transactions = [tx for tx in transactions if tx['type'].lower() == 'saving']
-        
-        if not saving_transactions:
-            tk.Label(
-                self.savings_tab,
-                text="No savings goals data available yet.\nAdd savings in the Savings Goals section.",
-                font=("Comic Sans MS", 12),
-                bg="#f1e7e7"
-            ).pack(pady=100)
-            return
-        
-        # Create a figure for the pie chart
-        fig, ax = plt.subplots(figsize=(6, 4))
-
-        # Group by category and description
-        categories = {}
-        for tx in saving_transactions:
-            category = tx['category']
-            description = tx.get('description', '')
-            amount = tx['amount']
-            
-            # Create a combined key for category and description
-            label = category
-            if description:
-                label = f"{category} - {description}"
-            
-            if label in categories:
-                categories[label] += amount
-            else:
-                categories[label] = amount
-        
-        # Create pie chart
-        labels = list(categories.keys())
-        sizes = list(categories.values())
-        colors = plt.cm.Pastel1(np.linspace(0, 1, len(labels)))
-        
-        ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90, colors=colors)
-        ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-        ax.set_title('Savings Distribution by Category')
-        
-        # Embed the chart in the tab
-        chart_frame = tk.Frame(self.savings_tab, bg="#f1e7e7")
-        chart_frame.pack(padx=20, pady=10, fill="both", expand=True)
-        
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.add_tab_title(self.savings_tab, "Your Savings Goals Progress")
+        self.charts.add(
+            "savings", PieChart('Savings Distribution by Category'), self.savings_tab,
+            "No savings goals data available yet.\nAdd savings in the Savings Goals section."
+        )
     
     def setup_weekly_tab(self):
         """
-        Configure the Weekly Spending tab with a bar chart.
+        Configure the Weekly Spending tab with a stacked bar chart.
         
-        Creates a bar chart showing expenses by category for the week.
+        Creates a stacked bar chart showing expenses by category for each of
+        the last 8 ISO weeks.
         Displays a message if no expense data is available.
         """
-        # Title for the tab
-        tk.Label(
-            self.weekly_tab,
-            text="Weekly Spending by Category",
-            font=("Comic Sans MS", 16, "bold"),
-            bg="#f1e7e7"
-        ).pack(pady=10)
-        
-        # Get user_id from controller
-        user_id = None
-        if hasattr(self.controller, 'auth_controller') and self.controller.auth_controller.is_authenticated():
-            user_id = self.controller.auth_controller.get_current_user().id
-        
-        # Get transaction data
-        transactions = load_all_transactions(user_id)
-        expense_transactions = [tx for tx in transactions if tx['type'].lower() == 'expense']
-        
-        if not expense_transactions:
-            tk.Label(
-                self.weekly_tab,
-                text="No expense data available yet.\nAdd expenses in the Transactions section.",
-                font=("Comic Sans MS", 12),
-                bg="#f1e7e7"
-            ).pack(pady=100)
-            return
-        
-        # Create a figure for the bar chart
-        fig, ax = plt.subplots(figsize=(6, 4))
-        
-        # Group by category
-        categories = {}
-        for tx in expense_transactions:
-            category = tx['category']
-            amount = tx['amount']
-            if category in categories:
-                categories[category] += amount
-            else:
-                categories[category] = amount
-        
-        # Create bar chart
-        categories_list = list(categories.keys())
-        amounts = list(categories.values())
-        colors = plt.cm.Pastel2(np.linspace(0, 1, len(categories_list)))
-        
-        bars = ax.bar(categories_list, amounts, color=colors)
-        ax.set_title('Weekly Spending by Category')
-        ax.set_ylabel('Amount ($)')
-        ax.set_xlabel('Category')
-        plt.xticks(rotation=45, ha='right')
-        
-        # Add data labels on top of bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 5,
-                    f'${height:.2f}',
-                    ha='center', va='bottom', rotation=0)
-        
-        plt.tight_layout()
-        
-        # Embed the chart in the tab
-        chart_frame = tk.Frame(self.weekly_tab, bg="#f1e7e7")
-        chart_frame.pack(padx=20, pady=10, fill="both", expand=True)
-        
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.add_tab_title(self.weekly_tab, "Weekly Spending by Category")
+        self.charts.add(
+            "weekly", StackedBarChart('Weekly Spending by Category', 'Week of'), self.weekly_tab,
+            "No expense data available for this period.\nAdd expenses in the Transactions section."
+        )
     
     def setup_monthly_tab(self):
         """
         Configure the Monthly Comparison tab with a stacked bar chart.
         
-        Creates a stacked bar chart showing monthly spending by category.
-        For demonstration purposes, this uses simulated data.
+        Creates a stacked bar chart showing spending by category for each of
+        the last 6 months.
         Displays a message if no expense data is available.
         """
-        # Title for the tab
-        tk.Label(
-            self.monthly_tab,
-            text="Monthly Spending Comparison",
-            font=("Comic Sans MS", 16, "bold"),
-            bg="#f1e7e7"
-        ).pack(pady=10)
-        
-        # Get user_id from controller
-        user_id = None
-        if hasattr(self.controller, 'auth_controller') and self.controller.auth_controller.is_authenticated():
-            user_id = self.controller.auth_controller.get_current_user().id
-        
-        # Get transaction data
-        transactions = load_all_transactions(user_id)
-        expense_transactions = [tx for tx in transactions if tx['type'].lower() == 'expense']
-        
-        if not expense_transactions:
-            tk.Label(
-                self.monthly_tab,
-                text="No expense data available yet.\nAdd expenses in the Transactions section.",
-                font=("Comic Sans MS", 12),
-                bg="#f1e7e7"
-            ).pack(pady=100)
-            return
-        
-        # Create a figure for the stacked bar chart
-        fig, ax = plt.subplots(figsize=(6, 4))
-        
-        # For demo purposes, simulate monthly data if transaction dates aren't available
-        # In a real application, we would use actual transaction dates
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
-        categories = set(tx['category'] for tx in expense_transactions)
-        
-        # Generate random data for demonstration
-        data = {}
-        for category in categories:
-            data[category] = np.random.rand(len(months)) * 100  # Random values for demo
-        
-        # Create a stacked bar chart
-        bottom = np.zeros(len(months))
-        
-        for category, values in data.items():
-            p = ax.bar(months, values, bottom=bottom, label=category)
-            bottom += values
+        self.add_tab_title(self.monthly_tab, "Monthly Spending Comparison")
+        self.charts.add(
+            "monthly", StackedBarChart('Monthly Spending by Category', 'Month'), self.monthly_tab,
+            "No expense data available for this period.\nAdd expenses in the Transactions section."
+        )
+    
+    def setup_balance_tab(self):
+        """
+        Configure the Cash Flow tab with a running balance line chart.
         
-        ax.set_title('Monthly Spending by Category')
-        ax.set_ylabel('Amount ($)')
-        ax.set_xlabel('Month')
-        ax.legend(title='Categories')
+        Plots income minus expenses and savings accumulated over the whole
+        history, one point per day.
+        Displays a message if no transaction data is available.
+        """
+        self.add_tab_title(self.balance_tab, "Balance Over Time")
+        self.charts.add(
+            "balance", BalanceChart(), self.balance_tab,
+            "No transaction data available yet.\nAdd transactions in the Transactions section."
+        )
+    
+    def refresh_data(self):
+        """
+        Refresh all report data.
         
-        plt.tight_layout()
+        Loads the current user's report data off the Tk thread, while the
+        refresh button shows a loading state, then redraws all tabs with it.
+        A newer refresh makes a pending one stale.
+        """
+        self.refresh_button.config(state="disabled", text="Loading...")
+        self.controller.dispatcher.watch(
+            self.controller.transaction_controller.get_report_data_async(),
+            on_success=self.show_report,
+            on_error=self.report_failed,
+            key="report"
+        )
+    
+    def show_report(self, report):
+        """
+        Redraw all tabs from freshly loaded report data.
         
-        # Embed the chart in the tab
-        chart_frame = tk.Frame(self.monthly_tab, bg="#f1e7e7")
-        chart_frame.pack(padx=20, pady=10, fill="both", expand=True)
+        The charts were created once in the setup_*_tab methods; only their
+        data changes here.
         
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        Args:
+            report (dict): Result of TransactionController.get_report_data
+        """
+        self.refresh_button.config(state="normal", text="Refresh Data")
+        self.report = report
+        
+        weekly, monthly = report["weekly"], report["monthly"]
+        self.charts.update("savings", report["snapshot"]["savings"])
+        self.charts.update("weekly", weekly, [] if weekly is None else
+                           [week.astype(datetime).strftime("%b %d") for week in weekly["buckets"]])
+        self.charts.update("monthly", monthly, [] if monthly is None else
+                           [month.astype(datetime).strftime("%b") for month in monthly["buckets"]])
+        self.charts.update("balance", report["balance"])
     
-    def refresh_data(self):
+    def report_failed(self, error):
+        """Leave the loading state when the report data could not be loaded."""
+        self.refresh_button.config(state="normal", text="Refresh Data")
+        messagebox.showerror("Report Error", f"Could not load report data: {error}")
+    
+    def export_csv(self):
         """
-        Refresh all report data.
+        Export the current user's transactions to a CSV file.
         
-        Clears and reloads all tabs with fresh data from the database
-        based on the current user's ID.
+        Asks for a file name, then streams the transactions into it off the
+        Tk thread and reports how many were written.
         """
-        # Clear all tabs
-        for widget in self.savings_tab.winfo_children():
-            widget.destroy()
-        for widget in self.weekly_tab.winfo_children():
-            widget.destroy()
-        for widget in self.monthly_tab.winfo_children():
-            widget.destroy()
-            
-        # Reload all tabs
-        self.setup_savings_tab()
-        self.setup_weekly_tab()
-        self.setup_monthly_tab()
\ No newline at end of file
+        path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            initialfile="transactions.csv"
+        )
+        if not path:
+            return
+        
+        self.export_button.config(state="disabled", text="Exporting...")
+        self.controller.dispatcher.watch(
+            self.controller.transaction_controller.export_csv_async(path),
+            on_success=self.export_finished,
+            on_error=self.export_failed,
+            key="export"
+        )
+    
+    def export_finished(self, count):
+        """Report a finished export."""
+        self.export_button.config(state="normal", text="Export CSV")
+        messagebox.showinfo("Export Complete", f"Exported {count} transactions.")
+    
+    def export_failed(self, error):
+        """Leave the exporting state when the export could not be written."""
+        self.export_button.config(state="normal", text="Export CSV")
+        messagebox.showerror("Export Error", f"Could not export transactions: {error}")
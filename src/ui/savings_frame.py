@@ -2,8 +2,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
-from src.models.transaction import load_all_transactions
-from datetime import datetime
+from src.models.transaction import load_transaction_columns
+from src.core.forecast import SavingsForecaster
+from datetime import date, datetime, timedelta
 
 class SavingsFrame(tk.Frame):
     """
@@ -16,6 +17,7 @@ class SavingsFrame(tk.Frame):
     
     Attributes:
         controller: The main application controller
+        goals: The user's stored goals with their progress, keyed by lowercase category
         saved_amount: The current amount saved towards the goal
         chart_canvas: The matplotlib canvas for displaying charts
         text_label: Label for displaying summary information about the savings goal
@@ -35,6 +37,7 @@ class SavingsFrame(tk.Frame):
         """
         super().__init__(parent)
         self.controller = controller
+        self.goals = {}
         self.saved_amount = 0
         self.chart_canvas = None
         self.text_label = None
@@ -103,6 +106,7 @@ class SavingsFrame(tk.Frame):
         )
         self.goal_dropdown.set("Vacation")
         self.goal_dropdown.pack(side="left", padx=5)
+        self.goal_dropdown.bind("<<ComboboxSelected>>", lambda e: self.fill_goal_form())
         
         # Target Amount
         amount_frame = tk.Frame(self.form_frame, bg="#ffdddd")
@@ -226,6 +230,9 @@ class SavingsFrame(tk.Frame):
         
         # Bind resize event
         self.bind("<Configure>", self.on_resize)
+        
+        # Reload the stored goals whenever the frame is shown
+        self.bind("<<FrameShown>>", lambda e: self.load_goals())
     
     def on_resize(self, event):
         """
@@ -281,6 +288,64 @@ class SavingsFrame(tk.Frame):
             # Update navigation buttons
             self.canvas.coords(self.nav_button_window, width/2, center_y + form_height/2 + 80)
     
+    def load_goals(self):
+        """Load the user's stored goals and their progress off the Tk thread."""
+        self.controller.dispatcher.watch(
+            self.controller.transaction_controller.get_goals_with_progress_async(),
+            on_success=self.show_goals,
+            key="savings_goals"
+        )
+    
+    def show_goals(self, goals):
+        """
+        Offer the stored goals in the category dropdown.
+        
+        Args:
+            goals (list): Goals with progress, from get_goals_with_progress
+        """
+        self.goals = {goal["category"].lower(): goal for goal in goals}
+        values = list(self.goal_dropdown.cget("values"))
+        known = {value.lower() for value in values}
+        values += [goal["category"] for goal in goals if goal["category"].lower() not in known]
+        self.goal_dropdown.config(values=values)
+        self.fill_goal_form()
+    
+    def fill_goal_form(self):
+        """Fill in the target and deadline of the stored goal for the selected category, if any."""
+        goal = self.goals.get(self.goal_dropdown.get().lower())
+        if goal is None:
+            return
+        self.goal_amount_entry.delete(0, tk.END)
+        self.goal_amount_entry.insert(0, f"{goal['target_amount']:.2f}")
+        self.deadline_entry.delete(0, tk.END)
+        self.deadline_entry.insert(0, goal["deadline"] or "")
+    
+    def save_goal(self, category, goal_amount, deadline=None):
+        """
+        Store the goal from the form and return it with its progress.
+        
+        Runs on a background thread.
+        
+        Returns:
+            dict: The goal, see TransactionController.get_goals_with_progress
+        """
+        goal = self.controller.transaction_controller.set_savings_goal(category, goal_amount, deadline)
+        if goal is None:
+            raise RuntimeError("the goal could not be saved")
+        return goal
+    
+    def show_loading(self):
+        """Clear the chart area and show that chart data is loading."""
+        self.clear_chart()
+        for widget in self.chart_frame.winfo_children():
+            widget.destroy()
+        self.suggestion_label.config(text="Loading...")
+    
+    def chart_failed(self, error):
+        """Replace the loading state with an error message."""
+        self.suggestion_label.config(text="")
+        messagebox.showerror("Chart Error", f"Could not load savings data: {error}")
+    
     def show_pie_chart(self):
         """
         Display a pie chart showing savings progress.
@@ -289,11 +354,9 @@ class SavingsFrame(tk.Frame):
         amount for the selected savings goal category. The chart includes
         percentage labels and a text summary of the savings progress.
         
-        Validates user input before creating the chart.
+        Validates user input, then stores the goal and loads its progress off
+        the Tk thread and draws the chart once it arrives, see draw_pie_chart.
         """
-        self.clear_chart()
-        self.suggestion_label.config(text="")  # Clear any existing suggestion
-        
         category = self.goal_dropdown.get()
         try:
             goal_amount = float(self.goal_amount_entry.get())
@@ -303,18 +366,28 @@ class SavingsFrame(tk.Frame):
             messagebox.showerror("Invalid Input", "Please enter a valid positive number for the goal amount.")
             return
 
-        # Get user_id from controller
-        user_id = None
-        if hasattr(self.controller, 'auth_controller') and self.controller.auth_controller.is_authenticated():
-            user_id = self.controller.auth_controller.get_current_user().id
-
-        # Load transactions and calculate saved amount
-        transactions = load_all_transactions(user_id)
-        saved_total = sum(tx["amount"] for tx in transactions 
-                          if tx["type"].lower() == "saving" 
-                          and tx["category"].lower() == category.lower())
+        # Store the goal, then chart how much of it is saved
+        self.show_loading()
+        self.controller.dispatcher.run(
+            self.save_goal, category, goal_amount,
+            on_success=self.draw_pie_chart,
+            on_error=self.chart_failed,
+            key="savings_chart"
+        )
+    
+    def draw_pie_chart(self, goal):
+        """
+        Draw the savings progress pie chart.
         
-        remaining = max(0, goal_amount - saved_total)
+        Args:
+            goal (dict): Savings goal with its progress, see save_goal
+        """
+        self.suggestion_label.config(text="")  # Clear the loading message
+        self.goals[goal["category"].lower()] = goal
+        category = goal["category"]
+        goal_amount = goal["target_amount"]
+        saved_total = max(goal["saved_amount"], 0)
+        remaining = goal["remaining_amount"]
 
         # Create pie chart
         fig, ax = plt.subplots(figsize=(4, 3.5))
@@ -356,13 +429,14 @@ class SavingsFrame(tk.Frame):
         Display a bar chart comparing weekly savings target to actual savings.
         
         Creates and displays a bar chart that shows the weekly savings rate
-        needed to reach the goal by the deadline, compared to the current
-        weekly savings rate. Includes a suggestion for achieving the goal.
+        needed to reach the goal by the deadline, compared to the average
+        weekly savings rate of recent weeks. Includes a suggestion for
+        achieving the goal and a forecast completion date.
         
-        Validates user input before creating the chart, including date format
-        and ensuring the deadline is in the future.
+        Validates user input, including date format and ensuring the deadline
+        is in the future, then runs the forecast off the Tk thread and draws
+        the chart once it arrives, see draw_bar_chart.
         """
-        self.clear_chart()
         category = self.goal_dropdown.get()
 
         # Validate inputs
@@ -389,21 +463,47 @@ class SavingsFrame(tk.Frame):
         days_remaining = (deadline_date - today).days
         weeks_remaining = max(1, days_remaining // 7)
 
-        # Get user_id from controller
-        user_id = None
-        if hasattr(self.controller, 'auth_controller') and self.controller.auth_controller.is_authenticated():
-            user_id = self.controller.auth_controller.get_current_user().id
+        self.show_loading()
+        self.controller.dispatcher.run(
+            self.forecast_goal, category, goal_amount, deadline,
+            on_success=lambda result: self.draw_bar_chart(goal_amount, deadline_date, weeks_remaining, *result),
+            on_error=self.chart_failed,
+            key="savings_chart"
+        )
 
-        # Get saved amount
-        transactions = load_all_transactions(user_id)
-        saved_total = sum(tx["amount"] for tx in transactions 
-                        if tx["type"].lower() == "saving" 
-                        and tx["category"].lower() == category.lower())
+    def forecast_goal(self, category, goal_amount, deadline):
+        """
+        Store a savings goal and forecast it from the recent saving history of its category.
+        
+        Runs on a background thread, so it only queries and computes.
+        
+        Returns:
+            tuple: (goal from save_goal, forecast dict from SavingsForecaster)
+        """
+        goal = self.save_goal(category, goal_amount, deadline)
+        forecaster = SavingsForecaster()
+        # Only the weeks the forecaster samples, not the whole saving history
+        start_date = date.today() - timedelta(weeks=forecaster.window_weeks)
+        history = load_transaction_columns(goal["user_id"], trans_type="Saving", start_date=start_date)
+        return goal, forecaster.forecast(history, [goal])[0]
+
+    def draw_bar_chart(self, goal_amount, deadline_date, weeks_remaining, goal, forecast):
+        """
+        Draw the weekly target vs actual bar chart and the savings suggestion.
+        
+        Args:
+            goal_amount (float): Goal amount
+            deadline_date (datetime): Goal deadline
+            weeks_remaining (int): Whole weeks until the deadline, at least 1
+            goal (dict): Savings goal with its progress, see save_goal
+            forecast (dict): Forecast of the goal, see forecast_goal
+        """
+        self.goals[goal["category"].lower()] = goal
+        remaining = goal["remaining_amount"]
 
         # Calculate weekly targets
         weekly_target = goal_amount / weeks_remaining
-        current_week = (today - today.replace(day=1)).days // 7 or 1
-        weekly_actual = saved_total / current_week
+        weekly_actual = forecast["weekly_rate"]
 
         # Clear chart area
         for widget in self.chart_frame.winfo_children():
@@ -427,13 +527,15 @@ class SavingsFrame(tk.Frame):
         self.chart_canvas.get_tk_widget().pack(fill="both", expand=True)
 
         # Update the suggestion text
-        remaining = max(0, goal_amount - saved_total)
         try:
             weekly_needed = remaining / weeks_remaining
         except ZeroDivisionError:
             weekly_needed = 0.0
 
         suggestion = f"You need to save ~${weekly_needed:.2f} per week to meet your goal by {deadline_date.strftime('%Y-%m-%d')}."
+        if forecast["eta_p50"]:
+            suggestion += (f"\nAt your recent pace you will likely get there around {forecast['eta_p50']}"
+                           f" ({forecast['deadline_probability']:.0%} chance by the deadline).")
         
         # Update the shared suggestion label below both frames
         self.suggestion_label.config(text=suggestion)
@@ -451,4 +553,4 @@ class SavingsFrame(tk.Frame):
         
         if self.text_label and self.text_label.winfo_exists():
             self.text_label.destroy()
-            self.text_label = None
\ No newline at end of file
+            self.text_label = None
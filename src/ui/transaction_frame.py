@@ -1,9 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from src.models.transaction import (
-    save_transaction, 
-    load_all_transactions
-)
+from src.core.summary import BudgetSummary
+from src.ui.virtual_table import VirtualTable
 
 class TransactionFrame(tk.Frame):
     """
@@ -26,6 +24,7 @@ class TransactionFrame(tk.Frame):
         saving_labels: Dictionary mapping saving categories to their label widgets
         total_income: Running total of all income
         income_types: List of available income categories
+        summary: BudgetSummary holding the per-category totals the summary labels show
     """
     def __init__(self, parent, controller, user=None):
         """
@@ -64,6 +63,10 @@ class TransactionFrame(tk.Frame):
         self.total_income = 0  
         self.income_types = ["Paycheck", "Investment", "Scholarships", "Bonuses", "Others"]
         self.saving_labels = {}  # Initialize the labels dictionary
+        self.table_user_id = None  # User the table last showed, to scroll back to the top on a switch
+        self.editing = None  # Transaction being edited in the input forms, if any
+        self.summary = BudgetSummary()
+        self.label_texts = {}  # Text last written to each summary label
 
         # Main background
         self.configure(bg="#f5efef")
@@ -107,9 +110,10 @@ class TransactionFrame(tk.Frame):
         """
         Load transaction data from the database and update the UI.
         
-        Retrieves all transactions for the current user from the database,
-        clears the existing display, and updates the UI with the loaded data.
-        Updates category summaries and totals for expenses, savings, and income.
+        Points the virtualized transaction table at the current user, which
+        reads only the rows around the view, and reloads the summaries.
+        Category summaries and totals for expenses, savings, and income come
+        from a single dashboard snapshot query, run in the background.
         """
         user_id = None
         # if hasattr(self, 'user') and self.user:
@@ -117,56 +121,66 @@ class TransactionFrame(tk.Frame):
         if hasattr(self.controller, 'auth_controller') and self.controller.auth_controller.is_authenticated():
             user_id = self.controller.auth_controller.get_current_user().id
         
-        # Clear existing transactions from the table
-        for item in self.transaction_table.get_children():
-            self.transaction_table.delete(item)
+        # Page the table through the user's transactions
+        if user_id != self.table_user_id:
+            self.table_user_id = user_id
+            self.transaction_list.first = 0
+        self.transaction_list.refresh()
         
-        # Reset summary values
-        self.total_expenses = 0
-        self.total_savings = 0
-        self.total_income = 0
-        for category in self.expense_categories:
-            self.expense_categories[category].config(text="$0.00")
-        for category in self.saving_labels:
-            self.saving_labels[category].config(text="$0.00")
+        # Totals come pre-aggregated from a single query
+        self.load_summary()
+
+    def load_summary(self):
+        """
+        Reload the summary totals off the Tk thread.
         
-        # Load transactions from database
-        transactions = load_all_transactions(user_id)
-        if not transactions:
-            return
+        Shows a busy cursor until the snapshot arrives. A newer load makes
+        a pending one stale, so only the latest totals are shown.
+        """
+        self.config(cursor="watch")
+        self.controller.dispatcher.watch(
+            self.controller.transaction_controller.get_dashboard_snapshot_async(),
+            on_success=self.show_summary,
+            on_error=self.summary_failed,
+            key="transaction_snapshot"
+        )
+
+    def show_summary(self, snapshot):
+        """Replace the summary totals with a freshly loaded dashboard snapshot."""
+        self.config(cursor="")
+        self.summary.load(snapshot)
+        self.refresh_summary_labels()
+
+    def summary_failed(self, error):
+        """Leave the loading state when the snapshot could not be loaded."""
+        self.config(cursor="")
+        print(f"Error loading transaction summary: {error}")
+
+    def refresh_summary_labels(self):
+        """
+        Redraw the summary labels from the in-memory summary.
         
-        # Process each transaction
-        for transaction in transactions:
-            category = transaction['category']
-            amount = transaction['amount']
-            trans_type = transaction['type']
-            
-            # Add to table
-            self.transaction_table.insert("", tk.END, values=(category, f"${amount:.2f}", trans_type))
-            
-            # Update the appropriate summary
-            if trans_type == "Expense":
-                if category in self.expense_categories:
-                    current_text = self.expense_categories[category].cget("text")
-                    current_amount = float(current_text.replace("$", "")) if current_text != "$0.00" else 0
-                    new_amount = current_amount + amount
-                    self.expense_categories[category].config(text=f"${new_amount:.2f}")
-                    self.total_expenses += amount
-            elif trans_type == "Saving":
-                if category in self.saving_labels:
-                    current_text = self.saving_labels[category].cget("text")
-                    current_amount = float(current_text.replace("$", "")) if current_text != "$0.00" else 0
-                    new_amount = current_amount + amount
-                    self.saving_labels[category].config(text=f"${new_amount:.2f}")
-                    self.total_savings += amount
-            elif trans_type == "Income":
-                self.total_income += amount
-        
-        # Update totals
-        self.total_value.config(text=f"${self.total_expenses:.2f}")
-        self.savings_total_value.config(text=f"${self.total_savings:.2f}")
-        self.income_value.config(text=f"${self.total_income:.2f}")
-        self.savings_income_value.config(text=f"${self.total_income:.2f}")
+        Runs once per refresh rather than once per transaction, and only
+        touches labels whose text changed.
+        """
+        self.total_expenses = self.summary.total("Expense")
+        self.total_savings = self.summary.total("Saving")
+        self.total_income = self.summary.total("Income")
+        
+        texts = [(self.total_value, self.total_expenses),
+                 (self.savings_total_value, self.total_savings),
+                 (self.income_value, self.total_income),
+                 (self.savings_income_value, self.total_income)]
+        texts += [(label, self.summary.category_total("Expense", category))
+                  for category, label in self.expense_categories.items()]
+        texts += [(label, self.summary.category_total("Saving", category))
+                  for category, label in self.saving_labels.items()]
+        
+        for label, amount in texts:
+            text = f"${amount:.2f}"
+            if self.label_texts.get(label) != text:
+                label.config(text=text)
+                self.label_texts[label] = text
 
     def create_income_header(self):
         """
@@ -572,9 +586,10 @@ class TransactionFrame(tk.Frame):
         """
         Create the transaction table section of the UI.
         
-        Sets up a treeview widget for displaying transactions with columns
-        for category, amount, and type. Includes a scrollbar and context
-        menu for editing and deleting transactions.
+        Sets up a virtualized treeview for displaying transactions with columns
+        for category, amount, and type. Only the rows around the view are
+        loaded, a page at a time as the table scrolls. Includes a scrollbar
+        and context menu for editing and deleting transactions.
         """
         # Transaction table
         self.table_frame = tk.Frame(self, bg="#f5efef")
@@ -588,19 +603,21 @@ class TransactionFrame(tk.Frame):
         style.configure("Treeview.Heading", font=("Comic Sans MS", 11, "bold"), background="#ffffff", foreground="#000000")
         style.configure("Treeview", font=("Comic Sans MS", 10), rowheight=25, background="#ffffff", fieldbackground="#ffffff", foreground="#000000")
         
-        # Create a container for the table and scrollbar
-        self.tree_container = tk.Frame(self.table_frame, bg="#ffffff")
-        self.tree_container.pack(fill="both", expand=True)
-        
-        self.transaction_table = ttk.Treeview(
-            self.tree_container,
+        # Container for the table and scrollbar, reading pages of the current user's transactions
+        self.transaction_list = VirtualTable(
+            self.table_frame,
             columns=columns,
-            show="headings",
-            height=6
+            fetch_page=self.controller.transaction_controller.get_transaction_page,
+            count=self.controller.transaction_controller.count_transactions,
+            key=lambda row: (row['created_at'], row['id']),
+            format_row=lambda row: (row['category'], f"${row['amount']:.2f}", row['type']),
+            height=6,
+            dispatcher=self.controller.dispatcher,
+            bg="#ffffff"
         )
-        
-        scrollbar = ttk.Scrollbar(self.tree_container, orient="vertical", command=self.transaction_table.yview)
-        self.transaction_table.configure(yscrollcommand=scrollbar.set)
+        self.transaction_list.pack(fill="both", expand=True)
+        self.transaction_table = self.transaction_list.tree
+        scrollbar = self.transaction_list.scrollbar
 
         style = ttk.Style()
         style.configure("Vertical.TScrollbar", background="white", arrowcolor="black", 
@@ -611,9 +628,6 @@ class TransactionFrame(tk.Frame):
             self.transaction_table.heading(col, text=col)
             self.transaction_table.column(col, anchor="center", width=140)
         
-        self.transaction_table.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
         # Tip label for right-click
         tip_label = tk.Label(
             self,
@@ -685,9 +699,8 @@ class TransactionFrame(tk.Frame):
         based on the value in the income entry field.
         """
         try:
-            self.total_income = float(self.income_entry.get())
-            self.income_value.config(text=f"${self.total_income:.2f}") #updates in expenses panel
-            self.savings_income_value.config(text=f"${self.total_income:.2f}") # update sins savings panel
+            self.summary.set_total("Income", float(self.income_entry.get()))
+            self.refresh_summary_labels() # updates both panels
             
             messagebox.showinfo("Success", f"Income updated to ${self.total_income:.2f}")
         except ValueError:
@@ -699,30 +712,31 @@ class TransactionFrame(tk.Frame):
         
         Creates a new income transaction based on the selected income type
         and amount entered. Updates the UI and saves the transaction to the database.
-        Validates the input before processing.
+        Validates the input before processing. While an income is being edited,
+        saves the changes to it instead.
         """
         try:
             amount = float(self.income_entry.get())
             income_type = self.income_type.get()
+            if amount <= 0:
+                messagebox.showerror("Invalid Amount", "Amount must be greater than zero.")
+                return
             
-            # Get the current user ID
-            user_id = None
-            if hasattr(self.controller, 'auth_controller') and self.controller.auth_controller.is_authenticated():
-                user_id = self.controller.auth_controller.get_current_user().id
+            if self.editing and self.editing['type'] == "Income":
+                self.save_edit(income_type, amount, "Income")
+                return
             
-            # Add to total income
-            self.total_income += amount
-            self.income_value.config(text=f"${self.total_income:.2f}")
-            self.savings_income_value.config(text=f"${self.total_income:.2f}")#added
+            # Save to database for the current user
+            success, message = self.controller.transaction_controller.add_transaction(income_type, amount, "Income")
+            if not success:
+                messagebox.showerror("Error", f"Failed to save income transaction. {message}")
+                return
             
-            # Add to transaction table
-            self.transaction_table.insert("", tk.END, values=(income_type, f"${amount:.2f}", "Income"))
+            # Add to total income
+            self.update_summary(income_type, amount, "Income")
             
-            # Save to database
-            transaction_id = save_transaction(income_type, amount, "Income", description=None, user_id=user_id)
-            if transaction_id is None:
-                messagebox.showerror("Error", "Failed to save income transaction. Please try again.")
-                return
+            # Show it in the transaction table
+            self.transaction_list.refresh()
                 
             # Clear income entry
             self.income_entry.delete(0, tk.END)
@@ -738,7 +752,8 @@ class TransactionFrame(tk.Frame):
         
         Creates a new transaction based on the form inputs and selected transaction type.
         Validates all inputs, updates the UI, and saves the transaction to the database.
-        Clears the form inputs after successful addition.
+        Clears the form inputs after successful addition. While an expense or
+        saving is being edited, saves the changes to it instead.
         """
         name = self.name_entry.get()
         category = self.category_dropdown.get()
@@ -748,12 +763,6 @@ class TransactionFrame(tk.Frame):
             messagebox.showerror("Missing Information", "Please fill in all fields.")
             return
 
-        try:
-            amount = float(amount_str)
-        except ValueError:
-            messagebox.showerror("Invalid Input", "Please enter a valid amount.")
-            return
-
         try:
             amount = float(amount_str)
             if amount <= 0:
@@ -765,16 +774,19 @@ class TransactionFrame(tk.Frame):
 
         trans_type = self.type_var.get()
 
-        # Get the current user ID
-        user_id = None
-        if hasattr(self.controller, 'auth_controller') and self.controller.auth_controller.is_authenticated():
-            user_id = self.controller.auth_controller.get_current_user().id
-
+        if self.editing and self.editing['type'] != "Income":
+            if self.save_edit(category, amount, trans_type, description=name):
+                self.name_entry.delete(0, tk.END)
+                self.amount_entry.delete(0, tk.END)
+                self.update_category_dropdown()
+            return
 
-        # Attempt to save to database
-        transaction_id = save_transaction(category, amount, trans_type, description=name, user_id=user_id)
-        if transaction_id is None:
-            messagebox.showerror("Invalid Transaction", "Transaction was not saved. Please check your input.")
+        # Attempt to save to database for the current user
+        success, message = self.controller.transaction_controller.add_transaction(
+            category, amount, trans_type, description=name
+        )
+        if not success:
+            messagebox.showerror("Invalid Transaction", f"Transaction was not saved. {message}")
             return
 
         # Store in memory (only if saved)
@@ -785,8 +797,8 @@ class TransactionFrame(tk.Frame):
             "type": trans_type
         })
 
-        # Insert into table
-        self.transaction_table.insert("", tk.END, values=(category, f"${amount:.2f}", trans_type))
+        # Show it in the transaction table
+        self.transaction_list.refresh()
 
         # Update summary
         self.update_summary(category, amount, trans_type)
@@ -802,33 +814,21 @@ class TransactionFrame(tk.Frame):
         """
         Update the summary section based on a new transaction.
         
-        Updates the appropriate category total and overall total based on
-        the transaction type (Expense or Saving) and category.
+        Adds the transaction to the in-memory summary and redraws the
+        summary labels from it. A negative amount takes a deleted or
+        edited transaction back out.
         
         Args:
             category: The transaction category
             amount: The transaction amount
-            trans_type: The transaction type (Expense or Saving, defaults to Expense)
+            trans_type: The transaction type (Expense, Saving or Income, defaults to Expense)
         """
-        # Update category amount
-        if trans_type == "Expense":
-            if category in self.expense_categories:
-                current_text = self.expense_categories[category].cget("text")
-                current_amount = float(current_text.replace("$", ""))
-                new_amount = current_amount + amount
-                self.expense_categories[category].config(text=f"${new_amount:.2f}")
-                # Update total
-                self.total_expenses += amount
-                self.total_value.config(text=f"${self.total_expenses:.2f}")
-        elif trans_type == "Saving":
-            if category in self.saving_labels:
-                current_text = self.saving_labels[category].cget("text")
-                current_amount = float(current_text.replace("$", ""))
-                new_amount = current_amount + amount
-                self.saving_labels[category].config(text=f"${new_amount:.2f}")
-                #update total
-                self.total_savings += amount
-                self.savings_total_value.config(text=f"${self.total_savings:.2f}")
+        self.summary.add(category, amount, trans_type)
+        self.refresh_summary_labels()
+        
+        # A snapshot still loading may predate this change, so load a fresh one
+        if self.controller.dispatcher.is_pending("transaction_snapshot"):
+            self.load_summary()
     
     def show_context_menu(self, event):
         """
@@ -846,71 +846,55 @@ class TransactionFrame(tk.Frame):
             self.transaction_table.selection_set(item_id)
             self.context_menu.post(event.x_root, event.y_root)
 
+    def get_selected_transaction(self, action):
+        """
+        Get the transaction behind the selected table row.
+        
+        Table rows use the transaction ID as their item ID.
+        
+        Args:
+            action: What the selection is for, used in the warning ("delete" or "edit")
+        
+        Returns:
+            dict: The transaction, or None after warning that nothing is selected
+        """
+        selected = self.transaction_table.selection()
+        row = self.transaction_list.get_row(selected[0]) if selected else None
+        if row is None:
+            messagebox.showwarning("No selection", f"Please select a transaction to {action}.")
+        return row
+
     def delete_selected(self):
         """
         Delete the selected transaction.
         
-        Removes the selected transaction from the UI and database after
-        confirmation. Updates the appropriate category and overall totals
-        based on the transaction type.
+        Removes the selected transaction from the database by its ID after
+        confirmation, then from the UI. Updates the appropriate category and
+        overall totals based on the transaction type.
         
         Displays an error message if no transaction is selected.
         """
-        selected = self.transaction_table.selection()
-        if not selected:
-            messagebox.showwarning("No selection", "Please select a transaction to delete.")
+        row = self.get_selected_transaction("delete")
+        if row is None:
             return
 
-        item = self.transaction_table.item(selected[0])
-        values = item['values']
-        category, amount_text, trans_type = values
-        amount = float(amount_text.strip("$"))
-
+        category, amount, trans_type = row['category'], row['amount'], row['type']
         confirm = messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete this {trans_type.lower()} of ${amount:.2f} in '{category}'?")
         if not confirm:
             return
 
-        # Delete from DB 
-        from src.models.database import get_transactions_db_connection as get_db_connection
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-        DELETE FROM transactions 
-        WHERE rowid = (
-            SELECT rowid FROM transactions 
-            WHERE category=? AND amount=? AND type=?
-            LIMIT 1
-        )
-        """, (category, amount, trans_type))
-        conn.commit()
-        conn.close()
+        # Delete from DB by primary key
+        if not self.controller.transaction_controller.delete_transaction(row['id']):
+            messagebox.showerror("Error", "Failed to delete transaction. Please try again.")
+            return
+        if self.editing and self.editing['id'] == row['id']:
+            self.finish_edit()
 
         # Update summary
-        if trans_type == "Expense" and category in self.expense_categories:
-            current_text = self.expense_categories[category].cget("text")
-            current_amount = float(current_text.replace("$", ""))
-            new_amount = current_amount - amount
-            self.expense_categories[category].config(text=f"${new_amount:.2f}")
-            
-            # Update total
-            self.total_expenses -= amount
-            self.total_value.config(text=f"${self.total_expenses:.2f}")
-        elif trans_type == "Income":
-            # Update total income in BOTH panels
-            self.total_income -= amount
-            self.income_value.config(text=f"${self.total_income:.2f}")
-            self.savings_income_value.config(text=f"${self.total_income:.2f}")
-
-        elif trans_type == "Saving" and category in self.saving_labels:
-            current_text = self.saving_labels[category].cget("text")
-            current_amount = float(current_text.replace("$", ""))
-            new_amount = current_amount - amount
-            self.saving_labels[category].config(text=f"${new_amount:.2f}")
-            self.total_savings -= amount
-            self.savings_total_value.config(text=f"${self.total_savings:.2f}")
-
-        # Delete from table
-        self.transaction_table.delete(selected[0])
+        self.update_summary(category, -amount, trans_type)
+
+        # Reload the rows in view
+        self.transaction_list.refresh()
         messagebox.showinfo("Deleted", "Transaction deleted.")
 
     def edit_selected(self):
@@ -918,75 +902,79 @@ class TransactionFrame(tk.Frame):
         Edit the selected transaction.
         
         Prepares the form for editing by pre-filling it with the values
-        from the selected transaction. Removes the original transaction
-        from the UI and database so it can be re-added with modifications.
+        from the selected transaction. The transaction is kept as is until
+        the changes are saved with the Save button, which updates it in
+        place by its ID.
         
         Displays an error message if no transaction is selected.
         """
-        selected = self.transaction_table.selection()
-        if not selected:
-            messagebox.showwarning("No selection", "Please select a transaction to edit.")
+        row = self.get_selected_transaction("edit")
+        if row is None:
             return
 
-        item = self.transaction_table.item(selected[0])
-        values = item['values']
-        category, amount_text, trans_type = values
-        amount = float(amount_text.strip("$"))
-
-        # Remove original entry from table 
-        self.transaction_table.delete(selected[0])
-
-        # Subtract from the appropriate summary
-        if trans_type == "Expense":
-            if category in self.expense_categories:
-                current_text = self.expense_categories[category].cget("text")
-                current_amount = float(current_text.replace("$", ""))
-                new_amount = current_amount - amount
-                self.expense_categories[category].config(text=f"${new_amount:.2f}")
-                self.total_expenses -= amount
-                self.total_value.config(text=f"${self.total_expenses:.2f}")
-
-            self.type_var.set("Expense")  # Set dropdown
-        elif trans_type == "Income":
-            self.total_income -= amount
-            self.income_value.config(text=f"${self.total_income:.2f}")
+        category, trans_type = row['category'], row['type']
+        amount_text = f"{row['amount']:.2f}"
+        self.editing = row
+
+        if trans_type == "Income":
             if category in self.income_types:
                 self.income_type.set(category)
             self.income_entry.delete(0, tk.END)
-            self.income_entry.insert(0, amount_text.strip("$"))
-            self.type_var.set("Income")
-        elif trans_type == "Saving":
-            if category in self.saving_labels:
-                current_text = self.saving_labels[category].cget("text")
-                current_amount = float(current_text.replace("$", ""))
-                new_amount = current_amount - amount
-                self.saving_labels[category].config(text=f"${new_amount:.2f}")
-                
-                self.total_savings -= amount
-                self.savings_total_value.config(text=f"${self.total_savings:.2f}")
-            self.type_var.set("Saving")
+            self.income_entry.insert(0, amount_text)
+            self.add_income_button.config(text="Save")
+        else:
+            # Pre-fill shared input fields
+            self.type_var.set(trans_type)  # Set dropdown
+            self.update_category_dropdown()
+            self.category_dropdown.set(category)
+            self.name_entry.delete(0, tk.END)
+            self.name_entry.insert(0, row['description'] or "")
+            self.amount_entry.delete(0, tk.END)
+            self.amount_entry.insert(0, amount_text)
+            self.add_button.config(text="Save")
+
+        messagebox.showinfo("Edit Mode", f"Now modify the inputs and click 'Save' to update the {trans_type.lower()}.")
+
+    def save_edit(self, category, amount, trans_type, description=None):
+        """
+        Save the changes to the transaction being edited.
+        
+        Updates the transaction in place by its ID and moves its amount
+        from its old category total to the new one.
+        
+        Args:
+            category: The new category
+            amount: The new amount
+            trans_type: The new transaction type
+            description: The new description (optional, kept when None)
+        
+        Returns:
+            bool: True if the transaction was updated
+        """
+        if amount <= 0:
+            messagebox.showerror("Invalid Amount", "Amount must be greater than zero.")
+            return False
 
-        # Pre-fill shared input fields
-        self.category_dropdown.set(category)
-        self.amount_entry.delete(0, tk.END)
-        self.amount_entry.insert(0, amount_text.strip("$"))
-
-        # Remove from database
-        from src.models.database import get_transactions_db_connection as get_db_connection
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-        DELETE FROM transactions 
-        WHERE rowid = (
-            SELECT rowid FROM transactions 
-            WHERE category=? AND amount=? AND type=?
-            LIMIT 1
+        old = self.editing
+        success = self.controller.transaction_controller.update_transaction(
+            old['id'], category=category, amount=amount, trans_type=trans_type, description=description
         )
-        """, (category, amount, trans_type))
-        conn.commit()
-        conn.close()
+        if not success:
+            messagebox.showerror("Error", "Failed to update transaction. Please try again.")
+            return False
 
-        messagebox.showinfo("Edit Mode", f"Now modify the inputs and click 'Add' to re-save the {trans_type.lower()}.")
+        self.summary.add(old['category'], -old['amount'], old['type'])
+        self.update_summary(category, amount, trans_type)
+        self.finish_edit()
+        self.transaction_list.refresh()
+        messagebox.showinfo("Success", f"Updated {trans_type.lower()} of ${amount:.2f} in {category}")
+        return True
+
+    def finish_edit(self):
+        """Leave edit mode and restore the Add buttons."""
+        self.editing = None
+        self.add_button.config(text="Add")
+        self.add_income_button.config(text="Add")
 
     def finish_session(self):
         """
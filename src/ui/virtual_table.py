@@ -0,0 +1,265 @@
+import threading
+import tkinter as tk
+from tkinter import ttk
+from bisect import bisect_left, bisect_right
+from src.config import Config
+
+class KeysetWindow:
+    """
+    Random access to a keyset-paginated result, for tables that scroll anywhere.
+
+    Rows are addressed by position, but read with keyset pagination. The
+    sort key of the row before every page boundary that has been read is
+    kept as an anchor. A read seeks from the nearest anchor on either side
+    of the requested rows, or from either end of the result, reading
+    backwards when that is closer. Scrolling costs one short index range
+    search per page, and a jump with the scrollbar skips only the rows
+    between the target and the closest known key, so a jump to the end
+    is as cheap as one to the start.
+
+    Reads may run on worker threads; a lock keeps the anchors consistent.
+
+    Attributes:
+        total: Number of rows, read by reset
+    """
+    def __init__(self, fetch_page, count, key, page_size=None):
+        """
+        Args:
+            fetch_page: Callable (after, limit, offset, oldest_first) -> list of
+                rows. after is the key of the row before the page (None for the
+                start); with oldest_first the rows are read in reverse order,
+                after being the key of the row following the page (None for
+                the end).
+            count: Callable returning the number of rows
+            key: Callable giving the sort key of a row, as passed to fetch_page
+            page_size (int, optional): Rows between anchors
+        """
+        self.fetch_page = fetch_page
+        self.count = count
+        self.key = key
+        self.page_size = page_size or Config.TABLE_PAGE_SIZE
+        self.total = 0
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget every anchor and recount, after the underlying rows changed."""
+        with self._lock:
+            self.total = self.count()
+            self._pages = [0]
+            self._anchors = {0: None}
+
+    def rows(self, start, stop):
+        """
+        Read the rows at positions start to stop (exclusive).
+
+        Returns:
+            list: The rows, fewer if the result ends before stop
+        """
+        with self._lock:
+            stop = min(stop, self.total)
+            if start >= stop:
+                return []
+
+            page_size = self.page_size
+            page = start // page_size
+            anchor_page = self._pages[bisect_right(self._pages, page) - 1]
+            forward_skip = (page - anchor_page) * page_size
+
+            # The anchor of page n is the row at position n * page_size - 1;
+            # find the first one past the requested rows, else use the end
+            index = bisect_left(self._pages, (stop + page_size) // page_size)
+            if index < len(self._pages):
+                later = self._pages[index]
+                later_position, later_key = later * page_size - 1, self._anchors[later]
+            else:
+                later_position, later_key = self.total, None
+
+            if later_position - stop < forward_skip:
+                rows = self.fetch_page(later_key, stop - start, later_position - stop, True)[::-1]
+                first = start
+            else:
+                first = page * page_size
+                rows = self.fetch_page(self._anchors[anchor_page], stop - first, forward_skip, False)
+
+            # Remember the key before every page boundary just read
+            for position, row in enumerate(rows, first):
+                if (position + 1) % page_size == 0:
+                    self._add_anchor((position + 1) // page_size, self.key(row))
+            return rows[start - first:]
+
+    def _add_anchor(self, page, key):
+        if page not in self._anchors:
+            self._pages.insert(bisect_right(self._pages, page), page)
+        self._anchors[page] = key
+
+class VirtualTable(tk.Frame):
+    """
+    A Treeview with a scrollbar that only holds the rows around the view.
+
+    The table keeps the visible rows plus about one page on each side as
+    Treeview items, read through a KeysetWindow. The scrollbar is driven
+    from the full row count, and the window moves as the user scrolls,
+    including with the mouse wheel and arrow keys. Items use the row's
+    "id" as their iid. The selected row is remembered while it is scrolled
+    out of the window. Given a TkDispatcher, rows are read on the shared
+    background executor and shown once they arrive, so the Tk thread
+    never waits on the database; a newer read makes an older one stale.
+
+    Attributes:
+        tree: The underlying ttk.Treeview, for headings, bindings and styling
+        scrollbar: The vertical ttk.Scrollbar
+        window: The KeysetWindow the rows come from
+    """
+    def __init__(self, parent, columns, fetch_page, count, key, format_row, page_size=None, height=6,
+                 dispatcher=None, **kwargs):
+        """
+        Args:
+            parent: The parent widget
+            columns (tuple): Column identifiers of the Treeview
+            fetch_page, count, key, page_size: See KeysetWindow
+            format_row: Callable turning a row into the tuple of column values
+            height (int): Minimum number of visible rows
+            dispatcher (TkDispatcher, optional): Read rows in the background
+                through it instead of on the Tk thread
+        """
+        super().__init__(parent, **kwargs)
+        self.format_row = format_row
+        self.window = KeysetWindow(fetch_page, count, key, page_size)
+        self.dispatcher = dispatcher
+        self.request_key = f"virtual_table_{id(self)}"
+        self.first = 0
+        self.loaded_start = 0
+        self.loaded = []
+        self.rows = {}
+        self.selected_id = None
+        self._target = 0
+        self._pending = None
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=height, selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<Configure>", lambda e: self.schedule_load(self.first))
+
+    def refresh(self):
+        """Recount and reload the rows in view, keeping the scroll position."""
+        self._request(self.first, reset=True)
+
+    def get_row(self, iid):
+        """Get the row behind a Treeview item, or None if it is not loaded."""
+        return self.rows.get(str(iid))
+
+    def visible_rows(self):
+        """Number of rows that fit in the Treeview as currently sized."""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        return max(int(self.tree.cget("height")), self.tree.winfo_height() // row_height)
+
+    def load(self, first):
+        """Show the rows around position `first`, read now or in the background."""
+        self._request(first)
+
+    def _request(self, first, reset=False):
+        visible = self.visible_rows()
+        if self.dispatcher is None:
+            self.show_rows(self.read_rows(first, visible, reset))
+        else:
+            self.dispatcher.run(self.read_rows, first, visible, reset,
+                                on_success=self.show_rows, key=self.request_key)
+
+    def read_rows(self, first, visible, reset=False):
+        """
+        Read the rows around position `first`; touches no widgets.
+
+        Returns:
+            tuple: (first, start, rows) where start is the position of rows[0]
+        """
+        if reset:
+            self.window.reset()
+        first = max(0, min(first, self.window.total - visible))
+        start = max(0, first - self.window.page_size)
+        return first, start, self.window.rows(start, first + visible + self.window.page_size)
+
+    def show_rows(self, result):
+        """
+        Replace the Treeview items with rows from read_rows.
+
+        Items that stay in the window are moved rather than recreated.
+        """
+        first, start, rows = result
+        ids = [str(row["id"]) for row in rows]
+        existing = set(self.tree.get_children())
+        stale = existing.difference(ids)
+        if stale:
+            self.tree.delete(*stale)
+        for index, (iid, row) in enumerate(zip(ids, rows)):
+            if iid in existing:
+                self.tree.move(iid, "", index)
+                self.tree.item(iid, values=self.format_row(row))
+            else:
+                self.tree.insert("", index, iid=iid, values=self.format_row(row))
+
+        self.first = first
+        self.loaded_start = start
+        self.loaded = ids
+        self.rows = dict(zip(ids, rows))
+        if self.selected_id in self.rows:
+            self.tree.selection_set(self.selected_id)
+        if rows:
+            self.tree.yview_moveto((first - start) / len(rows))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def schedule_load(self, first):
+        """Move the window once Tk is idle, collapsing repeated requests."""
+        self._target = first
+        if self._pending is None:
+            self._pending = self.after_idle(self._load_pending)
+
+    def _load_pending(self):
+        self._pending = None
+        self.load(self._target)
+
+    def on_tree_scroll(self, low, high):
+        """
+        Track Treeview scrolling: mirror it on the scrollbar and move the
+        window when the view gets close to either end of the loaded rows.
+        """
+        total = self.window.total
+        if not self.loaded or not total:
+            self.scrollbar.set(0, 1)
+            return
+
+        top = self.loaded_start + round(float(low) * len(self.loaded))
+        bottom = self.loaded_start + round(float(high) * len(self.loaded))
+        self.first = top
+        self.scrollbar.set(top / total, bottom / total)
+
+        loaded_stop = self.loaded_start + len(self.loaded)
+        margin = self.window.page_size // 2
+        if (top - self.loaded_start < margin and self.loaded_start > 0) or \
+                (loaded_stop - bottom < margin and loaded_stop < total):
+            self.schedule_load(top)
+
+    def on_scrollbar(self, action, value, unit=None):
+        """Scroll to a position of the full result, as asked by the scrollbar."""
+        visible = self.visible_rows()
+        if action == "moveto":
+            first = int(float(value) * self.window.total)
+        else:
+            first = self.first + int(value) * (visible if unit == "pages" else 1)
+        first = max(0, min(first, self.window.total - visible))
+
+        if self.loaded_start <= first and first + visible <= self.loaded_start + len(self.loaded):
+            self.tree.yview_moveto((first - self.loaded_start) / len(self.loaded))
+        else:
+            self.load(first)
+
+    def on_select(self, event=None):
+        """Remember the selected row, which may later scroll out of the window."""
+        selection = self.tree.selection()
+        if selection:
+            self.selected_id = selection[0]
@@ -1,11 +1,27 @@
 import datetime
+from decimal import Decimal, ROUND_HALF_UP
+
+def to_cents(amount):
+    """Convert a dollar amount (number, numeric string or Decimal) to integer cents"""
+    cents = (Decimal(str(amount)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
+    return int(cents)
+
+def from_cents(cents):
+    """Convert integer cents to a dollar amount"""
+    return cents / 100
+
+def format_cents(cents, currency='$'):
+    """Format integer cents as currency without going through a float"""
+    sign = "-" if cents < 0 else ""
+    dollars, remainder = divmod(abs(int(cents)), 100)
+    return f"{sign}{currency}{dollars:,}.{remainder:02d}"
 
 def format_currency(amount, currency='$'):
     """Format a number as currency"""
-    return f"{currency}{amount:,.2f}"
+    return format_cents(to_cents(amount), currency)
 
 def format_date(date_obj, format_str='%Y-%m-%d'):
     """Format a date object to string"""
     if isinstance(date_obj, datetime.datetime):
         return date_obj.strftime(format_str)
-    return date_obj
\ No newline at end of file
+    return date_obj
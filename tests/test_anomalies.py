@@ -0,0 +1,189 @@
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.models import database, migrations, transaction, anomalies
+from src.core.anomalies import AnomalyDetector
+from src.core.transactions import TransactionManager
+from src.controllers.transaction_controller import TransactionController
+
+def sequential_scores(categories, amounts, min_history, state):
+    """Plain one-row-at-a-time Welford, the reference for the vectorized scorer"""
+    state = dict(state)
+    z_scores = []
+    for category, x in zip(categories, amounts):
+        count, mean, m2 = state.get(category, (0, 0.0, 0.0))
+        std = (m2 / (count - 1)) ** 0.5 if count >= 2 else 0.0
+        z_scores.append((x - mean) / std if count >= max(min_history, 2) and std > 0 else np.nan)
+        count += 1
+        delta = x - mean
+        mean += delta / count
+        m2 += delta * (x - mean)
+        state[category] = (count, mean, m2)
+    return np.array(z_scores), state
+
+class TestAnomalyDetector(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = Path("test_anomalies.db")
+        patcher = patch("src.models.database.TRANSACTIONS_DB_PATH", self.test_db_path)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.detector = AnomalyDetector(threshold=3.0, min_history=5)
+
+    def tearDown(self):
+        database.close_all_connections()
+        if self.test_db_path.exists():
+            os.remove(self.test_db_path)
+
+    def test_score_matches_sequential_welford(self):
+        rng = np.random.default_rng(5)
+        categories = rng.choice(["Food", "Rent", "Fun", "Gas"], size=500).tolist()
+        amounts = rng.integers(100, 100000, size=500)
+        prior = {"Food": (7, 2500.0, 3.0e6)}
+
+        # Split in two batches, the second continuing from the first
+        z1, _, _, middle = self.detector.score(categories[:200], amounts[:200], prior)
+        z2, _, _, final = self.detector.score(categories[200:], amounts[200:], middle)
+
+        expected_z, expected_state = sequential_scores(categories, amounts, 5, prior)
+        np.testing.assert_allclose(np.concatenate([z1, z2]), expected_z, rtol=1e-9)
+        for category, (count, mean, m2) in expected_state.items():
+            self.assertEqual(final[category][0], count)
+            self.assertAlmostEqual(final[category][1], mean, places=6)
+            self.assertAlmostEqual(final[category][2] / m2, 1.0, places=9)
+
+    def save(self, user_id, amounts, category="Food"):
+        rows = [{"category": category, "amount": cents / 100, "type": "Expense"} for cents in amounts]
+        return transaction.save_transactions_bulk(rows, user_id=user_id)
+
+    def test_outlier_flagged_after_min_history(self):
+        history = [1000, 1100, 900, 1050, 950]
+        # Too little history: even a huge amount is not flagged yet
+        amounts = history[:4] + [90000]
+        self.assertEqual(self.detector.process(2, self.save(2, amounts), ["Food"] * 5, amounts), [])
+
+        self.detector.process(1, self.save(1, history[:2]), ["Food"] * 2, history[:2])
+        amounts = history[2:] + [5000]
+        tx_ids = self.save(1, amounts)
+        flags = self.detector.process(1, tx_ids, ["Food"] * 4, amounts)
+        self.assertEqual([flag[0] for flag in flags], [tx_ids[-1]])
+        self.assertGreater(flags[0][3], 3.0)
+
+        count, _, _ = anomalies.load_category_moments(1)["Food"]
+        self.assertEqual(count, 6)
+
+    def test_backfill_matches_streaming(self):
+        rows = [{"category": "Food", "amount": amount, "type": "Expense"}
+                for amount in [10, 12, 11, 9, 10, 13, 11, 95, 10, 12]]
+        rows.append({"category": "Food", "amount": 1000, "type": "Income"})
+        tx_ids = transaction.save_transactions_bulk(rows, user_id=1)
+
+        flags = self.detector.backfill(1)
+        self.assertEqual([flag[0] for flag in flags], [tx_ids[7]])
+        self.assertEqual(self.detector.backfill(1), flags)
+        self.assertEqual([row["id"] for row in anomalies.get_anomalies(1)], [tx_ids[7]])
+        self.assertEqual(anomalies.get_anomalies(2), [])
+
+    def test_triggers_keep_moments_for_every_write(self):
+        rng = np.random.default_rng(2)
+        tx_ids = transaction.save_transactions_bulk([
+            {"category": str(rng.choice(["Food", "Rent"])), "amount": int(rng.integers(100, 5000)) / 100,
+             "type": str(rng.choice(["Expense", "Income"]))}
+            for _ in range(80)
+        ], user_id=1)
+        for tx_id in tx_ids[:20]:
+            transaction.delete_transaction(tx_id)
+        for tx_id in tx_ids[20:40]:
+            transaction.update_transaction(tx_id, amount=int(rng.integers(100, 5000)) / 100, trans_type="Expense")
+        transaction.save_transaction("Food", 12.34, "expense", user_id=1)
+
+        history = transaction.load_transaction_columns(1, trans_type="Expense")
+        categories = [history.categories[code] for code in history.category_codes.tolist()]
+        _, _, _, expected = self.detector.score(categories, history.amount_cents, {})
+        moments = anomalies.load_category_moments(1)
+        self.assertEqual(set(moments), set(expected))
+        for category, (count, mean, m2) in expected.items():
+            self.assertEqual(moments[category][0], count)
+            self.assertAlmostEqual(moments[category][1], mean, places=6)
+            self.assertAlmostEqual(moments[category][2] / m2, 1.0, places=9)
+
+    def test_migration_backfills_existing_expenses(self):
+        # Expenses stored before the statistics were kept by triggers
+        conn = database.get_connection_pool(self.test_db_path).acquire()
+        migrations.migrate(conn, migrations.TRANSACTIONS_MIGRATIONS[:10])
+        conn.executemany(
+            "INSERT INTO transactions (user_id, category, amount_cents, type) VALUES (1, 'Food', ?, 'Expense')",
+            [(cents,) for cents in [1000, 1200, 1100, 900, 1000, 1300, 1100, 1000, 1200, 900]]
+        )
+        conn.execute("DELETE FROM category_moments")
+        conn.commit()
+        migrations.migrate(conn, migrations.TRANSACTIONS_MIGRATIONS)
+        conn.close()
+
+        count, mean, _ = anomalies.load_category_moments(1)["Food"]
+        self.assertEqual((count, mean), (10, 1070.0))
+        for tx_id in range(1, 6):
+            transaction.delete_transaction(tx_id)
+        self.assertEqual(anomalies.load_category_moments(1)["Food"][0], 5)
+
+        tx_ids = self.save(1, [500000])
+        self.assertEqual([flag[0] for flag in self.detector.process(1, tx_ids, ["Food"], [500000])], tx_ids)
+
+    def test_manager_scores_expenses_whatever_the_case(self):
+        manager = TransactionManager(user_id=1)
+        manager.anomaly_detector = self.detector
+        manager.add_bulk([{"category": "Food", "amount": amount, "type": "Expense"} for amount in [10, 12, 11, 9, 10, 13]])
+
+        success, _ = manager.add("Food", 90, "expense")
+        self.assertTrue(success)
+        self.assertEqual([row["amount"] for row in anomalies.get_anomalies(1)], [90.0])
+        self.assertEqual(manager.add("Food", 5, "Gift"), (False, "Invalid transaction type"))
+
+class TestControllerAnomalies(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = Path("test_controller_anomalies.db")
+        patcher = patch("src.models.database.TRANSACTIONS_DB_PATH", self.test_db_path)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        self.auth_manager = MagicMock()
+        self.auth_manager.current_user.id = 1
+        self.controller = TransactionController(self.auth_manager)
+        self.controller.anomaly_detector = AnomalyDetector(threshold=3.0, min_history=5)
+
+    def tearDown(self):
+        database.close_all_connections()
+        if self.test_db_path.exists():
+            os.remove(self.test_db_path)
+
+    def test_writes_keep_flags_current(self):
+        self.controller.add_transactions_bulk([
+            {"category": "Food", "amount": amount, "type": "Expense"} for amount in [10, 12, 11, 9, 10, 13]
+        ])
+        success, message = self.controller.add_transaction("Food", 90, "expense")
+        self.assertTrue(success)
+        self.assertIn("unusually large", message)
+
+        flagged = self.controller.get_anomalies()
+        self.assertEqual([row["amount"] for row in flagged], [90.0])
+
+        # Editing the amount back to normal clears the flag
+        self.assertTrue(self.controller.update_transaction(flagged[0]["id"], amount=11))
+        self.assertEqual(self.controller.get_anomalies(), [])
+        self.assertEqual(anomalies.load_category_moments(1)["Food"][0], 7)
+
+        self.assertTrue(self.controller.update_transaction(flagged[0]["id"], amount=95))
+        self.assertEqual(len(self.controller.get_anomalies()), 1)
+        self.assertTrue(self.controller.delete_transaction(flagged[0]["id"]))
+        self.assertEqual(self.controller.get_anomalies(), [])
+        self.assertEqual(anomalies.load_category_moments(1)["Food"][0], 6)
+
+        self.assertEqual(self.controller.scan_anomalies(), (True, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.models.user import User
 from src.core.auth import AuthManager
 from src.controllers.auth_controller import AuthController
+from src.models import database
 
 class TestAuth(unittest.TestCase):
     """Test cases for authentication functionality"""
@@ -50,6 +51,7 @@ class TestAuth(unittest.TestCase):
     
     def tearDown(self):
         """Clean up after each test"""
+        database.close_all_connections()
         self.db_patcher.stop()
         if self.test_db_path.exists():
             os.remove(self.test_db_path)
@@ -0,0 +1,120 @@
+import os
+import threading
+import unittest
+from concurrent.futures import Future
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.core import background
+from src.core.background import TkDispatcher
+from src.models import database
+from src.controllers.transaction_controller import TransactionController
+
+class FakeWidget:
+    """Stands in for a Tk widget: records after() calls so tests run them by hand"""
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for callback in scheduled:
+            callback()
+
+class TestTkDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.widget = FakeWidget()
+        self.dispatcher = TkDispatcher(self.widget, interval_ms=1)
+        self.results = []
+
+    def test_results_delivered_on_polling_thread(self):
+        gate = threading.Event()
+        future = self.dispatcher.run(lambda: gate.wait(5) and threading.get_ident(),
+                                     on_success=self.results.append)
+        self.widget.run_pending()
+        self.assertEqual(self.results, [])
+        self.assertEqual(len(self.widget.scheduled), 1)  # Still polling
+
+        gate.set()
+        future.result(timeout=5)
+        self.widget.run_pending()
+        self.assertEqual(len(self.results), 1)
+        self.assertNotEqual(self.results[0], threading.get_ident())
+        self.assertEqual(self.widget.scheduled, [])  # Nothing pending, polling stopped
+
+    def test_newer_request_makes_older_stale(self):
+        old, new = Future(), Future()
+        self.dispatcher.watch(old, lambda result: self.results.append(("old", result)), key="report")
+        self.dispatcher.watch(new, lambda result: self.results.append(("new", result)), key="report")
+        self.assertTrue(old.cancelled())
+        self.assertTrue(self.dispatcher.is_pending("report"))
+
+        new.set_result(2)
+        self.widget.run_pending()
+        self.assertEqual(self.results, [("new", 2)])
+        self.assertFalse(self.dispatcher.is_pending("report"))
+
+    def test_result_of_running_stale_request_is_dropped(self):
+        old, new = Future(), Future()
+        old.set_running_or_notify_cancel()  # Already running: cannot be cancelled
+        self.dispatcher.watch(old, self.results.append, key="snapshot")
+        self.dispatcher.watch(new, self.results.append, key="snapshot")
+        old.set_result("stale")
+        new.set_result("fresh")
+        self.widget.run_pending()
+        self.assertEqual(self.results, ["fresh"])
+
+    def test_errors_go_to_on_error(self):
+        errors = []
+        future = Future()
+        self.dispatcher.watch(future, self.results.append, on_error=errors.append)
+        future.set_exception(ValueError("boom"))
+        self.widget.run_pending()
+        self.assertEqual(self.results, [])
+        self.assertEqual([str(error) for error in errors], ["boom"])
+
+    def test_cancel(self):
+        future = Future()
+        self.dispatcher.watch(future, self.results.append, key="login")
+        self.dispatcher.cancel("login")
+        self.widget.run_pending()
+        self.assertTrue(future.cancelled())
+        self.assertEqual((self.results, self.widget.scheduled), ([], []))
+
+class TestControllerAsync(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = Path("test_background.db")
+        patcher = patch("src.models.database.TRANSACTIONS_DB_PATH", self.test_db_path)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        auth_manager = MagicMock()
+        auth_manager.current_user.id = 1
+        self.controller = TransactionController(auth_manager)
+
+    def tearDown(self):
+        background.shutdown_executor(wait=True)
+        database.close_all_connections()
+        if self.test_db_path.exists():
+            os.remove(self.test_db_path)
+
+    def test_report_data_async(self):
+        self.controller.add_transaction("Food", 12.5, "Expense")
+        self.controller.add_transaction("Paycheck", 100, "Income")
+
+        report = self.controller.get_report_data_async().result(timeout=10)
+        self.assertEqual(report["snapshot"]["expenses"], {"Food": 12.5})
+        self.assertEqual(report["weekly"]["categories"], ["Food"])
+        self.assertEqual(len(report["monthly"]["buckets"]), 6)
+        self.assertEqual(report["balance"]["balance"][-1], 87.5)
+
+        # Results are cached like the synchronous reads
+        self.assertIs(self.controller.get_dashboard_snapshot_async().result(timeout=10), report["snapshot"])
+        self.assertEqual(self.controller.get_savings_summary_async().result(timeout=10), {})
+
+if __name__ == '__main__':
+    unittest.main()
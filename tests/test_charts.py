@@ -0,0 +1,94 @@
+import unittest
+from pathlib import Path
+import sys
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.ui.charts import PieChart, StackedBarChart, BalanceChart
+
+def buckets(categories, totals, start="2024-01-01", count=None):
+    totals = np.array(totals, dtype=float)
+    count = count or totals.shape[1]
+    return {
+        "buckets": np.arange(np.datetime64(start), np.datetime64(start) + count),
+        "categories": categories,
+        "totals": totals,
+    }
+
+class TestCharts(unittest.TestCase):
+    def render(self, chart):
+        FigureCanvasAgg(chart.figure).draw()
+
+    def test_pie_updates_wedges_in_place(self):
+        chart = PieChart("Savings")
+        self.assertFalse(chart.update({}))
+        self.assertTrue(chart.update({"Car": 100, "House": 300}))
+        wedges = list(chart.wedges)
+
+        chart.update({"Car": 300, "House": 100})
+        self.render(chart)
+        self.assertEqual(list(chart.wedges), wedges)
+        # Same angles a freshly drawn pie would have
+        fresh = PieChart("Savings")
+        fresh.update({"Car": 300, "House": 100})
+        for wedge, expected in zip(chart.wedges, fresh.wedges):
+            self.assertAlmostEqual(wedge.theta1, expected.theta1)
+            self.assertAlmostEqual(wedge.theta2, expected.theta2)
+        self.assertEqual([text.get_text() for text in chart.autotexts], ["75.0%", "25.0%"])
+
+        # New categories rebuild on the same axes
+        chart.update({"Car": 1, "House": 1, "Trip": 2})
+        self.assertEqual(len(chart.ax.patches), 3)
+
+    def test_stacked_bars_update_in_place(self):
+        chart = StackedBarChart("Weekly", "Week of")
+        self.assertFalse(chart.update(None, []))
+        labels = ["Jan 01", "Jan 08"]
+        chart.update(buckets(["Food", "Rent"], [[1, 2], [10, 20]]), labels)
+        rects = list(chart.ax.patches)
+
+        chart.update(buckets(["Food", "Rent"], [[5, 0], [7, 30]]), ["Jan 08", "Jan 15"])
+        self.render(chart)
+        self.assertEqual(list(chart.ax.patches), rects)
+        rent = chart.containers[1]
+        self.assertEqual([(rect.get_y(), rect.get_height()) for rect in rent], [(5, 7), (0, 30)])
+        self.assertGreaterEqual(chart.ax.get_ylim()[1], 30)
+        self.assertEqual([tick.get_text() for tick in chart.ax.get_xticklabels()], ["Jan 08", "Jan 15"])
+
+        chart.update(buckets(["Food"], [[1, 1]]), labels)
+        self.assertEqual(len(chart.ax.patches), 2)
+
+    def test_balance_line_reused(self):
+        chart = BalanceChart()
+        self.assertFalse(chart.update({"buckets": np.array([], dtype="datetime64[D]"), "balance": np.array([])}))
+        series = buckets(["x"], [[0, 0, 0]])
+        chart.update({"buckets": series["buckets"], "balance": np.array([10.0, -5.0, 20.0])})
+        line = chart.line
+
+        chart.update({"buckets": series["buckets"], "balance": np.array([1.0, 2.0, 300.0])})
+        self.render(chart)
+        self.assertIs(chart.line, line)
+        self.assertEqual(list(line.get_ydata()), [1.0, 2.0, 300.0])
+        self.assertEqual(len(chart.ax.collections), 1)
+
+    def test_repeated_refreshes_keep_artist_count(self):
+        pie, bars, balance = PieChart("Savings"), StackedBarChart("Monthly", "Month"), BalanceChart()
+        figures_before = plt.get_fignums()
+        rng = np.random.default_rng(1)
+        days = np.arange(np.datetime64("2024-01-01"), np.datetime64("2024-01-31"))
+        for _ in range(50):
+            pie.update({"Car": rng.uniform(1, 10), "House": rng.uniform(1, 10)})
+            bars.update(buckets(["Food", "Rent"], rng.uniform(0, 10, (2, 6))), list("abcdef"))
+            balance.update({"buckets": days, "balance": rng.normal(size=len(days))})
+
+        self.assertEqual(len(pie.ax.patches), 2)
+        self.assertEqual(len(bars.ax.patches), 12)
+        self.assertEqual((len(balance.ax.lines), len(balance.ax.collections)), (2, 1))
+        # Plain Figures never enter pyplot's global registry
+        self.assertEqual(plt.get_fignums(), figures_before)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,325 @@
+import gc
+import os
+import sqlite3
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.models import database, migrations
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = Path("test_pool.db")
+        patcher = patch("src.models.database.TRANSACTIONS_DB_PATH", self.test_db_path)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    def tearDown(self):
+        database.close_all_connections()
+        if self.test_db_path.exists():
+            os.remove(self.test_db_path)
+
+    def test_connection_is_reused_after_close(self):
+        conn = database.get_transactions_db_connection()
+        raw = conn._conn
+        conn.close()
+
+        conn = database.get_transactions_db_connection()
+        self.assertIs(conn._conn, raw)
+        conn.close()
+
+    def test_nested_handles_share_connection(self):
+        with database.get_transactions_db_connection() as outer:
+            with database.get_transactions_db_connection() as inner:
+                self.assertIs(inner._conn, outer._conn)
+            # Releasing the inner handle must leave the outer one usable
+            self.assertEqual(outer.execute("SELECT 1").fetchone()[0], 1)
+
+    def test_nested_commit_and_rollback_leave_outer_transaction_alone(self):
+        with database.get_transactions_db_connection() as conn:
+            conn.execute("CREATE TABLE items (name TEXT)")
+            conn.commit()
+
+        def count(conn):
+            return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+        with database.get_transactions_db_connection() as outer:
+            outer.execute("INSERT INTO items VALUES ('outer')")
+            with database.get_transactions_db_connection() as inner:
+                inner.execute("BEGIN IMMEDIATE")
+                inner.execute("INSERT INTO items VALUES ('kept')")
+                inner.commit()
+                inner.execute("INSERT INTO items VALUES ('undone')")
+                inner.rollback()
+            with database.get_transactions_db_connection() as inner:
+                inner.execute("INSERT INTO items VALUES ('never committed')")
+            self.assertTrue(outer.in_transaction)
+            self.assertEqual(count(outer), 2)
+            outer.rollback()
+
+        # The inner commit did not commit the outer caller's pending writes
+        with database.get_transactions_db_connection() as conn:
+            self.assertEqual(count(conn), 0)
+
+    def test_leaked_handle_does_not_nest_later_handles(self):
+        with database.get_transactions_db_connection() as conn:
+            conn.execute("CREATE TABLE items (name TEXT)")
+            conn.commit()
+
+        leaked = database.get_transactions_db_connection()
+        leaked.execute("INSERT INTO items VALUES ('leaked')")
+        del leaked
+        gc.collect()
+
+        with database.get_transactions_db_connection() as conn:
+            self.assertIsNone(conn._savepoint)
+            self.assertFalse(conn.in_transaction)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 0)
+
+    def test_handle_closed_on_another_thread_is_released(self):
+        handle = database.get_transactions_db_connection()
+        thread = threading.Thread(target=handle.close)
+        thread.start()
+        thread.join()
+
+        with database.get_transactions_db_connection() as conn:
+            self.assertIsNone(conn._savepoint)
+            conn.execute("CREATE TABLE items (name TEXT)")
+            conn.execute("INSERT INTO items VALUES ('top level')")
+            conn.commit()
+        with database.get_transactions_db_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 1)
+
+    def test_threads_get_separate_connections(self):
+        seen = {}
+
+        def worker():
+            with database.get_transactions_db_connection() as conn:
+                seen["worker"] = conn._conn
+
+        with database.get_transactions_db_connection() as conn:
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            self.assertIsNot(seen["worker"], conn._conn)
+
+    def test_row_factory_restored_on_release(self):
+        conn = database.get_transactions_db_connection()
+        conn.row_factory = lambda cursor, row: row[0]
+        conn.close()
+
+        with database.get_transactions_db_connection() as conn:
+            self.assertIsInstance(conn.execute("SELECT 1 AS one").fetchone(), sqlite3.Row)
+
+    def test_uncommitted_writes_rolled_back_on_release(self):
+        with database.get_transactions_db_connection() as conn:
+            conn.execute("CREATE TABLE items (name TEXT)")
+            conn.commit()
+            conn.execute("INSERT INTO items VALUES ('pending')")
+
+        with database.get_transactions_db_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 0)
+
+    def test_performance_profile_applied(self):
+        with database.get_transactions_db_connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+            self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)  # MEMORY
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0],
+                             -database.Config.SQLITE_CACHE_SIZE_KB)
+
+    def test_invalid_profile_setting_rejected(self):
+        with patch.object(database.Config, "SQLITE_SYNCHRONOUS", "SOMETIMES"):
+            with self.assertRaises(ValueError):
+                database.get_transactions_db_connection()
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = Path("test_migrations.db")
+        patcher = patch("src.models.database.TRANSACTIONS_DB_PATH", self.test_db_path)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        # Bypass lazy initialization so each test starts from an empty file
+        self.conn = database.get_connection_pool(self.test_db_path).acquire()
+
+    def tearDown(self):
+        self.conn.close()
+        database.close_all_connections()
+        if self.test_db_path.exists():
+            os.remove(self.test_db_path)
+
+    def test_fresh_database_reaches_latest_version(self):
+        applied = migrations.migrate(self.conn, migrations.TRANSACTIONS_MIGRATIONS)
+        latest = migrations.TRANSACTIONS_MIGRATIONS[-1].version
+        self.assertEqual(applied[-1], latest)
+        self.assertEqual(migrations.get_schema_version(self.conn), latest)
+
+    def test_migrate_is_idempotent(self):
+        migrations.migrate(self.conn, migrations.TRANSACTIONS_MIGRATIONS)
+        self.assertEqual(migrations.migrate(self.conn, migrations.TRANSACTIONS_MIGRATIONS), [])
+
+    def test_unversioned_database_keeps_its_data(self):
+        # Database created before migrations existed: tables but user_version 0
+        self.conn.execute("""
+        CREATE TABLE transactions(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            amount REAL NOT NULL,
+            type TEXT NOT NULL,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""")
+        self.conn.executemany(
+            "INSERT INTO transactions (user_id, category, amount, type) VALUES (1, ?, ?, 'Expense')",
+            [("Rent", 900), ("Food", 19.99), ("Food", 0.285)]
+        )
+        self.conn.commit()
+
+        migrations.migrate(self.conn, migrations.TRANSACTIONS_MIGRATIONS)
+        cents = [row[0] for row in self.conn.execute("SELECT amount_cents FROM transactions ORDER BY id")]
+        self.assertEqual(cents, [90000, 1999, 29])
+        totals = self.conn.execute(
+            "SELECT category, total_cents, count FROM category_totals ORDER BY category"
+        ).fetchall()
+        self.assertEqual([tuple(row) for row in totals], [("Food", 2028, 2), ("Rent", 90000, 1)])
+
+    def test_interrupted_cents_rebuild_can_be_rerun(self):
+        migrations.migrate(self.conn, migrations.TRANSACTIONS_MIGRATIONS[:2])
+        self.conn.execute("INSERT INTO transactions (user_id, category, amount, type) VALUES (1, 'Food', 12.5, 'Expense')")
+        self.conn.execute("INSERT INTO savings_goals (user_id, category, target_amount) VALUES (1, 'Car', 5000)")
+        self.conn.commit()
+
+        rebuild_table = migrations.rebuild_table
+
+        def crash_after_transactions(conn, table, *args, **kwargs):
+            if table == "savings_goals":
+                raise RuntimeError("crash")
+            return rebuild_table(conn, table, *args, **kwargs)
+
+        # transactions is swapped, savings_goals is not, the version stays at 2
+        with patch("src.models.migrations.rebuild_table", side_effect=crash_after_transactions):
+            with self.assertRaises(RuntimeError):
+                migrations.migrate(self.conn, migrations.TRANSACTIONS_MIGRATIONS)
+        self.assertEqual(migrations.get_schema_version(self.conn), 2)
+
+        migrations.migrate(self.conn, migrations.TRANSACTIONS_MIGRATIONS)
+        self.assertEqual(migrations.get_schema_version(self.conn), migrations.TRANSACTIONS_MIGRATIONS[-1].version)
+        self.assertEqual(self.conn.execute("SELECT amount_cents FROM transactions").fetchone()[0], 1250)
+        self.assertEqual(self.conn.execute("SELECT target_amount_cents FROM savings_goals").fetchone()[0], 500000)
+
+    def test_epoch_timestamps_backfilled(self):
+        migrations.migrate(self.conn, migrations.TRANSACTIONS_MIGRATIONS[:3])
+        self.conn.execute(
+            "INSERT INTO transactions (user_id, category, amount_cents, type, created_at) "
+            "VALUES (1, 'Rent', 90000, 'Expense', '2024-03-01 12:30:00')"
+        )
+        self.conn.commit()
+
+        migrations.migrate(self.conn, migrations.TRANSACTIONS_MIGRATIONS)
+        self.conn.execute(
+            "INSERT INTO transactions (user_id, category, amount_cents, type, created_at) "
+            "VALUES (1, 'Food', 500, 'Expense', '2024-03-02 00:00:00')"
+        )
+        stamps = [row[0] for row in self.conn.execute("SELECT created_ts FROM transactions ORDER BY id")]
+        self.assertEqual(stamps, [1709296200, 1709337600])
+
+    def test_failed_step_rolls_back(self):
+        def broken(conn, batch_size):
+            conn.execute("CREATE TABLE half_done (id INTEGER)")
+            raise RuntimeError("boom")
+
+        steps = [migrations.Migration(1, "broken", broken)]
+        with self.assertRaises(RuntimeError):
+            migrations.migrate(self.conn, steps)
+
+        self.assertEqual(migrations.get_schema_version(self.conn), 0)
+        self.assertIsNone(self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'half_done'"
+        ).fetchone())
+
+    def test_rebuild_table_mirrors_writes_made_during_copy(self):
+        self.conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY AUTOINCREMENT, price REAL)")
+        self.conn.executemany("INSERT INTO items (price) VALUES (?)", [(i + 0.5,) for i in range(1, 11)])
+        self.conn.commit()
+
+        writes_done = []
+
+        def write_during_copy(copied):
+            # Simulate another connection writing between batches
+            if writes_done:
+                return
+            writes_done.append(copied)
+            other = sqlite3.connect(self.test_db_path)
+            other.execute("INSERT INTO items (price) VALUES (99.25)")  # new row, id 11
+            other.execute("UPDATE items SET price = 20.5 WHERE id = 2")  # already copied
+            other.execute("DELETE FROM items WHERE id = 8")  # not copied yet
+            other.commit()
+            other.close()
+
+        migrations.rebuild_table(
+            self.conn,
+            "items",
+            "CREATE TABLE {table} (id INTEGER PRIMARY KEY AUTOINCREMENT, price_cents INTEGER NOT NULL)",
+            {"id": "{row}.id", "price_cents": "CAST(ROUND({row}.price * 100) AS INTEGER)"},
+            batch_size=3,
+            finalize_sql=["CREATE INDEX idx_items_price ON items(price_cents)"],
+            progress=write_during_copy,
+        )
+
+        rows = dict(self.conn.execute("SELECT id, price_cents FROM items").fetchall())
+        self.assertEqual(sorted(rows), [1, 2, 3, 4, 5, 6, 7, 9, 10, 11])
+        self.assertEqual(rows[2], 2050)
+        self.assertEqual(rows[11], 9925)
+        self.assertEqual(rows[10], 1050)
+
+        # Temporary triggers are gone and new rows keep counting up
+        self.assertIsNone(self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        ).fetchone())
+        cursor = self.conn.execute("INSERT INTO items (price_cents) VALUES (1)")
+        self.assertEqual(cursor.lastrowid, 12)
+
+
+class TestLazyInitialization(unittest.TestCase):
+    def setUp(self):
+        self.users_db_path = Path("test_lazy_users.db")
+        self.transactions_db_path = Path("test_lazy_transactions.db")
+        for target, path in (("USERS_DB_PATH", self.users_db_path),
+                             ("TRANSACTIONS_DB_PATH", self.transactions_db_path)):
+            patcher = patch(f"src.models.database.{target}", path)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+        database.close_all_connections()
+
+    def tearDown(self):
+        database.close_all_connections()
+        for path in (self.users_db_path, self.transactions_db_path):
+            if path.exists():
+                os.remove(path)
+
+    def test_nothing_created_until_first_use(self):
+        self.assertFalse(self.transactions_db_path.exists())
+        with database.get_transactions_db_connection() as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertIn("transactions", tables)
+        self.assertFalse(self.users_db_path.exists())
+
+    def test_ensure_initialized_is_memoized(self):
+        database.ensure_initialized()
+        times = database.get_initialization_times()
+        self.assertEqual(set(times), {str(self.users_db_path), str(self.transactions_db_path)})
+
+        with patch("src.models.database.migrate") as mock_migrate:
+            database.ensure_initialized()
+            database.get_users_db_connection().close()
+            mock_migrate.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
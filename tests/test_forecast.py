@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.core.forecast import SavingsForecaster
+from src.models.transaction import TransactionColumns, to_epoch
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+def make_history(rows):
+    """Build TransactionColumns from (category, amount_cents, days_ago) tuples."""
+    categories = sorted({category for category, _, _ in rows})
+    return TransactionColumns(
+        np.arange(len(rows), dtype=np.int64),
+        np.array([cents for _, cents, _ in rows], dtype=np.int64),
+        np.array([to_epoch(NOW - timedelta(days=days)) for _, _, days in rows], dtype=np.int64),
+        np.array([categories.index(category) for category, _, _ in rows], dtype=np.int32),
+        categories,
+        np.zeros(len(rows), dtype=np.int32),
+        ["Saving"],
+    )
+
+class TestSavingsForecaster(unittest.TestCase):
+    def setUp(self):
+        self.forecaster = SavingsForecaster(window_weeks=4, simulations=500, horizon_weeks=52, seed=7)
+
+    def test_weekly_deposits(self):
+        history = make_history([
+            ("Vacation", 100, 0), ("vacation", 50, 3), ("Vacation", 70, 8),
+            ("Vacation", 999, 40),  # older than the window
+            ("Emergency", 30, 22),
+        ])
+        deposits = self.forecaster.weekly_deposits(history, ["Vacation", "Emergency", "Car"], NOW)
+        self.assertEqual(deposits.tolist(), [[0, 0, 70, 150], [30, 0, 0, 0], [0, 0, 0, 0]])
+
+    def test_steady_saver(self):
+        # $100 every week: 10 more weeks to save $1000
+        history = make_history([("Vacation", 10000, 7 * week + 1) for week in range(4)])
+        result = self.forecaster.forecast(history, [
+            {"category": "Vacation", "remaining_cents": 100000, "deadline": "2024-08-24"},
+            {"category": "Vacation", "remaining_cents": 100000, "deadline": "2024-07-06"},
+        ], now=NOW)
+
+        expected = NOW.date() + timedelta(weeks=10)
+        self.assertEqual(result[0]["weekly_rate"], 100.0)
+        self.assertEqual(result[0]["rolling_eta"], expected)
+        self.assertEqual((result[0]["eta_p10"], result[0]["eta_p50"], result[0]["eta_p90"]), (expected,) * 3)
+        self.assertEqual(result[0]["deadline_probability"], 1.0)
+        self.assertEqual(result[1]["deadline_probability"], 0.0)
+
+    def test_percentiles_spread_with_irregular_saving(self):
+        history = make_history([("Vacation", 40000, 1), ("Vacation", 0, 8)])
+        result = self.forecaster.forecast(history, [{"category": "Vacation", "remaining_cents": 100000}], now=NOW)[0]
+        # One week in four saved $400: $100 a week on average, 3 weeks at best
+        self.assertEqual(result["rolling_eta"], NOW.date() + timedelta(weeks=10))
+        self.assertLessEqual(result["eta_p10"], result["eta_p50"])
+        self.assertLessEqual(result["eta_p50"], result["eta_p90"])
+        self.assertGreaterEqual(result["eta_p10"], NOW.date() + timedelta(weeks=3))
+        self.assertIsNone(result["deadline_probability"])
+
+    def test_goals_without_progress_or_left_to_save(self):
+        history = make_history([("Vacation", 100, 1)])
+        done, idle, hopeless = self.forecaster.forecast(history, [
+            {"category": "Vacation", "remaining_cents": 0},
+            {"category": "Car", "remaining_cents": 500000},
+            {"category": "Vacation", "remaining_cents": 10 ** 6},
+        ], now=NOW)
+
+        self.assertEqual((done["rolling_eta"], done["eta_p90"]), (NOW.date(), NOW.date()))
+        self.assertEqual((idle["weekly_rate"], idle["rolling_eta"], idle["eta_p50"]), (0.0, None, None))
+        self.assertIsNotNone(hopeless["rolling_eta"])
+        self.assertIsNone(hopeless["eta_p10"])
+
+    def test_no_goals(self):
+        self.assertEqual(self.forecaster.forecast(make_history([]), [], now=NOW), [])
+
+if __name__ == "__main__":
+    unittest.main()
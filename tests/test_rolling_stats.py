@@ -0,0 +1,111 @@
+import os
+import random
+import sqlite3
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.models import database, transaction, rolling_stats
+
+class TestRollingStats(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = Path("test_rolling_stats.db")
+        patcher = patch("src.models.database.TRANSACTIONS_DB_PATH", self.test_db_path)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    def tearDown(self):
+        database.close_all_connections()
+        if self.test_db_path.exists():
+            os.remove(self.test_db_path)
+
+    def stored_tables(self):
+        conn = sqlite3.connect(self.test_db_path)
+        daily = conn.execute("SELECT * FROM daily_category_totals ORDER BY 1, 2, 3, 4").fetchall()
+        rolling = conn.execute("SELECT * FROM rolling_stats ORDER BY 1, 2, 3, 4").fetchall()
+        conn.close()
+        return daily, rolling
+
+    def test_window_statistics(self):
+        transaction.save_transactions_bulk([
+            {"category": "Food", "amount": 10, "type": "Expense", "created_at": "2024-03-10 08:00:00"},
+            {"category": "Food", "amount": 20, "type": "Expense", "created_at": "2024-03-10 19:00:00"},
+            {"category": "Food", "amount": 40, "type": "Expense", "created_at": "2024-03-08 12:00:00"},
+            {"category": "Food", "amount": 70, "type": "Expense", "created_at": "2024-02-20 12:00:00"},
+            {"category": "Rent", "amount": 900, "type": "Expense", "created_at": "2024-01-01 00:00:00"},
+            {"category": "Food", "amount": 500, "type": "Saving", "created_at": "2024-03-10 12:00:00"},
+        ], user_id=1)
+
+        stats = rolling_stats.get_rolling_stats(1, as_of="2024-03-10")
+        food = stats["Food"]
+        # Days with 30 and 40 out of 7: mean 10, variance (900 + 1600) / 7 - 100
+        self.assertEqual(food[7]["sum"], 70.0)
+        self.assertEqual(food[7]["mean"], 10.0)
+        self.assertAlmostEqual(food[7]["variance"], 2500 / 7 - 100)
+        self.assertEqual(food[30]["sum"], 140.0)
+        self.assertEqual(food[90]["sum"], 140.0)
+        self.assertEqual((stats["Rent"][30]["sum"], stats["Rent"][90]["sum"]), (0.0, 900.0))
+        self.assertEqual(rolling_stats.get_rolling_stats(1, "Saving", as_of="2024-03-10")["Food"][7]["sum"], 500.0)
+
+        # Sliding forward drops old days, sliding back restores them
+        later = rolling_stats.get_rolling_stats(1, as_of="2024-03-16")
+        self.assertEqual(later["Food"][7]["sum"], 30.0)
+        self.assertEqual(later["Food"][7]["std"], (900 / 7 - (30 / 7) ** 2) ** 0.5)
+        self.assertEqual(rolling_stats.get_rolling_stats(1, as_of="2024-03-10")["Food"][7]["sum"], 70.0)
+
+    def test_incremental_updates_match_rebuild(self):
+        rng = random.Random(3)
+        categories = ["Food", "Rent", "Fun"]
+        tx_ids = transaction.save_transactions_bulk([
+            {"category": rng.choice(categories), "amount": rng.randint(1, 5000) / 100, "type": "Expense",
+             "created_at": f"2024-{rng.randint(1, 4):02d}-{rng.randint(1, 28):02d} 12:00:00"}
+            for _ in range(200)
+        ], user_id=1)
+        rolling_stats.get_rolling_stats(1, as_of="2024-03-01")
+
+        for tx_id in rng.sample(tx_ids, 60):
+            transaction.delete_transaction(tx_id)
+        for tx_id in rng.sample(tx_ids, 60):
+            transaction.update_transaction(tx_id, amount=rng.randint(1, 5000) / 100, category=rng.choice(categories))
+        for _ in range(20):
+            transaction.save_transaction(rng.choice(categories), 12.5, "Expense", user_id=1)
+
+        incremental = rolling_stats.get_rolling_stats(1, as_of="2024-04-15")
+        daily, _ = self.stored_tables()
+        self.assertTrue(rolling_stats.rebuild_rolling_stats(1, as_of="2024-04-15"))
+        self.assertEqual(self.stored_tables()[0], daily)
+        self.assertEqual(rolling_stats.get_rolling_stats(1, as_of="2024-04-15"), incremental)
+
+    def test_reading_never_writes(self):
+        transaction.save_transactions_bulk([
+            {"category": "Food", "amount": 10, "type": "Expense", "created_at": "2024-03-01 12:00:00"},
+            {"category": "Food", "amount": 30, "type": "Expense", "created_at": "2024-03-20 12:00:00"},
+        ], user_id=1)
+        stored = self.stored_tables()
+        # Writes moved the windows to the newest transaction's day
+        self.assertEqual({row[4] for row in stored[1]}, {rolling_stats._day_number("2024-03-20")})
+
+        # Another connection holding the write lock does not block readers
+        writer = sqlite3.connect(self.test_db_path)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            stats = rolling_stats.get_rolling_stats(1, as_of="2024-04-15")
+        finally:
+            writer.rollback()
+            writer.close()
+        self.assertEqual((stats["Food"][7]["sum"], stats["Food"][30]["sum"]), (0.0, 30.0))
+        self.assertEqual(self.stored_tables(), stored)
+
+    def test_deleting_a_category_drops_its_windows(self):
+        tx_id = transaction.save_transaction("Food", 5.0, "Expense", user_id=1)
+        self.assertIn("Food", rolling_stats.get_rolling_stats(1))
+        transaction.delete_transaction(tx_id)
+        self.assertEqual(rolling_stats.get_rolling_stats(1), {})
+
+    def test_without_user_is_empty(self):
+        self.assertEqual(rolling_stats.get_rolling_stats(None), {})
+
+if __name__ == "__main__":
+    unittest.main()
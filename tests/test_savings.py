@@ -0,0 +1,87 @@
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.models import database, savings, transaction
+from src.controllers.transaction_controller import TransactionController
+
+class TestSavingsGoals(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = Path("test_savings.db")
+        patcher = patch("src.models.database.TRANSACTIONS_DB_PATH", self.test_db_path)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    def tearDown(self):
+        database.close_all_connections()
+        if self.test_db_path.exists():
+            os.remove(self.test_db_path)
+
+    def test_create_and_update_goal(self):
+        goal_id = savings.create_savings_goal(1, "Trip", "Vacation", 1500.0, "2025-06-01")
+        self.assertTrue(savings.update_savings_goal(goal_id, name="Japan trip", target_amount=2000.0))
+        goal = savings.get_savings_goal(goal_id)
+        self.assertEqual((goal["name"], goal["target_amount_cents"]), ("Japan trip", 200000))
+
+    def test_goals_with_progress(self):
+        trip = savings.create_savings_goal(1, "Trip", "Vacation", 1000.0)
+        fund = savings.create_savings_goal(1, "Rainy day", "Emergency", 300.0)
+        car = savings.create_savings_goal(1, "Car", "Car", 5000.0)
+        savings.create_savings_goal(2, "Other user", "Vacation", 10.0)
+
+        transaction.save_transaction("Vacation", 250.0, "Saving", user_id=1)
+        transaction.save_transaction("vacation", 0.5, "Saving", user_id=1)
+        transaction.save_transaction("Vacation", 99.0, "Expense", user_id=1)
+        transaction.save_transaction("Emergency", 400.0, "Saving", user_id=1)
+        transaction.save_transaction("Vacation", 700.0, "Saving", user_id=2)
+
+        goals = {goal["id"]: goal for goal in savings.get_goals_with_progress(1)}
+        self.assertEqual(set(goals), {trip, fund, car})
+
+        # Categories match case-insensitively; expenses never count
+        self.assertEqual(goals[trip]["saved_cents"], 25050)
+        self.assertEqual(goals[trip]["remaining_amount"], 749.5)
+        self.assertAlmostEqual(goals[trip]["progress"], 0.2505)
+        self.assertFalse(goals[trip]["is_complete"])
+
+        # Overshooting caps progress and leaves nothing remaining
+        self.assertEqual(goals[fund]["saved_amount"], 400.0)
+        self.assertEqual(goals[fund]["remaining_cents"], 0)
+        self.assertEqual(goals[fund]["progress"], 1.0)
+        self.assertTrue(goals[fund]["is_complete"])
+
+        # Nothing saved yet
+        self.assertEqual((goals[car]["saved_cents"], goals[car]["progress"]), (0, 0.0))
+        self.assertEqual(goals[car]["remaining_amount"], 5000.0)
+
+    def test_goals_with_progress_follow_new_savings(self):
+        goal_id = savings.create_savings_goal(1, "Trip", "Vacation", 100.0)
+        tx_id = transaction.save_transaction("Vacation", 100.0, "Saving", user_id=1)
+        self.assertTrue(savings.get_goals_with_progress(1)[0]["is_complete"])
+        transaction.delete_transaction(tx_id)
+        goal = savings.get_goals_with_progress(1)[0]
+        self.assertEqual((goal["id"], goal["progress"], goal["is_complete"]), (goal_id, 0.0, False))
+
+    def test_controller_sets_one_goal_per_category(self):
+        auth_manager = MagicMock()
+        auth_manager.current_user.id = 1
+        controller = TransactionController(auth_manager)
+        controller.add_transaction("Vacation", 40, "Saving")
+
+        goal = controller.set_savings_goal("Vacation", 100.0, "2030-01-01")
+        self.assertEqual((goal["saved_amount"], goal["remaining_amount"]), (40.0, 60.0))
+
+        # Same category in another case updates the goal and keeps its deadline
+        goal = controller.set_savings_goal("vacation", 200.0)
+        self.assertEqual((goal["target_amount"], goal["deadline"]), (200.0, "2030-01-01"))
+        self.assertEqual(len(controller.get_goals_with_progress()), 1)
+
+        # Cached progress follows new savings
+        controller.add_transaction("Vacation", 10, "saving")
+        self.assertEqual(controller.get_goals_with_progress()[0]["saved_amount"], 50.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.core.summary import BudgetSummary
+
+class TestBudgetSummary(unittest.TestCase):
+    def setUp(self):
+        self.summary = BudgetSummary()
+        self.summary.load({
+            "expenses": {"Living": 1200.5, "Groceries": 80.1},
+            "savings": {"Car": 300.0},
+            "income": {"Paycheck": 2500.0},
+        })
+
+    def test_load_snapshot(self):
+        self.assertEqual(self.summary.category_total("Expense", "Living"), 1200.5)
+        self.assertEqual(self.summary.total("Expense"), 1280.6)
+        self.assertEqual(self.summary.total("Saving"), 300.0)
+        self.assertEqual(self.summary.total("Income"), 2500.0)
+        self.assertEqual(self.summary.category_total("Saving", "House"), 0.0)
+
+    def test_add_and_take_out_without_drift(self):
+        for _ in range(1000):
+            self.summary.add("Groceries", 0.1, "Expense")
+        for _ in range(1000):
+            self.summary.add("Groceries", -0.1, "Expense")
+        self.assertEqual(self.summary.category_total("Expense", "Groceries"), 80.1)
+        self.assertEqual(self.summary.totals["Expense"], 128060)
+
+        # An edit moves the amount between categories and types
+        self.summary.add("Car", -300, "Saving")
+        self.summary.add("House", 250, "Saving")
+        self.assertEqual(self.summary.categories["Saving"], {"Car": 0, "House": 25000})
+        self.assertEqual(self.summary.total("Saving"), 250.0)
+
+    def test_set_total_and_reload(self):
+        self.summary.set_total("Income", 4000)
+        self.assertEqual(self.summary.total("Income"), 4000.0)
+        self.assertEqual(self.summary.category_total("Income", "Paycheck"), 2500.0)
+
+        self.summary.load({"expenses": {}, "savings": {}, "income": {}})
+        self.assertEqual([self.summary.total(t) for t in ("Expense", "Saving", "Income")], [0.0, 0.0, 0.0])
+
+if __name__ == '__main__':
+    unittest.main()
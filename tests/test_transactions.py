@@ -1,13 +1,16 @@
+import csv
 import os
 import sqlite3
+import subprocess
 import unittest
 from pathlib import Path
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from src.models import transaction
+from src.models import database, transaction
+from src.controllers.transaction_controller import TransactionController
 
 class TestTransactionFunctions(unittest.TestCase):
     def setUp(self):
@@ -32,6 +35,7 @@ class TestTransactionFunctions(unittest.TestCase):
         conn.close()
 
     def tearDown(self):
+        database.close_all_connections()
         if self.test_db_path.exists():
             os.remove(self.test_db_path)
 
@@ -51,6 +55,12 @@ class TestTransactionFunctions(unittest.TestCase):
         tx_id = transaction.save_transaction("Misc", 15.0, "Unknown", "Invalid type", user_id=1)
         self.assertIsNone(tx_id)
 
+    def test_save_transaction_normalizes_type(self):
+        tx_id = transaction.save_transaction("Food", 5.0, "expense", user_id=1)
+        transaction.save_transactions_bulk([{"category": "Food", "amount": 7.0, "type": "EXPENSE"}], user_id=1)
+        self.assertEqual(transaction.get_transaction(tx_id)["type"], "Expense")
+        self.assertEqual(transaction.get_dashboard_snapshot(1)["expenses"], {"Food": 12.0})
+
     def test_load_all_transactions(self):
         transaction.save_transaction("Groceries", 40.0, "Expense", user_id=1)
         transaction.save_transaction("Groceries", 10.0, "Saving", user_id=1)
@@ -73,10 +83,449 @@ class TestTransactionFunctions(unittest.TestCase):
         success = transaction.update_transaction(tx_id, amount=90.0, description="New shoes")
         self.assertTrue(success)
 
+    def test_update_transaction_rejects_invalid_amount(self):
+        tx_id = transaction.save_transaction("Paycheck", 100.0, "Income", user_id=1)
+        self.assertFalse(transaction.update_transaction(tx_id, amount=-50.0))
+        self.assertFalse(transaction.update_transaction(tx_id, amount=0))
+        self.assertEqual(transaction.get_transaction(tx_id)["amount"], 100.0)
+        self.assertEqual(transaction.get_dashboard_snapshot(1)["income"], {"Paycheck": 100.0})
+
+    def test_update_transaction_rejects_invalid_type(self):
+        tx_id = transaction.save_transaction("Paycheck", 100.0, "Income", user_id=1)
+        self.assertFalse(transaction.update_transaction(tx_id, trans_type="Bonus"))
+        self.assertEqual(transaction.get_transaction(tx_id)["type"], "Income")
+        self.assertTrue(transaction.update_transaction(tx_id, trans_type="saving"))
+        self.assertEqual(transaction.get_transaction(tx_id)["type"], "Saving")
+
     def test_delete_transaction(self):
         tx_id = transaction.save_transaction("DeleteTest", 5.0, "Expense", user_id=1)
         success = transaction.delete_transaction(tx_id)
         self.assertTrue(success)
 
+    def test_save_transactions_bulk_returns_ids_in_order(self):
+        rows = [
+            {"category": "Rent", "amount": 900.0, "type": "Expense", "created_at": "2024-01-01 09:00:00"},
+            {"category": "Vacation", "amount": 50.0, "type": "saving"},
+            {"category": "Paycheck", "amount": 2000.0, "type": "Income", "description": "January"},
+        ]
+        tx_ids = transaction.save_transactions_bulk(rows, user_id=1, chunk_size=2)
+        self.assertEqual(len(tx_ids), 3)
+
+        saved = {tx["id"]: tx for tx in transaction.load_all_transactions(user_id=1)}
+        self.assertEqual([saved[tx_id]["category"] for tx_id in tx_ids], ["Rent", "Vacation", "Paycheck"])
+        self.assertEqual(saved[tx_ids[0]]["created_at"], "2024-01-01 09:00:00")
+        self.assertEqual(saved[tx_ids[1]]["type"], "Saving")
+        self.assertEqual(saved[tx_ids[2]]["description"], "January")
+
+    def test_save_transactions_bulk_rejects_whole_batch(self):
+        rows = [
+            {"category": "Rent", "amount": 900.0, "type": "Expense"},
+            {"category": "Food", "amount": -5.0, "type": "Expense"},
+        ]
+        self.assertIsNone(transaction.save_transactions_bulk(rows, user_id=1))
+        self.assertEqual(transaction.load_all_transactions(user_id=1), [])
+
+    def test_save_transactions_bulk_requires_user(self):
+        rows = [{"category": "Rent", "amount": 900.0, "type": "Expense"}]
+        self.assertIsNone(transaction.save_transactions_bulk(rows))
+
+    def test_iter_transactions_streams_in_batches(self):
+        for amount in (10.0, 20.0, 30.0, 40.0, 50.0):
+            transaction.save_transaction("Food", amount, "Expense", user_id=1)
+        transaction.save_transaction("Vacation", 5.0, "Saving", user_id=1)
+
+        stream = transaction.iter_transactions(user_id=1, trans_type="Expense", batch_size=2)
+        first = next(stream)
+        self.assertEqual(first["type"], "Expense")
+        rest = list(stream)
+        self.assertEqual(len(rest), 4)
+        self.assertEqual(len(list(transaction.iter_transactions(user_id=1, trans_type="expense"))), 5)
+
+    def test_iter_transactions_without_user_is_empty(self):
+        self.assertEqual(list(transaction.iter_transactions()), [])
+
+    def test_page_transactions_walks_every_row_once(self):
+        # Identical timestamps make sure the id tie-breaker is honoured
+        rows = [{"category": "Food", "amount": float(i), "type": "Expense",
+                 "created_at": "2024-01-01 12:00:00"} for i in range(1, 8)]
+        tx_ids = transaction.save_transactions_bulk(rows, user_id=1)
+
+        seen = []
+        after = None
+        while True:
+            page = transaction.page_transactions(user_id=1, after=after, limit=3)
+            if not page:
+                break
+            self.assertLessEqual(len(page), 3)
+            seen.extend(tx["id"] for tx in page)
+            after = (page[-1]["created_at"], page[-1]["id"])
+
+        self.assertEqual(seen, sorted(tx_ids, reverse=True))
+
+        # Oldest first walks the same order backwards
+        oldest = transaction.page_transactions(user_id=1, limit=3, oldest_first=True)
+        self.assertEqual([tx["id"] for tx in oldest], tx_ids[:3])
+        after = (oldest[-1]["created_at"], oldest[-1]["id"])
+        page = transaction.page_transactions(user_id=1, after=after, limit=3, oldest_first=True)
+        self.assertEqual([tx["id"] for tx in page], tx_ids[3:6])
+
+    def test_amounts_stored_as_integer_cents(self):
+        tx_id = transaction.save_transaction("Food", 19.99, "Expense", user_id=1)
+        conn = sqlite3.connect(self.test_db_path)
+        stored = conn.execute("SELECT amount_cents FROM transactions WHERE id = ?", (tx_id,)).fetchone()[0]
+        conn.close()
+        self.assertEqual(stored, 1999)
+        self.assertEqual(transaction.load_all_transactions(user_id=1)[0]["amount"], 19.99)
+
+    def test_summary_sums_are_exact(self):
+        # 0.1 + 0.2 != 0.3 in floating point
+        transaction.save_transaction("Food", 0.1, "Expense", user_id=1)
+        transaction.save_transaction("Food", 0.2, "Expense", user_id=1)
+        self.assertEqual(transaction.get_spending_summary(user_id=1), {"Food": 0.3})
+
+    def test_save_transaction_sub_cent_amount(self):
+        tx_id = transaction.save_transaction("Food", 0.001, "Expense", user_id=1)
+        self.assertIsNone(tx_id)
+
+    def test_load_transactions_by_date_range_includes_end_day(self):
+        transaction.save_transactions_bulk([
+            {"category": "Food", "amount": 1, "type": "Expense", "created_at": "2024-02-29 23:59:59"},
+            {"category": "Food", "amount": 2, "type": "Expense", "created_at": "2024-03-01 00:00:00"},
+            {"category": "Food", "amount": 3, "type": "Expense", "created_at": "2024-03-31 23:59:59"},
+            {"category": "Food", "amount": 4, "type": "Expense", "created_at": "2024-04-01 00:00:00"},
+        ], user_id=1)
+        rows = transaction.load_transactions_by_date_range("2024-03-01", "2024-03-31", user_id=1)
+        self.assertEqual([tx["amount"] for tx in rows], [3.0, 2.0])
+
+    def assert_rollup_matches(self):
+        conn = sqlite3.connect(self.test_db_path)
+        rollup = conn.execute(
+            "SELECT user_id, type, category, total_cents, count FROM category_totals ORDER BY 1, 2, 3"
+        ).fetchall()
+        fresh = conn.execute(
+            "SELECT user_id, type, category, SUM(amount_cents), COUNT(*) FROM transactions "
+            "GROUP BY user_id, type, category ORDER BY 1, 2, 3"
+        ).fetchall()
+        conn.close()
+        self.assertEqual(rollup, fresh)
+
+    def test_category_totals_follow_writes(self):
+        rent = transaction.save_transaction("Rent", 900.0, "Expense", user_id=1)
+        food = transaction.save_transaction("Food", 19.99, "Expense", user_id=1)
+        transaction.save_transaction("Food", 5.01, "Expense", user_id=2)
+        transaction.save_transactions_bulk([
+            {"category": "Vacation", "amount": 50, "type": "Saving"},
+            {"category": "Food", "amount": 0.01, "type": "Expense"},
+        ], user_id=1)
+        self.assert_rollup_matches()
+
+        transaction.update_transaction(food, amount=20.0)
+        transaction.update_transaction(rent, category="Housing")
+        transaction.update_transaction(food, trans_type="Saving")
+        self.assert_rollup_matches()
+
+        transaction.delete_transaction(rent)
+        self.assert_rollup_matches()
+        self.assertEqual(transaction.get_spending_summary(user_id=1), {"Food": 0.01})
+        self.assertEqual(transaction.get_savings_summary(user_id=1), {"Food": 20.0, "Vacation": 50.0})
+
+    def test_dashboard_snapshot(self):
+        transaction.save_transactions_bulk([
+            {"category": "Food", "amount": 0.1, "type": "Expense"},
+            {"category": "Food", "amount": 0.2, "type": "Expense"},
+            {"category": "Rent", "amount": 900, "type": "Expense"},
+            {"category": "Food", "amount": 5, "type": "Saving"},
+            {"category": "Vacation", "amount": 50, "type": "Saving"},
+            {"category": "Paycheck", "amount": 2000, "type": "Income"},
+        ], user_id=1)
+        transaction.save_transaction("Food", 99.0, "Expense", user_id=2)
+
+        snapshot = transaction.get_dashboard_snapshot(1)
+        self.assertEqual(snapshot["expenses"], {"Food": 0.3, "Rent": 900.0})
+        self.assertEqual(snapshot["savings"], {"Food": 5.0, "Vacation": 50.0})
+        self.assertEqual(snapshot["income"], {"Paycheck": 2000.0})
+        self.assertEqual(snapshot["total_expenses"], 900.3)
+        self.assertEqual(snapshot["total_savings"], 55.0)
+        self.assertEqual(snapshot["total_income"], 2000.0)
+        self.assertEqual((snapshot["expense_count"], snapshot["saving_count"], snapshot["income_count"]), (3, 2, 1))
+
+    def test_dashboard_snapshot_without_user_is_empty(self):
+        snapshot = transaction.get_dashboard_snapshot(None)
+        self.assertEqual(snapshot["expenses"], {})
+        self.assertEqual(snapshot["total_income"], 0.0)
+
+    def test_load_time_buckets_by_iso_week(self):
+        transaction.save_transactions_bulk([
+            {"category": "Food", "amount": 1, "type": "Expense", "created_at": "2024-03-03 23:00:00"},  # Sunday
+            {"category": "Food", "amount": 2, "type": "Expense", "created_at": "2024-03-04 00:00:00"},  # Monday
+            {"category": "Rent", "amount": 900, "type": "Expense", "created_at": "2024-03-10 12:00:00"},
+            {"category": "Food", "amount": 4, "type": "Expense", "created_at": "2024-03-20 08:00:00"},
+            {"category": "Food", "amount": 50, "type": "Saving", "created_at": "2024-03-05 08:00:00"},
+        ], user_id=1)
+        data = transaction.load_time_buckets(1, period="week", start_date="2024-02-26", end_date="2024-03-24")
+
+        self.assertEqual([str(week) for week in data["buckets"]],
+                         ["2024-02-26", "2024-03-04", "2024-03-11", "2024-03-18"])
+        self.assertEqual(data["categories"], ["Food", "Rent"])
+        self.assertEqual(data["totals"].tolist(), [[1.0, 2.0, 0.0, 4.0], [0.0, 900.0, 0.0, 0.0]])
+        self.assertEqual(data["counts"].tolist(), [[1, 1, 0, 1], [0, 1, 0, 0]])
+
+    def test_load_time_buckets_default_window(self):
+        transaction.save_transactions_bulk([
+            {"category": "Food", "amount": 1, "type": "Expense", "created_at": "2023-11-30 10:00:00"},
+            {"category": "Food", "amount": 2, "type": "Expense", "created_at": "2024-01-15 10:00:00"},
+            {"category": "Food", "amount": 3, "type": "Expense", "created_at": "2024-03-31 10:00:00"},
+        ], user_id=1)
+        data = transaction.load_time_buckets(1, period="month", end_date="2024-03-31", num_buckets=3)
+        self.assertEqual([str(month) for month in data["buckets"]], ["2024-01-01", "2024-02-01", "2024-03-01"])
+        self.assertEqual(data["totals"].tolist(), [[2.0, 0.0, 3.0]])
+
+    def test_load_time_buckets_rejects_unknown_period(self):
+        self.assertIsNone(transaction.load_time_buckets(1, period="fortnight"))
+
+    def test_load_transaction_columns(self):
+        ids = transaction.save_transactions_bulk([
+            {"category": "Food", "amount": 0.1, "type": "Expense", "created_at": "2024-03-02 00:00:00"},
+            {"category": "Rent", "amount": 900, "type": "Expense", "created_at": "2024-03-01 00:00:00"},
+            {"category": "Food", "amount": 0.2, "type": "Expense", "created_at": "2024-03-03 00:00:00"},
+            {"category": "Vacation", "amount": 50, "type": "Saving", "created_at": "2024-03-04 00:00:00"},
+        ], user_id=1)
+        transaction.save_transaction("Food", 99.0, "Expense", user_id=2)
+
+        columns = transaction.load_transaction_columns(1, batch_size=3)
+        self.assertEqual(columns.ids.tolist(), [ids[1], ids[0], ids[2], ids[3]])
+        self.assertEqual(columns.amount_cents.tolist(), [90000, 10, 20, 5000])
+        self.assertEqual([columns.categories[code] for code in columns.category_codes], ["Rent", "Food", "Food", "Vacation"])
+        self.assertEqual([columns.types[code] for code in columns.type_codes], ["Expense"] * 3 + ["Saving"])
+
+        savings = transaction.load_transaction_columns(1, trans_type="Saving")
+        self.assertEqual(savings.amount_cents.tolist(), [5000])
+        self.assertEqual(savings.types, ["Saving"])
+
+        recent = transaction.load_transaction_columns(1, trans_type="Expense", start_date="2024-03-03")
+        self.assertEqual(recent.ids.tolist(), [ids[2]])
+
+    def test_load_transaction_columns_without_user_is_empty(self):
+        columns = transaction.load_transaction_columns(None)
+        self.assertEqual(len(columns), 0)
+
+    def test_load_running_balance(self):
+        transaction.save_transactions_bulk([
+            {"category": "Paycheck", "amount": 1000, "type": "Income", "created_at": "2024-03-01 09:00:00"},
+            {"category": "Food", "amount": 10, "type": "Expense", "created_at": "2024-03-01 12:00:00"},
+            {"category": "Rent", "amount": 500, "type": "Expense", "created_at": "2024-03-03 12:00:00"},
+            {"category": "Vacation", "amount": 100, "type": "Saving", "created_at": "2024-03-05 12:00:00"},
+        ], user_id=1)
+        transaction.save_transaction("Paycheck", 99.0, "Income", user_id=2)
+
+        series = transaction.load_running_balance(1, end_date="2024-03-06")
+        self.assertEqual(str(series["buckets"][0]), "2024-03-01")
+        self.assertEqual(series["net"].tolist(), [990.0, 0.0, -500.0, 0.0, -100.0, 0.0])
+        self.assertEqual(series["balance"].tolist(), [990.0, 990.0, 490.0, 490.0, 390.0, 390.0])
+
+        # Windows starting later open with the balance carried in from before
+        later = transaction.load_running_balance(1, start_date="2024-03-02", end_date="2024-03-04")
+        self.assertEqual(later["balance"].tolist(), [990.0, 490.0, 490.0])
+        quiet = transaction.load_running_balance(1, start_date="2024-03-06", end_date="2024-03-07")
+        self.assertEqual(quiet["balance"].tolist(), [390.0, 390.0])
+
+        weekly = transaction.load_running_balance(1, period="week", end_date="2024-03-11")
+        self.assertEqual(weekly["balance"].tolist(), [490.0, 390.0, 390.0])
+
+    def test_load_running_balance_without_transactions_is_empty(self):
+        self.assertEqual(len(transaction.load_running_balance(1)["buckets"]), 0)
+
+    def test_load_transactions_by_date_range_invalid_date(self):
+        self.assertEqual(transaction.load_transactions_by_date_range("March", "2024-03-31", user_id=1), [])
+
+    def test_import_does_not_load_numpy(self):
+        code = "import sys; import src.models.transaction; print('numpy' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=Path(__file__).resolve().parents[1])
+        self.assertEqual(result.stdout.strip(), "False")
+
+class TestTransactionQueryPlans(unittest.TestCase):
+    """Every per-user query must be served by an index, never a table scan."""
+
+    def setUp(self):
+        self.test_db_path = Path("test_query_plans.db")
+        patcher = patch("src.models.database.TRANSACTIONS_DB_PATH", self.test_db_path)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        database.init_transactions_db()
+        for user_id in (1, 2):
+            transaction.save_transaction("Rent", 900.0, "Expense", user_id=user_id)
+            transaction.save_transaction("Vacation", 50.0, "Saving", user_id=user_id)
+            transaction.save_transaction("Paycheck", 2000.0, "Income", user_id=user_id)
+
+    def tearDown(self):
+        database.close_all_connections()
+        if self.test_db_path.exists():
+            os.remove(self.test_db_path)
+
+    def capture_queries(self, func, *args, **kwargs):
+        """Run a model function and return the SQL statements it executed."""
+        statements = []
+        with database.get_transactions_db_connection() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                func(*args, **kwargs)
+            finally:
+                conn.set_trace_callback(None)
+        return [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+
+    def assert_indexed(self, func, *args, **kwargs):
+        queries = self.capture_queries(func, *args, **kwargs)
+        self.assertTrue(queries, f"{func.__name__} ran no SELECT")
+        with database.get_transactions_db_connection() as conn:
+            for sql in queries:
+                plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+                for step in plan:
+                    self.assertFalse(step.startswith("SCAN"), f"{func.__name__}: {step}")
+                    self.assertNotIn("TEMP B-TREE", step, f"{func.__name__}: {step}")
+
+    def test_load_all_transactions_uses_index(self):
+        self.assert_indexed(transaction.load_all_transactions, user_id=1)
+
+    def test_load_transactions_by_category_uses_index(self):
+        self.assert_indexed(transaction.load_transactions_by_category, "Rent", user_id=1)
+
+    def test_load_transactions_by_type_uses_index(self):
+        self.assert_indexed(transaction.load_transactions_by_type, "Expense", user_id=1)
+
+    def test_load_transactions_by_date_range_uses_index(self):
+        self.assert_indexed(transaction.load_transactions_by_date_range,
+                            "2020-01-01", "2030-12-31", user_id=1)
+
+    def test_load_transaction_columns_uses_index(self):
+        self.assert_indexed(transaction.load_transaction_columns, 1)
+        self.assert_indexed(transaction.load_transaction_columns, 1, trans_type="Saving")
+
+    def test_running_balance_reads_covering_index(self):
+        queries = self.capture_queries(transaction.load_running_balance, 1)
+        with database.get_transactions_db_connection() as conn:
+            plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + queries[-1]))
+        self.assertIn("COVERING INDEX idx_transactions_user_ts_type_amount (user_id=? AND created_ts<?)", plan)
+
+    def test_time_buckets_read_covering_index(self):
+        queries = self.capture_queries(transaction.load_time_buckets, 1, period="month")
+        with database.get_transactions_db_connection() as conn:
+            plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + queries[0]))
+        self.assertIn("COVERING INDEX idx_transactions_user_type_ts (user_id=? AND type=? AND created_ts>? AND created_ts<?)", plan)
+
+    def test_date_range_seeks_on_epoch_timestamp(self):
+        queries = self.capture_queries(transaction.load_transactions_by_date_range,
+                                       "2020-01-01", "2030-12-31", user_id=1)
+        with database.get_transactions_db_connection() as conn:
+            plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + queries[0]))
+        self.assertIn("idx_transactions_user_ts_type_amount (user_id=? AND created_ts>? AND created_ts<?)", plan)
+
+    def test_iter_transactions_uses_index(self):
+        consume = lambda **filters: list(transaction.iter_transactions(1, **filters))
+        self.assert_indexed(consume)
+        self.assert_indexed(consume, category="Rent")
+        self.assert_indexed(consume, trans_type="Expense")
+
+    def test_page_transactions_uses_index(self):
+        self.assert_indexed(transaction.page_transactions, user_id=1, limit=2)
+        self.assert_indexed(transaction.page_transactions, user_id=1,
+                            after=("2030-01-01 00:00:00", 10), limit=2)
+        self.assert_indexed(transaction.page_transactions, user_id=1,
+                            after=("2020-01-01 00:00:00", 10), limit=2, oldest_first=True)
+
+    def test_spending_summary_uses_index(self):
+        self.assert_indexed(transaction.get_spending_summary, user_id=1)
+
+    def test_savings_summary_uses_index(self):
+        self.assert_indexed(transaction.get_savings_summary, user_id=1)
+
+class TestTransactionControllerCache(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = Path("test_controller_cache.db")
+        patcher = patch("src.models.database.TRANSACTIONS_DB_PATH", self.test_db_path)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        self.auth_manager = MagicMock()
+        self.auth_manager.current_user.id = 1
+        self.controller = TransactionController(self.auth_manager, cache_size=3)
+        self.controller.add_transaction("Food", 10, "Expense")
+
+    def tearDown(self):
+        database.close_all_connections()
+        if self.test_db_path.exists():
+            os.remove(self.test_db_path)
+
+    def test_repeated_reads_hit_cache(self):
+        with patch.object(transaction, "get_spending_summary", wraps=transaction.get_spending_summary) as summary:
+            self.assertEqual(self.controller.get_spending_summary(), {"Food": 10.0})
+            self.assertEqual(self.controller.get_spending_summary(), {"Food": 10.0})
+        self.assertEqual(summary.call_count, 1)
+        self.assertEqual(self.controller.get_cache_stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_writes_invalidate(self):
+        self.controller.get_spending_summary()
+        self.controller.add_transaction("Food", 5, "Expense")
+        self.assertEqual(self.controller.get_spending_summary(), {"Food": 15.0})
+
+        tx_id = self.controller.get_all_transactions()[0]["id"]
+        self.controller.update_transaction(tx_id, amount=1)
+        self.assertEqual(self.controller.get_spending_summary(), {"Food": 11.0})
+
+        self.controller.delete_transaction(tx_id)
+        self.assertEqual(self.controller.get_spending_summary(), {"Food": 10.0})
+
+    def test_edits_and_deletes_target_one_duplicate(self):
+        self.controller.add_transaction("Food", 10, "Expense")
+        first, second = sorted(row["id"] for row in transaction.load_all_transactions(1))
+
+        self.assertTrue(self.controller.update_transaction(second, category="Rent", amount=7, description="edited"))
+        edited = transaction.get_transaction(second)
+        self.assertEqual((edited["category"], edited["amount_cents"], edited["description"]), ("Rent", 700, "edited"))
+        self.assertEqual(transaction.get_transaction(first)["category"], "Food")
+
+        self.assertTrue(self.controller.delete_transaction(first))
+        self.assertEqual([row["id"] for row in transaction.load_all_transactions(1)], [second])
+        self.assertFalse(self.controller.delete_transaction(first))
+
+    def test_results_are_per_user(self):
+        self.assertEqual(self.controller.get_spending_summary(), {"Food": 10.0})
+        self.auth_manager.current_user.id = 2
+        self.assertEqual(self.controller.get_spending_summary(), {})
+
+    def test_least_recently_used_is_evicted(self):
+        self.controller.get_spending_summary()
+        self.controller.get_savings_summary()
+        self.controller.get_by_type("Expense")
+        self.controller.get_spending_summary()
+        self.controller.get_by_category("Food")  # evicts the savings summary
+        self.controller.get_savings_summary()
+        stats = self.controller.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 5, 3))
+
+    def test_export_csv_streams_rows(self):
+        self.controller.add_transaction("Vacation", 0.1, "Saving", "beach, sun")
+        path = Path("test_export.csv")
+        self.addCleanup(lambda: path.exists() and os.remove(path))
+
+        self.assertEqual(self.controller.export_csv(path), 2)
+        with open(path, newline="", encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(sorted((row["category"], row["type"], row["amount"], row["description"]) for row in rows),
+                         [("Food", "Expense", "10.00", ""), ("Vacation", "Saving", "0.10", "beach, sun")])
+
+        self.assertEqual(self.controller.export_csv(path, trans_type="saving"), 1)
+
+    def test_open_ended_balance_rolls_over_with_the_day(self):
+        with patch("src.controllers.transaction_controller.date") as fake_date, \
+                patch.object(transaction, "load_running_balance", return_value=[]) as balance:
+            fake_date.today.return_value = datetime(2024, 3, 1).date()
+            self.controller.get_running_balance()
+            self.controller.get_running_balance()
+            fake_date.today.return_value = datetime(2024, 3, 2).date()
+            self.controller.get_running_balance()
+        self.assertEqual([call.kwargs["end_date"] for call in balance.call_args_list], ["2024-03-01", "2024-03-02"])
+
 if __name__ == "__main__":
     unittest.main()
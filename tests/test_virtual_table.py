@@ -0,0 +1,149 @@
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.models import database, transaction
+from src.core import background
+from src.controllers.transaction_controller import TransactionController
+from src.ui.virtual_table import KeysetWindow
+
+class TestKeysetWindow(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = Path("test_virtual_table.db")
+        patcher = patch("src.models.database.TRANSACTIONS_DB_PATH", self.test_db_path)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        rows = [
+            {"category": "Food", "amount": i + 1, "type": "Expense",
+             "created_at": f"2024-01-{i % 28 + 1:02d} 12:00:00"}
+            for i in range(95)
+        ]
+        transaction.save_transactions_bulk(rows, user_id=1)
+        transaction.save_transaction("Rent", 500, "Expense", user_id=2)
+        self.expected = [row["id"] for row in transaction.load_all_transactions(1)]
+        self.expected.sort(key=lambda tx_id: (-self.created_day(tx_id), -tx_id))
+
+        self.calls = []
+        def fetch_page(after, limit, offset, oldest_first):
+            self.calls.append((after, limit, offset, oldest_first))
+            return transaction.page_transactions(1, after, limit, offset, oldest_first)
+        self.window = KeysetWindow(fetch_page, lambda: transaction.count_transactions(1),
+                                   key=lambda row: (row["created_at"], row["id"]), page_size=10)
+
+    def tearDown(self):
+        database.close_all_connections()
+        if self.test_db_path.exists():
+            os.remove(self.test_db_path)
+
+    def created_day(self, tx_id):
+        # Rows were inserted in order, so id - 1 is the index used for the date
+        return (tx_id - 1) % 28
+
+    def ids(self, start, stop):
+        return [row["id"] for row in self.window.rows(start, stop)]
+
+    def test_count_transactions(self):
+        self.assertEqual(self.window.total, 95)
+        self.assertEqual(transaction.count_transactions(2), 1)
+        self.assertEqual(transaction.count_transactions(3), 0)
+        self.assertEqual(transaction.count_transactions(None), 0)
+
+    def test_rows_match_full_ordering(self):
+        self.assertEqual(self.ids(0, 25), self.expected[:25])
+        self.assertEqual(self.ids(37, 52), self.expected[37:52])
+        self.assertEqual(self.ids(90, 120), self.expected[90:])
+        self.assertEqual(self.ids(95, 100), [])
+
+    def test_reads_seek_from_nearest_anchor(self):
+        self.ids(0, 30)
+        self.calls.clear()
+        # Page 3 starts right after the anchor recorded at the end of page 2
+        self.assertEqual(self.ids(35, 45), self.expected[35:45])
+        self.assertIsNotNone(self.calls[0][0])
+        self.assertEqual(self.calls[0][2], 0)
+
+        # A jump only skips the pages past the last anchor
+        self.calls.clear()
+        self.assertEqual(self.ids(50, 55), self.expected[50:55])
+        self.assertEqual(self.calls[0][2], 10)
+
+        # Skipped rows leave no anchors; reading them records them
+        self.calls.clear()
+        self.assertEqual(self.ids(60, 70), self.expected[60:70])
+        self.assertEqual(self.calls[0][2], 20)
+        self.calls.clear()
+        self.assertEqual(self.ids(70, 72), self.expected[70:72])
+        self.assertEqual(self.calls[0][2], 0)
+
+    def test_far_jumps_read_backwards(self):
+        # Jumping to the end reads backwards from the oldest row
+        self.assertEqual(self.ids(88, 95), self.expected[88:95])
+        self.assertEqual(self.calls[-1], (None, 7, 0, True))
+
+        # Then from the anchor that read left at position 89
+        self.assertEqual(self.ids(80, 85), self.expected[80:85])
+        after, limit, offset, oldest_first = self.calls[-1]
+        self.assertEqual((limit, offset, oldest_first), (5, 4, True))
+        self.assertEqual(after[1], self.expected[89])
+
+        # The start is still read forwards
+        self.assertEqual(self.ids(0, 5), self.expected[:5])
+        self.assertEqual(self.calls[-1], (None, 5, 0, False))
+
+    def test_reset_after_changes(self):
+        self.ids(0, 50)
+        transaction.save_transaction("Food", 1, "Expense", user_id=1)
+        self.window.reset()
+        self.assertEqual(self.window.total, 96)
+        self.assertEqual(len(self.ids(0, 200)), 96)
+
+class TestControllerPaging(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = Path("test_controller_paging.db")
+        patcher = patch("src.models.database.TRANSACTIONS_DB_PATH", self.test_db_path)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        auth_manager = MagicMock()
+        auth_manager.current_user.id = 1
+        self.controller = TransactionController(auth_manager)
+
+    def tearDown(self):
+        background.shutdown_executor(wait=True)
+        database.close_all_connections()
+        if self.test_db_path.exists():
+            os.remove(self.test_db_path)
+
+    def test_window_reads_through_controller_in_background(self):
+        self.controller.add_transactions_bulk([
+            {"category": "Food", "amount": i + 1, "type": "Expense"} for i in range(25)
+        ])
+        window = KeysetWindow(self.controller.get_transaction_page, self.controller.count_transactions,
+                              key=lambda row: (row["created_at"], row["id"]), page_size=10)
+        expected = [row["id"] for row in transaction.page_transactions(1, limit=25)]
+
+        rows = background.submit(window.rows, 20, 25).result(timeout=10)
+        self.assertEqual([row["id"] for row in rows], expected[20:])
+
+        # Writes through the controller invalidate the cached count
+        self.controller.add_transaction("Food", 1, "Expense")
+        window.reset()
+        self.assertEqual(window.total, 26)
+        self.assertEqual(len(window.rows(0, 30)), 26)
+
+    def test_scrolling_does_not_evict_summaries(self):
+        self.controller = TransactionController(self.controller.auth_manager, cache_size=2)
+        self.controller.add_transaction("Food", 5, "Expense")
+        self.controller.get_spending_summary()
+        for offset in range(10):
+            self.controller.get_transaction_page(limit=1, offset=offset)
+        self.controller.get_spending_summary()
+        stats = self.controller.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["size"]), (1, 1))
+
+if __name__ == '__main__':
+    unittest.main()